@@ -0,0 +1,314 @@
+"""
+Mongo checkpointer that keeps large text fields in a content-addressed blob collection
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import zstandard
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+)
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+from langgraph.checkpoint.mongodb.utils import dumps_metadata
+from pymongo import UpdateOne
+
+BLOB_REF_KEY = "__blob_ref__"
+
+
+class ThreadBusyError(Exception):
+    """Raised when a thread already has a coalesced run in progress"""
+
+
+class _WriteBuffer:
+    """Operations of one thread held back until its run exits"""
+
+    def __init__(self):
+        self.checkpoints: List[UpdateOne] = []
+        self.writes: List[UpdateOne] = []
+        self.blobs: Dict[str, bytes] = {}
+
+
+class BlobOffloadingMongoDBSaver(AsyncMongoDBSaver):
+    """AsyncMongoDBSaver that moves large strings out of checkpoints and writes.
+
+    Strings of at least `blob_min_bytes` are stored once per thread, zstd-compressed
+    and keyed by their SHA-256, and replaced in the state by {"__blob_ref__": digest}.
+    Reads put the text back, so graphs and nodes never see the references.
+
+    Every upsert stamps the blob's stored_at, and a stored blob is only assumed
+    to still exist for `blob_cache_seconds`; compaction never deletes blobs
+    stamped within its (longer) grace period, so a cached digest stays valid
+    even in another process.
+    """
+
+    def __init__(self, client, *, blob_collection_name: str = "checkpoint_blobs",
+                 blob_min_bytes: int = 1024, compression_level: int = 3,
+                 blob_cache_seconds: float = 1800, **kwargs: Any):
+        super().__init__(client, **kwargs)
+        self.blob_collection = self.db[blob_collection_name]
+        self.blob_min_bytes = blob_min_bytes
+        self.compressor = zstandard.ZstdCompressor(level=compression_level)
+        self.decompressor = zstandard.ZstdDecompressor()
+        # (thread_id, digest) -> monotonic time of its last upsert, so repeated
+        # text skips the upsert while that is recent
+        self._stored: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self.blob_cache_seconds = blob_cache_seconds
+        self._max_stored = 10000
+        self._indexes_ready = False
+        # thread_id -> operations buffered by coalesce()
+        self._buffers: Dict[str, _WriteBuffer] = {}
+
+    async def _setup(self) -> None:
+        # The base class only creates its unique indexes on collections with fewer
+        # than two indexes, so the TTL indexes are added after it has run
+        await super()._setup()
+        if not self._indexes_ready:
+            await self.blob_collection.create_index([("thread_id", 1), ("hash", 1)], unique=True)
+            # Documents of finished threads get an expire_at (see CheckpointRetentionService)
+            for collection in [self.checkpoint_collection, self.writes_collection, self.blob_collection]:
+                await collection.create_index([("expire_at", 1)], expireAfterSeconds=0)
+            self._indexes_ready = True
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint,
+                   metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        blobs: Dict[str, bytes] = {}
+        checkpoint = {**checkpoint, "channel_values": self._offload(checkpoint["channel_values"], blobs)}
+        await self._setup()
+
+        buffer = self._buffers.get(config["configurable"]["thread_id"])
+        if buffer is not None:
+            buffer.blobs.update(blobs)
+            return self._buffer_checkpoint(buffer, config, checkpoint, metadata)
+
+        await self._store_blobs(config["configurable"]["thread_id"], blobs)
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+                          task_id: str, task_path: str = "") -> None:
+        blobs: Dict[str, bytes] = {}
+        writes = [(channel, self._offload(value, blobs)) for channel, value in writes]
+        await self._setup()
+
+        buffer = self._buffers.get(config["configurable"]["thread_id"])
+        if buffer is not None:
+            buffer.blobs.update(blobs)
+            self._buffer_writes(buffer, config, writes, task_id, task_path)
+            return
+
+        await self._store_blobs(config["configurable"]["thread_id"], blobs)
+        await super().aput_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        return await self._rehydrate(checkpoint_tuple)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        async for checkpoint_tuple in super().alist(config, filter=filter, before=before, limit=limit):
+            yield await self._rehydrate(checkpoint_tuple)
+
+    @asynccontextmanager
+    async def coalesce(self, thread_id: str):
+        """Hold back the checkpoints, writes and blobs a thread produces inside the
+        block and flush them on exit with one ordered bulk write per collection.
+
+        Writes are routed to the buffer by thread_id, so a second concurrent
+        run on the same thread is refused rather than mixed into the first.
+        """
+        if thread_id in self._buffers:
+            raise ThreadBusyError(f"Thread {thread_id} already has a run in progress")
+        buffer = self._buffers[thread_id] = _WriteBuffer()
+        try:
+            yield
+        finally:
+            del self._buffers[thread_id]
+            await self._store_blobs(thread_id, buffer.blobs)
+            if buffer.checkpoints:
+                await self.checkpoint_collection.bulk_write(buffer.checkpoints)
+            if buffer.writes:
+                await self.writes_collection.bulk_write(buffer.writes)
+
+    def _buffer_checkpoint(self, buffer: _WriteBuffer, config: RunnableConfig,
+                           checkpoint: Checkpoint, metadata: CheckpointMetadata) -> RunnableConfig:
+        """Same document AsyncMongoDBSaver.aput upserts, queued instead of written"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        doc = {
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "type": type_,
+            "checkpoint": serialized_checkpoint,
+            "metadata": dumps_metadata(metadata),
+        }
+        if self.ttl:
+            doc["created_at"] = datetime.now()
+        buffer.checkpoints.append(UpdateOne(
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]},
+            {"$set": doc},
+            upsert=True
+        ))
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _buffer_writes(self, buffer: _WriteBuffer, config: RunnableConfig,
+                       writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str):
+        """Same operations AsyncMongoDBSaver.aput_writes runs, queued instead of written"""
+        # Replacing existing writes is only allowed for special (e.g. error) channels
+        set_method = "$set" if all(w[0] in WRITES_IDX_MAP for w in writes) else "$setOnInsert"
+        for idx, (channel, value) in enumerate(writes):
+            query = {
+                "thread_id": config["configurable"]["thread_id"],
+                "checkpoint_ns": config["configurable"]["checkpoint_ns"],
+                "checkpoint_id": config["configurable"]["checkpoint_id"],
+                "task_id": task_id,
+                "task_path": task_path,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+            }
+            if self.ttl:
+                query["created_at"] = datetime.now()
+            type_, serialized_value = self.serde.dumps_typed(value)
+            buffer.writes.append(UpdateOne(
+                query,
+                {set_method: {"channel": channel, "type": type_, "value": serialized_value}},
+                upsert=True
+            ))
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await super().adelete_thread(thread_id)
+        await self.blob_collection.delete_many({"thread_id": thread_id})
+        for key in [key for key in self._stored if key[0] == thread_id]:
+            del self._stored[key]
+
+    async def aclear_expiry(self, thread_id: str) -> None:
+        """Take a thread's documents off the TTL schedule (it is running again)"""
+        for collection in [self.checkpoint_collection, self.writes_collection, self.blob_collection]:
+            await collection.update_many(
+                {"thread_id": thread_id, "expire_at": {"$exists": True}}, {"$unset": {"expire_at": ""}}
+            )
+
+    def forget_blobs(self, thread_id: str, digests: Iterable[str]):
+        """Drop deleted blobs from the stored cache so the next use stores them again"""
+        for digest in digests:
+            self._stored.pop((thread_id, digest), None)
+
+    async def areferenced_blobs(self, thread_id: str) -> Set[str]:
+        """Digests still referenced by any stored checkpoint or write of the thread"""
+        digests: Set[str] = set()
+        async for checkpoint_tuple in super().alist({"configurable": {"thread_id": thread_id}}):
+            self._collect_refs(checkpoint_tuple.checkpoint["channel_values"], digests)
+            for _, _, value in checkpoint_tuple.pending_writes or []:
+                self._collect_refs(value, digests)
+        return digests
+
+    def _offload(self, value: Any, blobs: Dict[str, bytes]) -> Any:
+        """Copy of value with large strings replaced by blob references"""
+        if isinstance(value, str):
+            data = value.encode("utf-8")
+            if len(data) < self.blob_min_bytes:
+                return value
+            digest = hashlib.sha256(data).hexdigest()
+            blobs[digest] = data
+            return {BLOB_REF_KEY: digest}
+        if type(value) is dict:
+            return {key: self._offload(item, blobs) for key, item in value.items()}
+        if type(value) is list:
+            return [self._offload(item, blobs) for item in value]
+        return value
+
+    async def _store_blobs(self, thread_id: str, blobs: Dict[str, bytes]):
+        """Insert blobs not recently stored for the thread with one bulk upsert,
+        refreshing stored_at on the ones that already exist (and taking them
+        off the TTL schedule, since a live checkpoint references them again)"""
+        fresh_since = time.monotonic() - self.blob_cache_seconds
+        new = {
+            digest: data for digest, data in blobs.items()
+            if self._stored.get((thread_id, digest), fresh_since) <= fresh_since
+        }
+        if not new:
+            return
+        now = datetime.utcnow()
+        stored_at = time.monotonic()
+        await self.blob_collection.bulk_write([
+            UpdateOne(
+                {"thread_id": thread_id, "hash": digest},
+                {
+                    "$setOnInsert": {
+                        "data": self.compressor.compress(data),
+                        "size": len(data),
+                        "created_at": now
+                    },
+                    "$set": {"stored_at": now},
+                    "$unset": {"expire_at": ""}
+                },
+                upsert=True
+            )
+            for digest, data in new.items()
+        ], ordered=False)
+        for digest in new:
+            self._stored[(thread_id, digest)] = stored_at
+            self._stored.move_to_end((thread_id, digest))
+        while len(self._stored) > self._max_stored:
+            self._stored.popitem(last=False)
+
+    async def _rehydrate(self, checkpoint_tuple: CheckpointTuple) -> CheckpointTuple:
+        """Resolve the blob references of a checkpoint and its pending writes with one $in query"""
+        digests = set()
+        self._collect_refs(checkpoint_tuple.checkpoint["channel_values"], digests)
+        for _, _, value in checkpoint_tuple.pending_writes or []:
+            self._collect_refs(value, digests)
+        if not digests:
+            return checkpoint_tuple
+
+        thread_id = checkpoint_tuple.config["configurable"]["thread_id"]
+        texts = {}
+        async for doc in self.blob_collection.find(
+            {"thread_id": thread_id, "hash": {"$in": list(digests)}}, {"hash": 1, "data": 1}
+        ):
+            texts[doc["hash"]] = self.decompressor.decompress(doc["data"]).decode("utf-8")
+        missing = digests - texts.keys()
+        if missing:
+            raise KeyError(f"Missing checkpoint blobs for thread {thread_id}: {sorted(missing)}")
+
+        checkpoint = {
+            **checkpoint_tuple.checkpoint,
+            "channel_values": self._resolve(checkpoint_tuple.checkpoint["channel_values"], texts)
+        }
+        pending_writes = [
+            (task_id, channel, self._resolve(value, texts))
+            for task_id, channel, value in checkpoint_tuple.pending_writes or []
+        ]
+        return checkpoint_tuple._replace(checkpoint=checkpoint, pending_writes=pending_writes)
+
+    def _collect_refs(self, value: Any, digests: set):
+        if type(value) is dict:
+            if BLOB_REF_KEY in value and len(value) == 1:
+                digests.add(value[BLOB_REF_KEY])
+                return
+            for item in value.values():
+                self._collect_refs(item, digests)
+        elif type(value) is list:
+            for item in value:
+                self._collect_refs(item, digests)
+
+    def _resolve(self, value: Any, texts: Dict[str, str]) -> Any:
+        if type(value) is dict:
+            if BLOB_REF_KEY in value and len(value) == 1:
+                return texts[value[BLOB_REF_KEY]]
+            return {key: self._resolve(item, texts) for key, item in value.items()}
+        if type(value) is list:
+            return [self._resolve(item, texts) for item in value]
+        return value
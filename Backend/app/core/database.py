@@ -1,5 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from beanie import init_beanie
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+from app.core.checkpointer import BlobOffloadingMongoDBSaver
 from app.models.models import User, Workflow, WorkflowExecution, NodeTemplate, WorkflowCheckpoint
 from app.core.config import settings
 import asyncio
@@ -8,14 +10,34 @@ from typing import Optional
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database: Optional[AsyncIOMotorDatabase] = None
+    checkpointer: Optional[AsyncMongoDBSaver] = None
 
 db = Database()
 
 async def connect_to_mongo():
-    """Create database connection"""
+    """Create the shared, pooled database connection and workflow checkpointer"""
     try:
-        db.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        db.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS
+        )
         db.database = db.client[settings.DATABASE_NAME]
+
+        # Checkpointer shares the client (and its connection pool); collection names
+        # match the ones the synchronous MongoDBSaver used so existing threads resume.
+        # Large text fields go to the checkpoint_blobs collection, once per thread
+        db.checkpointer = BlobOffloadingMongoDBSaver(
+            db.client,
+            db_name=settings.CHECKPOINT_DATABASE_NAME,
+            checkpoint_collection_name="checkpoints",
+            writes_collection_name="checkpoint_writes",
+            blob_collection_name="checkpoint_blobs",
+            blob_min_bytes=settings.CHECKPOINT_BLOB_MIN_BYTES,
+            # Well inside the compaction grace period, so cached blobs are never collected
+            blob_cache_seconds=settings.CHECKPOINT_GC_GRACE_SECONDS / 2
+        )
         
         # Initialize Beanie
         await init_beanie(
@@ -42,6 +64,9 @@ async def close_mongo_connection():
     """Close database connection"""
     if db.client:
         db.client.close()
+        db.client = None
+        db.database = None
+        db.checkpointer = None
         print("Disconnected from MongoDB!")
 
 async def create_default_node_templates():
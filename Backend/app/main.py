@@ -1,12 +1,50 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import workflow
+from .routers import workflow, admin
 from .core.config import settings
+from .core.database import db, connect_to_mongo, close_mongo_connection
+from .services.workflow_service import WorkflowService
+from .services.workflow_runner import WorkflowRunner
+from .services.workflow_events import WorkflowEventBroker
+from .services.execution_service import ExecutionService
+from .services.checkpoint_retention import CheckpointRetentionService
+from .workflows.workflow_graph import invalidate_compiled_workflows
+from .workflows import nodes
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the pooled MongoDB client and worker pool once per process, close them on shutdown"""
+    await connect_to_mongo()
+    runner = WorkflowRunner()
+    await runner.start()
+    executions = ExecutionService()
+    app.state.workflow_runner = runner
+    app.state.workflow_service = WorkflowService(
+        db.checkpointer, runner, WorkflowEventBroker(), executions
+    )
+    # Background jobs queued before the last shutdown
+    await app.state.workflow_service.requeue_queued()
+    retention = CheckpointRetentionService(
+        db.checkpointer, executions, is_running=app.state.workflow_service.is_running
+    )
+    retention.start()
+    app.state.checkpoint_retention = retention
+    try:
+        yield
+    finally:
+        await retention.stop()
+        await runner.stop()
+        invalidate_compiled_workflows(db.checkpointer)
+        await nodes.llm_cache.close()
+        await nodes.hashnode_service.aclose()
+        await close_mongo_connection()
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -16,10 +54,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Include routers
 app.include_router(workflow.router)
+app.include_router(admin.router)
 
 @app.get("/")
 async def root():
@@ -1,4 +1,5 @@
 from beanie import Document, Link
+from pymongo import IndexModel
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -40,8 +41,8 @@ class User(Document):
     class Settings:
         name = "users"
         indexes = [
-            [("username", 1), {"unique": True}],
-            [("email", 1), {"unique": True}],
+            IndexModel([("username", 1)], unique=True),
+            IndexModel([("email", 1)], unique=True),
         ]
 
 class Workflow(Document):
@@ -63,9 +64,15 @@ class Workflow(Document):
         ]
 
 class WorkflowExecution(Document):
+    """Small per-thread projection of the checkpointed workflow state, updated on
+    every node transition so status reads never load the checkpoint"""
     workflow_id: str = Field(...)
     status: ExecutionStatus = ExecutionStatus.PENDING
+    workflow_status: str = "initialized"
     current_node: Optional[str] = None
+    requires_human_input: bool = False
+    revision: int = 0
+    topic: Optional[str] = None
     execution_data: Dict[str, Any] = Field(default_factory=dict)
     results: Dict[str, Any] = Field(default_factory=dict)
     error_message: Optional[str] = None
@@ -74,14 +81,17 @@ class WorkflowExecution(Document):
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     last_updated: datetime = Field(default_factory=datetime.utcnow)
+    expire_at: Optional[datetime] = None  # Set once the thread is finished; removed by the TTL index
 
     class Settings:
         name = "workflow_executions"
         indexes = [
             [("workflow_id", 1)],
             [("status", 1)],
+            [("workflow_status", 1)],
             [("user_id", 1)],
-            [("thread_id", 1)],
+            IndexModel([("thread_id", 1)], unique=True),
+            IndexModel([("expire_at", 1)], expireAfterSeconds=0),
         ]
 
 class NodeTemplate(Document):
@@ -99,7 +109,7 @@ class NodeTemplate(Document):
         name = "node_templates"
         indexes = [
             [("category", 1)],
-            [("name", 1), {"unique": True}],
+            IndexModel([("name", 1)], unique=True),
         ]
 
 class WorkflowCheckpoint(Document):
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from ..services.checkpoint_retention import CheckpointRetentionService
+from ..services.twitter_service import tweet_rate_limiter
+from ..workflows import nodes
+from typing import Dict, Any
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Dependency to get the retention service created in the app lifespan
+def get_retention_service(request: Request) -> CheckpointRetentionService:
+    return request.app.state.checkpoint_retention
+
+@router.post("/checkpoints/compact", response_model=Dict[str, Any])
+async def compact_checkpoints(
+    retention: CheckpointRetentionService = Depends(get_retention_service)
+):
+    """Run checkpoint compaction now and report the reclaimed bytes"""
+    try:
+        return await retention.compact()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/checkpoints/compact", response_model=Dict[str, Any])
+async def get_last_compaction(
+    retention: CheckpointRetentionService = Depends(get_retention_service)
+):
+    """Report of the most recent compaction run"""
+    if retention.last_report is None:
+        raise HTTPException(status_code=404, detail="Compaction has not run yet")
+    return retention.last_report
+
+@router.get("/llm-cache/metrics", response_model=Dict[str, Any])
+async def get_llm_cache_metrics():
+    """Hit/miss counts of the LLM response cache, per node"""
+    return nodes.llm_cache.get_metrics()
+
+@router.get("/twitter/rate-limit", response_model=Dict[str, Any])
+async def get_twitter_rate_limit():
+    """Remaining tweet budget and threads parked on the rate limiter"""
+    return tweet_rate_limiter.get_metrics()
@@ -1,13 +1,30 @@
-from fastapi import APIRouter, HTTPException, Depends
-from ..schemas.workflow_state import WorkflowRequest, HumanInputRequest, WorkflowResponse
+from fastapi import APIRouter, HTTPException, Depends, Request, Header, Response, Body
+from fastapi.responses import StreamingResponse
+from ..schemas.workflow_state import (
+    WorkflowRequest, HumanInputRequest, WorkflowResponse, WorkflowBatchResponse,
+    WorkflowDecision, WorkflowDecisionBatchResponse, WorkflowStatusBatchRequest
+)
 from ..services.workflow_service import WorkflowService
-from typing import Dict, Any
+from ..services.workflow_runner import WorkflowQueueFullError
+from ..core.checkpointer import ThreadBusyError
+from ..core.config import settings
+from typing import Dict, Any, List, Optional
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
-# Dependency to get workflow service
-def get_workflow_service():
-    return WorkflowService()
+# Dependency to get the process-wide workflow service created in the app lifespan
+def get_workflow_service(request: Request) -> WorkflowService:
+    return request.app.state.workflow_service
+
+def _etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Whether an If-None-Match header matches the current ETag"""
+    if not if_none_match or not etag:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
 
 @router.post("/start", response_model=WorkflowResponse)
 async def start_workflow(
@@ -18,9 +35,73 @@ async def start_workflow(
     try:
         result = await workflow_service.start_workflow(request)
         return WorkflowResponse(**result)
+    except WorkflowQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/start:batch", response_model=WorkflowBatchResponse)
+async def start_workflow_batch(
+    requests: List[Dict[str, Any]] = Body(...),
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+):
+    """Queue many workflows at once; items are validated individually so one
+    bad item does not fail the batch"""
+    if len(requests) > settings.WORKFLOW_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.WORKFLOW_BATCH_MAX_ITEMS} workflows"
+        )
+    try:
+        result = await workflow_service.start_workflow_batch(requests)
+        return WorkflowBatchResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/decisions:batch", response_model=WorkflowDecisionBatchResponse)
+async def apply_decisions_batch(
+    decisions: List[WorkflowDecision],
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+):
+    """Approve or reject many paused workflows; results are reported per thread"""
+    if len(decisions) > settings.WORKFLOW_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.WORKFLOW_BATCH_MAX_ITEMS} decisions"
+        )
+    try:
+        result = await workflow_service.apply_decisions(decisions)
+        return WorkflowDecisionBatchResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/status:batch", response_model=Dict[str, Any])
+async def get_workflow_statuses(
+    request: WorkflowStatusBatchRequest,
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+):
+    """Get the status of many workflows with one query, optionally only some fields"""
+    if len(request.thread_ids) > settings.WORKFLOW_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.WORKFLOW_BATCH_MAX_ITEMS} threads"
+        )
+    try:
+        return await workflow_service.get_workflow_statuses(request.thread_ids, request.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/queue/metrics", response_model=Dict[str, Any])
+async def get_queue_metrics(
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+):
+    """Get background worker pool metrics"""
+    if workflow_service.runner is None:
+        raise HTTPException(status_code=404, detail="Background execution is not enabled")
+    return workflow_service.runner.get_metrics()
+
 @router.post("/{thread_id}/input", response_model=WorkflowResponse)
 async def provide_human_input(
     thread_id: str,
@@ -32,32 +113,72 @@ async def provide_human_input(
         request.thread_id = thread_id
         result = await workflow_service.provide_human_input(request)
         return WorkflowResponse(**result)
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except WorkflowQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{thread_id}/status", response_model=Dict[str, Any])
 async def get_workflow_status(
     thread_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     workflow_service: WorkflowService = Depends(get_workflow_service)
 ):
-    """Get workflow status"""
+    """Get workflow status (answers If-None-Match with 304 from the revision alone)"""
     try:
+        # Version first, so the body returned is never older than its ETag
+        etag = await workflow_service.get_status_version(thread_id)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
         result = await workflow_service.get_workflow_status(thread_id)
+        if etag:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{thread_id}/events")
+async def stream_workflow_events(
+    thread_id: str,
+    last_event_id: Optional[str] = Header(None),
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+):
+    """Stream workflow status transitions and LLM tokens as Server-Sent Events"""
+    if workflow_service.events is None:
+        raise HTTPException(status_code=404, detail="Event streaming is not enabled")
+    return StreamingResponse(
+        workflow_service.stream_events(thread_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{thread_id}/state", response_model=Dict[str, Any])
 async def get_workflow_state(
     thread_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     workflow_service: WorkflowService = Depends(get_workflow_service)
 ):
-    """Get complete workflow state"""
+    """Get complete workflow state (304 without deserializing the checkpoint when unchanged)"""
     try:
-        result = await workflow_service.get_workflow_status(thread_id)
-        if result.get("status") == "not_found":
+        etag = await workflow_service.get_state_version(thread_id)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+        state = await workflow_service.get_workflow_state(thread_id)
+        if not state:
             raise HTTPException(status_code=404, detail="Workflow not found")
-        return result.get("state", {})
+        if etag:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+        return state
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -75,6 +196,8 @@ async def approve_hashnode_publishing(
         )
         result = await workflow_service.provide_human_input(request)
         return WorkflowResponse(**result)
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -92,6 +215,8 @@ async def reject_hashnode_publishing(
         )
         result = await workflow_service.provide_human_input(request)
         return WorkflowResponse(**result)
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -109,6 +234,10 @@ async def approve_twitter_publishing(
         )
         result = await workflow_service.provide_human_input(request)
         return WorkflowResponse(**result)
+    except WorkflowQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -126,5 +255,21 @@ async def reject_twitter_publishing(
         )
         result = await workflow_service.provide_human_input(request)
         return WorkflowResponse(**result)
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{thread_id}/retry/twitter", response_model=WorkflowResponse)
+async def retry_twitter_publishing(
+    thread_id: str,
+    workflow_service: WorkflowService = Depends(get_workflow_service)
+):
+    """Retry a failed Twitter thread from the last tweet that was posted"""
+    try:
+        result = await workflow_service.retry_twitter_publish(thread_id)
+        return WorkflowResponse(**result)
+    except WorkflowQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,15 +1,29 @@
-from typing import TypedDict, Annotated, Optional, List, Dict, Any
+from typing import TypedDict, Annotated, Optional, List, Dict, Any, Literal
 from langgraph.graph.message import add_messages
 from pydantic import BaseModel
 from datetime import datetime
+from ..core.config import settings
+
+def add_messages_capped(left: List, right: List) -> List:
+    """add_messages reducer that keeps only the most recent WORKFLOW_MESSAGE_LOG_LIMIT entries.
+
+    Nodes return just their new messages, so each step writes a constant-size
+    delta and the checkpointed log stays bounded.
+    """
+    merged = add_messages(left, right)
+    limit = settings.WORKFLOW_MESSAGE_LOG_LIMIT
+    if limit > 0 and len(merged) > limit:
+        return merged[-limit:]
+    return merged
 
 class WorkflowState(TypedDict):
     """State for the N8N workflow"""
-    messages: Annotated[List[Dict[str, Any]], add_messages]
+    messages: Annotated[List[Dict[str, Any]], add_messages_capped]
     user_id: str
     topic: Optional[str]
     blog_content: Optional[str]
     theme: Optional[str]
+    include_plain_draft: Optional[bool]
     themed_blog: Optional[str]
     twitter_thread: Optional[str]
     hashnode_post: Optional[Dict[str, Any]]
@@ -25,8 +39,42 @@ class WorkflowRequest(BaseModel):
     user_id: str
     topic: str
     theme: Optional[str] = None
+    include_plain_draft: bool = False  # Keep the unthemed draft when fused generation is on
     schedule_twitter: Optional[datetime] = None
     schedule_hashnode: Optional[datetime] = None
+    background: bool = False  # Return immediately and run the graph on the worker pool
+
+class WorkflowBatchItem(BaseModel):
+    index: int  # Position in the submitted list
+    thread_id: Optional[str] = None
+    status: str  # "queued" or "rejected"
+    error: Optional[str] = None
+
+class WorkflowBatchResponse(BaseModel):
+    accepted: int
+    rejected: int
+    items: List[WorkflowBatchItem]
+
+class WorkflowDecision(BaseModel):
+    thread_id: str
+    target: Literal["hashnode", "twitter"]
+    decision: Literal["approve", "reject"]
+
+class WorkflowDecisionResult(BaseModel):
+    thread_id: str
+    applied: bool
+    status: str
+    current_node: Optional[str] = None
+    error: Optional[str] = None
+
+class WorkflowDecisionBatchResponse(BaseModel):
+    applied: int
+    skipped: int
+    items: List[WorkflowDecisionResult]
+
+class WorkflowStatusBatchRequest(BaseModel):
+    thread_ids: List[str]
+    fields: Optional[List[str]] = None  # Subset of the /status fields; all when omitted
 
 class HumanInputRequest(BaseModel):
     thread_id: str
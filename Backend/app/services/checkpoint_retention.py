@@ -0,0 +1,181 @@
+"""
+Checkpoint retention: compacts old checkpoints and expires finished threads
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+from ..core.config import settings
+from .execution_service import ExecutionService
+
+
+class CheckpointRetentionService:
+    def __init__(self, checkpointer, executions: ExecutionService,
+                 keep: Optional[int] = None, ttl_seconds: Optional[int] = None,
+                 grace_seconds: Optional[int] = None,
+                 is_running: Optional[Callable[[str], bool]] = None):
+        """Works on the Mongo checkpointer's collections directly.
+
+        Threads updated within grace_seconds, or that is_running reports as
+        queued or running in this process, are left untouched; blobs stored
+        within grace_seconds are never collected, as their checkpoint may not
+        have landed yet.
+        """
+        self.checkpointer = checkpointer
+        self.executions = executions
+        self.keep = max(1, keep or settings.CHECKPOINT_RETENTION_COUNT)
+        self.ttl_seconds = ttl_seconds or settings.CHECKPOINT_TERMINAL_TTL_SECONDS
+        self.grace_seconds = grace_seconds if grace_seconds is not None else settings.CHECKPOINT_GC_GRACE_SECONDS
+        self.is_running = is_running or (lambda thread_id: False)
+        self.task: Optional[asyncio.Task] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.lock = asyncio.Lock()
+
+    def start(self, interval: Optional[float] = None):
+        """Run compaction periodically in the background"""
+        interval = interval if interval is not None else settings.CHECKPOINT_COMPACTION_INTERVAL_SECONDS
+        if interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self._run_periodically(interval), name="checkpoint-retention")
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def compact(self) -> Dict[str, Any]:
+        """Keep the latest checkpoints of every thread, drop blobs nothing references
+        any more and schedule finished threads for expiry"""
+        async with self.lock:
+            report = {
+                "threads_compacted": 0,
+                "threads_skipped": 0,
+                "checkpoints_deleted": 0,
+                "writes_deleted": 0,
+                "blobs_deleted": 0,
+                "reclaimed_bytes": 0,
+                "threads_expiring": 0,
+                "started_at": datetime.utcnow()
+            }
+
+            await self.checkpointer._setup()
+            cutoff = datetime.utcnow() - timedelta(seconds=self.grace_seconds)
+            oversized = [
+                group["_id"] async for group in self.checkpointer.checkpoint_collection.aggregate([
+                    {"$group": {
+                        "_id": {"thread_id": "$thread_id", "checkpoint_ns": "$checkpoint_ns"},
+                        "count": {"$sum": 1}
+                    }},
+                    {"$match": {"count": {"$gt": self.keep}}}
+                ])
+            ]
+            last_updated = await self.executions.get_last_updated(
+                list({thread["thread_id"] for thread in oversized})
+            )
+            for thread in oversized:
+                thread_id = thread["thread_id"]
+                # Threads without a projection predate it and are treated as idle
+                if self.is_running(thread_id) or last_updated.get(thread_id, cutoff) > cutoff:
+                    report["threads_skipped"] += 1
+                    continue
+                await self._compact_thread(thread_id, thread["checkpoint_ns"], cutoff, report)
+                report["threads_compacted"] += 1
+
+            report["threads_expiring"] = await self._expire_finished_threads(cutoff)
+            report["finished_at"] = datetime.utcnow()
+            self.last_report = report
+            return report
+
+    async def _compact_thread(self, thread_id: str, checkpoint_ns: str, cutoff: datetime,
+                              report: Dict[str, Any]):
+        thread = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}
+        stale_ids = [
+            doc["checkpoint_id"]
+            async for doc in self.checkpointer.checkpoint_collection.find(
+                thread, {"checkpoint_id": 1}, sort=[("checkpoint_id", -1)], skip=self.keep
+            )
+        ]
+        if not stale_ids:
+            return
+
+        stale = {**thread, "checkpoint_id": {"$in": stale_ids}}
+        report["checkpoints_deleted"] += await self._delete(self.checkpointer.checkpoint_collection, stale, report)
+        report["writes_deleted"] += await self._delete(self.checkpointer.writes_collection, stale, report)
+
+        blob_collection = getattr(self.checkpointer, "blob_collection", None)
+        if blob_collection is not None:
+            # Blobs are stored before the checkpoint that references them, so
+            # recently stored ones may belong to a checkpoint still on its way
+            referenced = await self.checkpointer.areferenced_blobs(thread_id)
+            old = {"$or": [
+                {"stored_at": {"$lt": cutoff}},
+                {"stored_at": {"$exists": False}, "created_at": {"$lt": cutoff}}
+            ]}
+            digests = [
+                doc["hash"] async for doc in blob_collection.find(
+                    {"thread_id": thread_id, "hash": {"$nin": list(referenced)}, **old}, {"hash": 1}
+                )
+            ]
+            if digests:
+                unreferenced = {"thread_id": thread_id, "hash": {"$in": digests}, **old}
+                report["blobs_deleted"] += await self._delete(blob_collection, unreferenced, report)
+                self.checkpointer.forget_blobs(thread_id, digests)
+
+    async def _delete(self, collection, query: Dict[str, Any], report: Dict[str, Any]) -> int:
+        """Delete matching documents, adding their BSON size to the report"""
+        sizes = collection.aggregate([
+            {"$match": query},
+            {"$group": {"_id": None, "bytes": {"$sum": {"$bsonSize": "$$ROOT"}}}}
+        ])
+        async for total in sizes:
+            report["reclaimed_bytes"] += total["bytes"]
+        result = await collection.delete_many(query)
+        return result.deleted_count
+
+    async def _expire_finished_threads(self, cutoff: datetime) -> int:
+        """Set expire_at on every document of threads that finished before the
+        grace period; the TTL indexes do the rest. WorkflowService clears it
+        again when such a thread is resumed.
+
+        The projection is flagged first: a run that starts afterwards sees the
+        flag and clears the documents too. Threads whose flag was cleared while
+        their documents were being marked are unmarked again here.
+        """
+        thread_ids = [
+            thread_id for thread_id in await self.executions.get_finished_without_expiry(cutoff)
+            if not self.is_running(thread_id)
+        ]
+        if not thread_ids:
+            return 0
+
+        expire_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        thread_ids = await self.executions.set_expiry(thread_ids, expire_at, cutoff)
+        if not thread_ids:
+            return 0
+
+        collections = [self.checkpointer.checkpoint_collection, self.checkpointer.writes_collection]
+        if getattr(self.checkpointer, "blob_collection", None) is not None:
+            collections.append(self.checkpointer.blob_collection)
+        for collection in collections:
+            await collection.update_many(
+                {"thread_id": {"$in": thread_ids}}, {"$set": {"expire_at": expire_at}}
+            )
+
+        still_expiring = set(await self.executions.get_expiring(thread_ids, expire_at))
+        resumed = [thread_id for thread_id in thread_ids if thread_id not in still_expiring]
+        if resumed:
+            for collection in collections:
+                await collection.update_many(
+                    {"thread_id": {"$in": resumed}}, {"$unset": {"expire_at": ""}}
+                )
+        return len(still_expiring)
+
+    async def _run_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                report = await self.compact()
+                print(f"Checkpoint compaction reclaimed {report['reclaimed_bytes']} bytes "
+                      f"from {report['threads_compacted']} threads")
+            except Exception as e:
+                print(f"Checkpoint compaction failed: {e}")
@@ -0,0 +1,249 @@
+"""
+Maintains the WorkflowExecution projection used for cheap status reads
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, create_model
+from beanie.operators import In
+from ..models.models import WorkflowExecution, ExecutionStatus
+from .workflow_events import TERMINAL_STATUSES
+
+WORKFLOW_ID = "content_pipeline"
+HUMAN_INPUT_NODES = ["hashnode_post", "twitter_post"]
+
+# /status field name -> projection document fields needed to build it
+STATUS_FIELDS = {
+    "status": ["workflow_status", "current_node"],
+    "current_node": ["current_node"],
+    "requires_human_input": ["requires_human_input"],
+    "execution_status": ["status"],
+    "results": ["results"],
+    "error_message": ["error_message"],
+    "revision": ["revision"],
+    "topic": ["topic"],
+    "user_id": ["user_id"],
+    "started_at": ["started_at"],
+    "completed_at": ["completed_at"],
+    "last_updated": ["last_updated"]
+}
+
+
+def to_execution_status(workflow_status: str) -> ExecutionStatus:
+    """Map a graph workflow_status onto the coarse ExecutionStatus"""
+    if workflow_status == "queued":
+        return ExecutionStatus.PENDING
+    if workflow_status.startswith("waiting_"):
+        return ExecutionStatus.WAITING_FOR_INPUT
+    if workflow_status in ["failed", "twitter_failed"]:
+        return ExecutionStatus.FAILED
+    if workflow_status in TERMINAL_STATUSES:
+        return ExecutionStatus.COMPLETED
+    return ExecutionStatus.RUNNING
+
+
+def extract_results(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the published links and errors out of the full state"""
+    hashnode_post = values.get("hashnode_post") or {}
+    twitter_post = values.get("twitter_post") or {}
+    results = {
+        "hashnode_url": hashnode_post.get("url"),
+        "hashnode_error": hashnode_post.get("error"),
+        "twitter_thread_url": twitter_post.get("thread_url"),
+        "twitter_error": twitter_post.get("error")
+    }
+    return {key: value for key, value in results.items() if value is not None}
+
+
+class ExecutionRevision(BaseModel):
+    """Projection used for version checks, so only the revision is read"""
+    revision: int
+
+
+class ExecutionWaitState(BaseModel):
+    """Projection used to check which threads are paused for a decision"""
+    thread_id: str
+    workflow_status: str
+
+
+class ExecutionActivity(BaseModel):
+    """Projection used by compaction to leave recently active threads alone"""
+    thread_id: str
+    last_updated: datetime
+
+
+@lru_cache(maxsize=64)
+def execution_fields(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Projection model reading only `fields` (plus thread_id) of the projection"""
+    model = create_model(
+        "ExecutionFields",
+        thread_id=(str, ...),
+        **{field: (Optional[Any], None) for field in fields}
+    )
+    # Beanie builds the query projection from Settings.projection when present
+    model.Settings = type("Settings", (), {"projection": {"thread_id": 1, "_id": 0, **{field: 1 for field in fields}}})
+    return model
+
+
+class ExecutionService:
+    def new_execution(self, thread_id: str, user_id: str, topic: Optional[str],
+                      workflow_status: str = "initialized") -> WorkflowExecution:
+        """Build (but do not insert) the projection document for a new thread"""
+        return WorkflowExecution(
+            workflow_id=WORKFLOW_ID,
+            thread_id=thread_id,
+            user_id=user_id,
+            topic=topic,
+            workflow_status=workflow_status,
+            status=to_execution_status(workflow_status),
+            current_node="start"
+        )
+
+    async def create(self, thread_id: str, user_id: str, topic: Optional[str],
+                     workflow_status: str = "initialized") -> WorkflowExecution:
+        """Insert the projection document for a new thread"""
+        execution = self.new_execution(thread_id, user_id, topic, workflow_status)
+        await execution.insert()
+        return execution
+
+    async def create_many(self, executions: List[WorkflowExecution]):
+        """Insert the projection documents for a batch of threads in one round trip"""
+        if executions:
+            await WorkflowExecution.insert_many(executions)
+
+    async def record_transition(self, thread_id: str, workflow_status: str, current_node: Optional[str],
+                                values: Optional[Dict[str, Any]] = None,
+                                error_message: Optional[str] = None):
+        """Apply one node transition to the projection and bump its revision"""
+        fields = self._transition_fields(workflow_status, current_node)
+        if values:
+            fields["results"] = extract_results(values)
+        if error_message:
+            fields["error_message"] = error_message
+
+        await WorkflowExecution.find_one(WorkflowExecution.thread_id == thread_id).update(
+            {"$set": fields, "$inc": {"revision": 1}}
+        )
+
+    def _transition_fields(self, workflow_status: str, current_node: Optional[str]) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        fields = {
+            "workflow_status": workflow_status,
+            "status": to_execution_status(workflow_status).value,
+            "last_updated": now
+        }
+        if current_node is not None:
+            fields["current_node"] = current_node
+            fields["requires_human_input"] = current_node in HUMAN_INPUT_NODES
+        if workflow_status in TERMINAL_STATUSES:
+            fields["completed_at"] = now
+        return fields
+
+    async def compare_and_set_status(self, thread_id: str, expected: str, workflow_status: str,
+                                     current_node: Optional[str], revision: Optional[int] = None) -> bool:
+        """Apply a transition only if the projection still has the expected status
+        (and, when given, the revision it was read at), atomically; False when
+        another writer changed it first"""
+        conditions = [WorkflowExecution.thread_id == thread_id, WorkflowExecution.workflow_status == expected]
+        if revision is not None:
+            conditions.append(WorkflowExecution.revision == revision)
+        result = await WorkflowExecution.find_one(*conditions).update(
+            {"$set": self._transition_fields(workflow_status, current_node), "$inc": {"revision": 1}}
+        )
+        return bool(result and result.modified_count)
+
+    async def bump_revision(self, thread_id: str):
+        """Invalidate cached /state reads without changing the projected status"""
+        await WorkflowExecution.find_one(WorkflowExecution.thread_id == thread_id).update(
+            {"$inc": {"revision": 1}}
+        )
+
+    async def get(self, thread_id: str) -> Optional[WorkflowExecution]:
+        """Indexed lookup of a thread's projection"""
+        return await WorkflowExecution.find_one(WorkflowExecution.thread_id == thread_id)
+
+    async def get_wait_states(self, thread_ids: List[str]) -> Dict[str, str]:
+        """workflow_status of many threads from one $in query"""
+        executions = await WorkflowExecution.find(
+            In(WorkflowExecution.thread_id, thread_ids)
+        ).project(ExecutionWaitState).to_list()
+        return {execution.thread_id: execution.workflow_status for execution in executions}
+
+    async def get_with_status(self, workflow_status: str) -> List[str]:
+        """Thread ids whose projection currently has the given workflow_status"""
+        executions = await WorkflowExecution.find(
+            WorkflowExecution.workflow_status == workflow_status
+        ).project(ExecutionWaitState).to_list()
+        return [execution.thread_id for execution in executions]
+
+    async def get_many(self, thread_ids: List[str], fields: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Projection documents for many threads from one indexed $in query,
+        reading only the given document fields"""
+        executions = await WorkflowExecution.find(
+            In(WorkflowExecution.thread_id, thread_ids)
+        ).project(execution_fields(tuple(sorted(fields)))).to_list()
+        return {execution.thread_id: execution.model_dump() for execution in executions}
+
+    async def get_last_updated(self, thread_ids: List[str]) -> Dict[str, datetime]:
+        """last_updated of many threads from one $in query"""
+        executions = await WorkflowExecution.find(
+            In(WorkflowExecution.thread_id, thread_ids)
+        ).project(ExecutionActivity).to_list()
+        return {execution.thread_id: execution.last_updated for execution in executions}
+
+    def _finished_before(self, updated_before: datetime) -> Dict[str, Any]:
+        return {
+            "workflow_status": {"$in": TERMINAL_STATUSES},
+            "expire_at": None,
+            "last_updated": {"$lt": updated_before}
+        }
+
+    async def get_finished_without_expiry(self, updated_before: datetime, limit: int = 1000) -> List[str]:
+        """Thread ids of executions that finished before updated_before and have
+        not been scheduled to expire yet"""
+        executions = await WorkflowExecution.find(
+            self._finished_before(updated_before)
+        ).limit(limit).project(ExecutionWaitState).to_list()
+        return [execution.thread_id for execution in executions]
+
+    async def set_expiry(self, thread_ids: List[str], expire_at: datetime, updated_before: datetime) -> List[str]:
+        """Schedule the projections of the given threads for TTL removal, unless
+        they were updated (e.g. resumed) since they were selected; returns the
+        thread ids that were scheduled"""
+        # Stored with millisecond precision, so it can be matched again below
+        expire_at = expire_at.replace(microsecond=expire_at.microsecond // 1000 * 1000)
+        await WorkflowExecution.find(
+            In(WorkflowExecution.thread_id, thread_ids), self._finished_before(updated_before)
+        ).update({"$set": {"expire_at": expire_at}})
+        return await self.get_expiring(thread_ids, expire_at)
+
+    async def get_expiring(self, thread_ids: List[str], expire_at: datetime) -> List[str]:
+        """Those of the given threads whose projection is scheduled to expire at expire_at"""
+        executions = await WorkflowExecution.find(
+            In(WorkflowExecution.thread_id, thread_ids), WorkflowExecution.expire_at == expire_at
+        ).project(ExecutionWaitState).to_list()
+        return [execution.thread_id for execution in executions]
+
+    async def has_expiry(self, thread_id: str) -> bool:
+        """Whether a thread's projection is scheduled for TTL removal"""
+        return await WorkflowExecution.find(
+            WorkflowExecution.thread_id == thread_id, WorkflowExecution.expire_at != None  # noqa: E711
+        ).count() > 0
+
+    async def clear_expiry(self, thread_id: str):
+        """Take a thread's projection off the TTL schedule"""
+        await WorkflowExecution.find_one(WorkflowExecution.thread_id == thread_id).update(
+            {"$unset": {"expire_at": ""}}
+        )
+
+    async def get_revision(self, thread_id: str) -> Optional[int]:
+        """Read just the revision of a thread's projection"""
+        execution = await WorkflowExecution.find_one(
+            WorkflowExecution.thread_id == thread_id
+        ).project(ExecutionRevision)
+        return execution.revision if execution else None
+
+    async def delete(self, thread_id: str):
+        """Remove a thread's projection"""
+        await WorkflowExecution.find_one(WorkflowExecution.thread_id == thread_id).delete()
@@ -1,18 +1,142 @@
+import asyncio
 import httpx
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from ..core.config import settings
 import json
 
+POST_FIELDS = """
+    post {
+        id
+        title
+        slug
+        url
+        publishedAt
+        tags {
+            name
+            slug
+        }
+    }
+"""
+
+class HashnodeAPIError(Exception):
+    """Raised when Hashnode rejects a request (4xx status or GraphQL errors)"""
+
+class HashnodeUnavailableError(Exception):
+    """Raised on a 5xx response (e.g. a gateway timeout); the request may still
+    have been applied, so callers must not retry it or try another operation"""
+
 class HashnodeService:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None):
         self.api_key = settings.HASHNODE_API_KEY
-        self.base_url = "https://gql.hashnode.com"
+        self.base_url = base_url or settings.HASHNODE_API_URL
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": self.api_key
         }
+        # One pooled keep-alive client for every call, created on first use
+        self.client: Optional[httpx.AsyncClient] = None
+        # (expires_at, publication_id, user_id) from the `me` query
+        self._publication: Optional[Tuple[float, str, Optional[str]]] = None
+        self._publication_lock = asyncio.Lock()
+        # Direct publishes waiting for the batch window: (input, future)
+        self._pending_publishes: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_tasks = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            limits = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+            try:
+                self.client = httpx.AsyncClient(http2=settings.HASHNODE_HTTP2, limits=limits, timeout=60.0)
+            except ImportError:
+                # http2=True needs the h2 package (httpx[http2])
+                print("h2 is not installed, using HTTP/1.1 keep-alive for Hashnode")
+                self.client = httpx.AsyncClient(limits=limits, timeout=60.0)
+        return self.client
+
+    async def aclose(self):
+        """Close the pooled client"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _post(self, query: str, variables: Optional[Dict[str, Any]] = None,
+                    timeout: float = 60.0) -> Dict[str, Any]:
+        """POST a GraphQL operation on the shared client and return the response body"""
+        payload: Dict[str, Any] = {"query": query}
+        if variables is not None:
+            payload["variables"] = variables
+        response = await self._get_client().post(
+            f"{self.base_url}/graphql",
+            headers=self.headers,
+            json=payload,
+            timeout=timeout
+        )
+
+        if response.status_code >= 500:
+            raise HashnodeUnavailableError(f"API request failed with {response.status_code}: {response.text}")
+        if response.status_code != 200:
+            raise HashnodeAPIError(f"API request failed: {response.text}")
+        return response.json()
+
+    async def _graphql(self, query: str, variables: Optional[Dict[str, Any]] = None,
+                       timeout: float = 60.0) -> Dict[str, Any]:
+        """Run a GraphQL operation and return its `data`, raising on any GraphQL error"""
+        data = await self._post(query, variables, timeout)
+        # Check for GraphQL errors
+        if data.get("errors"):
+            error_messages = [error.get("message", "Unknown error") for error in data.get("errors", [])]
+            raise HashnodeAPIError(f"GraphQL errors: {'; '.join(error_messages)}")
+        return data.get("data") or {}
+
+    async def get_publication(self) -> Tuple[str, Optional[str]]:
+        """Publication id and user id to publish as, cached for HASHNODE_PUBLICATION_TTL_SECONDS.
+
+        Falls back to HASHNODE_PUBLICATION_ID (not cached) when the lookup fails.
+        """
+        cached = self._publication
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        async with self._publication_lock:
+            cached = self._publication
+            if cached and cached[0] > time.monotonic():
+                return cached[1], cached[2]
+
+            try:
+                user_info = await self.get_user_info()
+                user_id = user_info.get("id")
+
+                # Get the first publication from the user
+                publications = user_info.get("publications", {}).get("edges", [])
+                if not publications:
+                    raise Exception("No publications found for user")
+
+                publication = publications[0]["node"]
+                publication_id = publication.get("id")
+
+                if not publication_id:
+                    raise Exception("Publication ID not found in user info")
+
+                print(f"Publication ID: {publication_id}")
+                print(f"User ID: {user_id}")
+                print(f"Publication Title: {publication.get('title')}")
+                print(f"Publication URL: {publication.get('url')}")
+
+            except Exception as e:
+                print(f"Failed to get user info: {e}")
+                # Fallback to using settings if available
+                if not settings.HASHNODE_PUBLICATION_ID:
+                    raise Exception("No publication ID available. Please set HASHNODE_PUBLICATION_ID in your .env file")
+                return settings.HASHNODE_PUBLICATION_ID, None
+
+            self._publication = (
+                time.monotonic() + settings.HASHNODE_PUBLICATION_TTL_SECONDS, publication_id, user_id
+            )
+            return publication_id, user_id
     
-    def get_user_info(self) -> Dict[str, Any]:
+    async def get_user_info(self) -> Dict[str, Any]:
         """Get user information from Hashnode"""
         query = """
         query {
@@ -34,63 +158,11 @@ class HashnodeService:
         }
         """
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{self.base_url}/graphql",
-                headers=self.headers,
-                json={"query": query}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for GraphQL errors
-                if data.get("errors"):
-                    error_messages = [error.get("message", "Unknown error") for error in data.get("errors", [])]
-                    raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
-                
-                return data.get("data", {}).get("me", {})
-            else:
-                raise Exception(f"Failed to get user info: {response.text}")
+        data = await self._graphql(query, timeout=30.0)
+        return data.get("me") or {}
     
-    def create_post(self, title: str, content: str, tags: list, is_republished: bool = False) -> Dict[str, Any]:
-        """Create a new post on Hashnode"""
-        print(f"Creating post with title: {title}")
-        print(f"Content length: {len(content)}")
-        print(f"Tags: {tags}")
-        print(f"API Key: {self.api_key[:10]}..." if self.api_key else "No API key")
-        
-        # First get user info to get publication ID
-        try:
-            user_info = self.get_user_info()
-            user_id = user_info.get("id")
-            
-            # Get the first publication from the user
-            publications = user_info.get("publications", {}).get("edges", [])
-            if not publications:
-                raise Exception("No publications found for user")
-            
-            publication = publications[0]["node"]
-            publication_id = publication.get("id")
-            
-            if not publication_id:
-                raise Exception("Publication ID not found in user info")
-            
-            print(f"Publication ID: {publication_id}")
-            print(f"User ID: {user_id}")
-            print(f"Publication Title: {publication.get('title')}")
-            print(f"Publication URL: {publication.get('url')}")
-            
-        except Exception as e:
-            print(f"Failed to get user info: {e}")
-            # Fallback to using settings if available
-            publication_id = settings.HASHNODE_PUBLICATION_ID
-            user_id = None
-            
-            if not publication_id:
-                raise Exception("No publication ID available. Please set HASHNODE_PUBLICATION_ID in your .env file")
-        
-        # Process tags to include both name and slug
+    def _process_tags(self, tags: list) -> List[Dict[str, str]]:
+        """Tag inputs with both name and slug"""
         processed_tags = []
         for tag in tags:
             if isinstance(tag, str):
@@ -112,7 +184,19 @@ class HashnodeService:
         # If no tags provided, add a default tag
         if not processed_tags:
             processed_tags = [{"name": "blog", "slug": "blog"}]
+        return processed_tags
+
+    async def create_post(self, title: str, content: str, tags: list, is_republished: bool = False) -> Dict[str, Any]:
+        """Create a new post on Hashnode"""
+        print(f"Creating post with title: {title}")
+        print(f"Content length: {len(content)}")
+        print(f"Tags: {tags}")
+        print(f"API Key: {self.api_key[:10]}..." if self.api_key else "No API key")
+        
+        # Publication to post to (cached, see get_publication)
+        publication_id, user_id = await self.get_publication()
         
+        processed_tags = self._process_tags(tags)
         print(f"Processed tags: {processed_tags}")
         
         # Updated GraphQL query for Hashnode - removed contentMarkdown field
@@ -146,63 +230,30 @@ class HashnodeService:
         print(f"Making request to: {self.base_url}/graphql")
         print(f"Variables: {json.dumps(variables, indent=2)}")
         
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(
-                f"{self.base_url}/graphql",
-                headers=self.headers,
-                json={
-                    "query": query,
-                    "variables": variables
-                }
-            )
-            
-            print(f"Response status: {response.status_code}")
-            print(f"Response body: {response.text}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for GraphQL errors
-                if data.get("errors"):
-                    error_messages = [error.get("message", "Unknown error") for error in data.get("errors", [])]
-                    raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
-                
-                result = data.get("data", {}).get("createDraft", {})
-                
-                if result.get("draft"):
-                    draft = result.get("draft", {})
-                    return {
-                        "success": True,
-                        "draft_id": draft.get("id"),
-                        "title": draft.get("title"),
-                        "slug": draft.get("slug"),
-                        "message": "Draft created successfully"
-                    }
-                else:
-                    raise Exception(f"Failed to create draft: {data}")
-            else:
-                raise Exception(f"API request failed: {response.text}")
+        data = await self._graphql(query, variables, timeout=60.0)
+        result = data.get("createDraft") or {}
+        print(f"Create draft result: {result}")
+        
+        if result.get("draft"):
+            draft = result.get("draft", {})
+            return {
+                "success": True,
+                "draft_id": draft.get("id"),
+                "title": draft.get("title"),
+                "slug": draft.get("slug"),
+                "message": "Draft created successfully"
+            }
+        else:
+            raise Exception(f"Failed to create draft: {data}")
     
-    def publish_draft(self, draft_id: str) -> Dict[str, Any]:
+    async def publish_draft(self, draft_id: str) -> Dict[str, Any]:
         """Publish a draft post"""
         print(f"Publishing draft with ID: {draft_id}")
 
-        query = """
-        mutation PublishDraft($input: PublishDraftInput!) {
-            publishDraft(input: $input) {
-                post {
-                    id
-                    title
-                    slug
-                    url
-                    publishedAt
-                    tags {
-                        name
-                        slug
-                    }
-                }
-            }
-        }
+        query = f"""
+        mutation PublishDraft($input: PublishDraftInput!) {{
+            publishDraft(input: $input) {{{POST_FIELDS}}}
+        }}
         """
 
         variables = {
@@ -213,37 +264,154 @@ class HashnodeService:
 
         print(f"Publish variables: {json.dumps(variables, indent=2)}")
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{self.base_url}/graphql",
-                headers=self.headers,
-                json={
-                    "query": query,
-                    "variables": variables
+        data = await self._graphql(query, variables, timeout=30.0)
+        result = data.get("publishDraft") or {}
+        print(f"Publish result: {result}")
+
+        if result.get("post"):
+            post = result.get("post", {})
+            return {
+                "success": True,
+                "post": post,
+                "message": "Post published successfully"
+            }
+        else:
+            raise Exception(f"Failed to publish post: {data}")
+
+    async def delete_draft(self, draft_id: str) -> Dict[str, Any]:
+        """Delete a draft, e.g. a speculative one whose post was rejected"""
+        print(f"Deleting draft with ID: {draft_id}")
+
+        query = """
+        mutation RemoveDraft($input: RemoveDraftInput!) {
+            removeDraft(input: $input) {
+                draft {
+                    id
                 }
-            )
+            }
+        }
+        """
 
-            print(f"Publish response status: {response.status_code}")
-            print(f"Publish response body: {response.text}")
-
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for GraphQL errors
-                if data.get("errors"):
-                    error_messages = [error.get("message", "Unknown error") for error in data.get("errors", [])]
-                    raise Exception(f"GraphQL errors: {'; '.join(error_messages)}")
-                
-                result = data.get("data", {}).get("publishDraft", {})
-                
-                if result.get("post"):
-                    post = result.get("post", {})
-                    return {
-                        "success": True,
-                        "post": post,
-                        "message": "Post published successfully"
-                    }
-                else:
-                    raise Exception(f"Failed to publish post: {data}")
+        await self._graphql(query, {"input": {"id": draft_id}}, timeout=30.0)
+        return {
+            "success": True,
+            "draft_id": draft_id,
+            "message": "Draft deleted successfully"
+        }
+
+    async def publish(self, title: str, content: str, tags: list) -> Dict[str, Any]:
+        """Publish a post in as few round trips as HASHNODE_PUBLISH_MODE allows.
+
+        "direct" sends a single publishPost mutation (batched with concurrent
+        publishes, see HASHNODE_BATCH_WINDOW_MS) and falls back to createDraft +
+        publishDraft when Hashnode rejects it (4xx or GraphQL errors). "draft"
+        always uses the two-step flow. Transport errors and 5xx responses are
+        raised rather than retried or replaced by the draft flow, since the post
+        may already exist.
+        """
+        if settings.HASHNODE_PUBLISH_MODE == "direct":
+            try:
+                return await self.publish_post(title, content, tags)
+            except HashnodeAPIError as e:
+                print(f"Direct publish rejected, falling back to draft then publish: {e}")
+
+        draft_result = await self.create_post(title=title, content=content, tags=tags)
+        draft_id = draft_result.get("draft_id")
+        if not draft_id:
+            raise Exception("Draft ID not returned from Hashnode")
+        return {**await self.publish_draft(draft_id), "draft_id": draft_id}
+
+    async def publish_post(self, title: str, content: str, tags: list) -> Dict[str, Any]:
+        """Publish a post with a single publishPost mutation"""
+        publication_id, _ = await self.get_publication()
+        post_input = {
+            "title": title,
+            "contentMarkdown": content,
+            "tags": self._process_tags(tags),
+            "publicationId": publication_id
+        }
+
+        if settings.HASHNODE_BATCH_WINDOW_MS > 0:
+            post = await self._enqueue_publish(post_input)
+        else:
+            query = f"""
+            mutation PublishPost($input: PublishPostInput!) {{
+                publishPost(input: $input) {{{POST_FIELDS}}}
+            }}
+            """
+            data = await self._graphql(query, {"input": post_input}, timeout=60.0)
+            post = (data.get("publishPost") or {}).get("post")
+
+        if not post:
+            raise HashnodeAPIError(f"Failed to publish post: {title}")
+        return {
+            "success": True,
+            "post": post,
+            "message": "Post published successfully"
+        }
+
+    async def _enqueue_publish(self, post_input: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Wait for the batch window and publish together with concurrent publishes"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_publishes.append((post_input, future))
+        if len(self._pending_publishes) >= settings.HASHNODE_BATCH_MAX_OPERATIONS:
+            self._flush_publishes()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(settings.HASHNODE_BATCH_WINDOW_MS / 1000)
+        self._flush_task = None
+        self._flush_publishes()
+
+    def _flush_publishes(self):
+        batch, self._pending_publishes = self._pending_publishes, []
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if batch:
+            # Publishers await their futures; keep a reference so the task is not collected
+            task = asyncio.create_task(self._publish_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _publish_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Send up to HASHNODE_BATCH_MAX_OPERATIONS publishPost mutations as one aliased request.
+
+        GraphQL errors are matched to their alias, so one rejected post fails
+        only its own publish.
+        """
+        aliases = [f"p{i}" for i in range(len(batch))]
+        query = "mutation PublishPosts({}) {{\n{}\n}}".format(
+            ", ".join(f"${alias}: PublishPostInput!" for alias in aliases),
+            "\n".join(f"    {alias}: publishPost(input: ${alias}) {{{POST_FIELDS}}}" for alias in aliases)
+        )
+        variables = {alias: post_input for alias, (post_input, _) in zip(aliases, batch)}
+        print(f"Publishing {len(batch)} post(s) in one request")
+
+        try:
+            body = await self._post(query, variables, timeout=60.0)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        errors: Dict[str, List[str]] = {}
+        for error in body.get("errors") or []:
+            path = error.get("path") or [None]
+            errors.setdefault(path[0], []).append(error.get("message", "Unknown error"))
+        data = body.get("data") or {}
+
+        for alias, (_, future) in zip(aliases, batch):
+            if future.done():
+                continue
+            post = (data.get(alias) or {}).get("post")
+            alias_errors = errors.get(alias) or errors.get(None)
+            if post:
+                future.set_result(post)
             else:
-                raise Exception(f"API request failed: {response.text}")
\ No newline at end of file
+                future.set_exception(HashnodeAPIError(
+                    f"GraphQL errors: {'; '.join(alias_errors or ['No post returned'])}"
+                ))
@@ -0,0 +1,159 @@
+"""
+Two-tier LLM response cache: an in-process LRU in front of a shared Redis tier
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import redis.asyncio as aioredis
+from ..core.config import settings
+
+
+class LLMCache:
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[int] = None,
+                 backend: Optional[str] = None, nodes: Optional[List[str]] = None):
+        """Responses are keyed by model, temperature and a hash of the prompt messages"""
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or settings.LLM_CACHE_TTL_SECONDS
+        self.backend = backend or settings.LLM_CACHE_BACKEND
+        self.nodes = set(settings.LLM_CACHE_NODES if nodes is None else nodes)
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, content)
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.redis = None
+        # After a Redis error the shared tier is skipped for a while instead of
+        # adding a failing round trip to every LLM call
+        self.redis_retry_at = 0.0
+        self.redis_errors = 0
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    def enabled_for(self, node: str) -> bool:
+        return self.backend != "off" and node in self.nodes
+
+    def key(self, llm, messages: List[Any]) -> str:
+        payload = {
+            "model": getattr(llm, "model_name", type(llm).__name__),
+            "temperature": getattr(llm, "temperature", None),
+            "messages": [[message.type, message.content] for message in messages]
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def get_or_invoke(self, node: str, llm, messages: List[Any],
+                            invoke: Optional[Callable[[List[Any]], Awaitable[str]]] = None) -> str:
+        """Return the cached response content, calling the LLM only on a miss.
+
+        Concurrent misses for the same key share a single LLM call. `invoke`
+        replaces llm.ainvoke on a miss (e.g. to stream the tokens) and must
+        return the response content.
+        """
+        key = self.key(llm, messages)
+        content = self._get_memory(key)
+        if content is not None:
+            self._count(node, "memory_hits")
+            return content
+
+        content = await self._get_redis(key)
+        if content is not None:
+            self._count(node, "redis_hits")
+            self._set_memory(key, content)
+            return content
+
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self._count(node, "coalesced")
+            return await asyncio.shield(pending)
+
+        self._count(node, "misses")
+        future = self.inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            content = await invoke(messages) if invoke else (await llm.ainvoke(messages)).content
+            future.set_result(content)
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters receive the error; mark it retrieved when there are none
+            future.exception()
+            raise
+        finally:
+            del self.inflight[key]
+
+        self._set_memory(key, content)
+        await self._set_redis(key, content)
+        return content
+
+    def get_metrics(self) -> Dict[str, Any]:
+        totals: Dict[str, int] = {}
+        for counts in self.metrics.values():
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+        lookups = sum(totals.get(name, 0) for name in ["memory_hits", "redis_hits", "coalesced", "misses"])
+        hits = lookups - totals.get("misses", 0)
+        return {
+            "backend": self.backend,
+            "nodes": sorted(self.nodes),
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "redis_errors": self.redis_errors,
+            "totals": totals,
+            "by_node": self.metrics
+        }
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
+
+    def _count(self, node: str, name: str):
+        counts = self.metrics.setdefault(node, {})
+        counts[name] = counts.get(name, 0) + 1
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return content
+
+    def _set_memory(self, key: str, content: str):
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, content)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _redis_client(self):
+        if self.backend != "redis" or time.monotonic() < self.redis_retry_at:
+            return None
+        if self.redis is None:
+            self.redis = aioredis.from_url(settings.REDIS_URL, socket_timeout=1.0, socket_connect_timeout=1.0)
+        return self.redis
+
+    async def _get_redis(self, key: str) -> Optional[str]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            value = await client.get(f"llm_cache:{key}")
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return value.decode("utf-8") if value is not None else None
+
+    async def _set_redis(self, key: str, content: str):
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            await client.set(f"llm_cache:{key}", content.encode("utf-8"), ex=self.ttl_seconds)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _redis_failed(self, error: Exception):
+        print(f"LLM cache Redis tier unavailable, using memory only for 30s: {error}")
+        self.redis_errors += 1
+        self.redis_retry_at = time.monotonic() + 30
@@ -0,0 +1,121 @@
+"""
+Async token-bucket rate limiter kept in sync with the API's rate-limit headers
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, Mapping, Optional
+
+
+class TokenBucketRateLimiter:
+    def __init__(self, capacity: int, window_seconds: float):
+        """`capacity` requests per `window_seconds`, refilled continuously until the
+        API reports its own remaining budget and reset time"""
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        # Set from x-rate-limit-reset: the budget stays as reported until then
+        self.reset_at: Optional[float] = None
+        # Callers waiting for a token, in arrival order; one timer wakes them
+        self.waiters: "deque[asyncio.Future]" = deque()
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.waited_total = 0
+
+    async def acquire(self):
+        """Take one token, parking in the queue until one is available"""
+        if not self.waiters and self._try_take():
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        self.waited_total += 1
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the caller went away; hand the token back
+                self.tokens += 1
+                self._schedule()
+            raise
+
+    def try_acquire(self) -> float:
+        """Take one token if one is free now and nobody is queued for it; 0.0 when
+        taken, otherwise the seconds until the next token is due. Lets a caller
+        that must not wait step aside and come back later."""
+        if not self.waiters and self._try_take():
+            return 0.0
+        return max(0.0, self._next_token_at() - time.monotonic())
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adopt the budget reported by x-rate-limit-remaining / -reset / -limit"""
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        if remaining is None or reset is None:
+            return
+        if headers.get("x-rate-limit-limit") is not None:
+            self.capacity = int(headers["x-rate-limit-limit"])
+        self.tokens = float(remaining)
+        # The reset header is epoch seconds; the bucket runs on the monotonic clock
+        self.reset_at = time.monotonic() + max(0.0, int(reset) - time.time())
+        self.updated = time.monotonic()
+        self._schedule()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "capacity": self.capacity,
+            "window_seconds": self.window_seconds,
+            "tokens": self.tokens,
+            "waiting": sum(1 for waiter in self.waiters if not waiter.done()),
+            "waited_total": self.waited_total,
+            "reset_in_seconds": max(0.0, self.reset_at - time.monotonic()) if self.reset_at else None
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.reset_at is not None:
+            if now < self.reset_at:
+                return
+            # The reported window is over: full budget, continuous refill from here
+            self.tokens = float(self.capacity)
+            self.reset_at = None
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.window_seconds)
+        self.updated = now
+
+    def _try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def _next_token_at(self) -> float:
+        if self.tokens >= 1:
+            return time.monotonic()
+        if self.reset_at is not None:
+            return self.reset_at
+        return time.monotonic() + (1 - self.tokens) * self.window_seconds / self.capacity
+
+    def _schedule(self):
+        """(Re)arm the wake-up timer for the next token if anyone is waiting"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.waiters:
+            self._refill()
+            delay = max(0.0, self._next_token_at() - time.monotonic())
+            self.timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self):
+        self.timer = None
+        while self.waiters:
+            if self.waiters[0].done():
+                self.waiters.popleft()  # Cancelled while parked
+                continue
+            if not self._try_take():
+                break
+            self.waiters.popleft().set_result(None)
+        self._schedule()
@@ -0,0 +1,188 @@
+"""
+Semantic cache of generated blogs, looked up by topic embedding similarity
+"""
+
+import asyncio
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from ..core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then unlocked
+    fcntl = None
+
+ENTRIES_FILE = "entries.jsonl"
+VECTORS_FILE = "vectors.f32"
+LOCK_FILE = ".lock"
+
+
+class SemanticBlogCache:
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None,
+                 mode: Optional[str] = None, max_entries: Optional[int] = None, embeddings=None):
+        """Brute-force cosine index over topic embeddings, persisted append-only in
+        the `path` directory: one JSON line per entry in entries.jsonl and its
+        float32 vector in vectors.f32. Several processes can share the directory;
+        each picks up the entries the others append."""
+        self.path = path or settings.SEMANTIC_CACHE_PATH
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.mode = mode or settings.SEMANTIC_CACHE_MODE
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.embeddings = embeddings
+        self.vectors: Optional[np.ndarray] = None  # (n, dim) unit vectors, float32
+        self.entries: List[Dict[str, Any]] = []  # topic, blog_content, created_at per row
+        self.lock = asyncio.Lock()
+        # How far entries.jsonl has been read, and which file that was (compaction replaces it)
+        self._read_offset = 0
+        self._read_lines = 0
+        self._file_id: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ["reuse", "adapt"]
+
+    async def embed(self, topic: str) -> np.ndarray:
+        """Unit-length embedding of a topic"""
+        if self.embeddings is None:
+            from langchain_openai import OpenAIEmbeddings
+            from pydantic import SecretStr
+            self.embeddings = OpenAIEmbeddings(
+                model=settings.SEMANTIC_CACHE_EMBEDDING_MODEL,
+                api_key=SecretStr(settings.OPENAI_API_KEY)
+            )
+        vector = np.asarray(await self.embeddings.aembed_query(topic), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    async def search(self, vector: np.ndarray) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Most similar cached blog as (similarity, entry) if it clears the threshold"""
+        await self._refresh()
+        if self.vectors is None or not len(self.entries) or self.vectors.shape[1] != vector.shape[0]:
+            return None
+        scores = self.vectors @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return float(scores[best]), self.entries[best]
+
+    async def add(self, topic: str, vector: np.ndarray, blog_content: str):
+        """Append a generated blog to the index files and pick it up in memory"""
+        entry = {
+            "topic": topic,
+            "blog_content": blog_content,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        await asyncio.to_thread(self._append, entry, vector.astype(np.float32))
+        await self._refresh()
+        # Superseded entries are dropped from the files once they make up half of them
+        if self._read_lines > 2 * self.max_entries:
+            async with self.lock:
+                await asyncio.to_thread(self._compact)
+            await self._refresh()
+
+    async def _refresh(self):
+        """Index the entries appended since the last read, by this or another process"""
+        async with self.lock:
+            update = await asyncio.to_thread(self._read_new)
+            if update is None:
+                return
+            reset, entries, vectors = update
+            if reset:
+                self.vectors, self.entries = None, []
+            dim = self.vectors.shape[1] if self.vectors is not None else None
+            new_entries, new_vectors = [], []
+            for entry, vector in zip(entries, vectors):
+                # A different embedding model starts a new index
+                if dim is not None and vector.shape[0] != dim:
+                    self.vectors, self.entries = None, []
+                    new_entries, new_vectors = [], []
+                dim = vector.shape[0]
+                new_entries.append(entry)
+                new_vectors.append(vector)
+            if new_vectors:
+                stacked = np.stack(new_vectors)
+                self.vectors = stacked if self.vectors is None else np.vstack([self.vectors, stacked])
+                self.entries.extend(new_entries)
+            # Oldest entries go first once the index is full
+            if len(self.entries) > self.max_entries:
+                self.vectors = self.vectors[-self.max_entries:]
+                self.entries = self.entries[-self.max_entries:]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Inter-process lock around the index files"""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._file(LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _append(self, entry: Dict[str, Any], vector: np.ndarray):
+        """Append the vector, then the entry line that points at it"""
+        with self._file_lock(exclusive=True):
+            with open(self._file(VECTORS_FILE), "ab") as vectors:
+                offset = vectors.tell()
+                vectors.write(vector.tobytes())
+            line = json.dumps({**entry, "offset": offset, "dim": int(vector.shape[0])})
+            with open(self._file(ENTRIES_FILE), "a", encoding="utf-8") as entries:
+                entries.write(line + "\n")
+
+    def _read_new(self) -> Optional[Tuple[bool, List[Dict[str, Any]], List[np.ndarray]]]:
+        """(reset, entries, vectors) appended since the last read, or None if unchanged"""
+        try:
+            stat = os.stat(self._file(ENTRIES_FILE))
+        except FileNotFoundError:
+            return None
+        if stat.st_ino == self._file_id and stat.st_size == self._read_offset:
+            return None
+
+        with self._file_lock(exclusive=False):
+            with open(self._file(ENTRIES_FILE), "rb") as entries_file:
+                stat = os.fstat(entries_file.fileno())
+                reset = stat.st_ino != self._file_id or stat.st_size < self._read_offset
+                start = 0 if reset else self._read_offset
+                self._file_id = stat.st_ino
+                entries_file.seek(start)
+                data = entries_file.read()
+            # Only whole lines; a line still being written is read next time
+            data = data[:data.rfind(b"\n") + 1]
+            entries = [json.loads(line) for line in data.splitlines() if line.strip()]
+            vectors = []
+            with open(self._file(VECTORS_FILE), "rb") as vectors_file:
+                for entry in entries:
+                    vectors_file.seek(entry.pop("offset"))
+                    vectors.append(np.frombuffer(vectors_file.read(4 * entry.pop("dim")), dtype=np.float32))
+
+        self._read_offset = start + len(data)
+        self._read_lines = (0 if reset else self._read_lines) + len(entries)
+        return reset, entries, vectors
+
+    def _compact(self):
+        """Rewrite the files with only the newest max_entries entries, swapping
+        each in whole so readers never see a partial file"""
+        with self._file_lock(exclusive=True):
+            with open(self._file(ENTRIES_FILE), "rb") as entries_file:
+                lines = [line for line in entries_file.read().splitlines() if line.strip()]
+            entries = [json.loads(line) for line in lines[-self.max_entries:]]
+            with open(self._file(VECTORS_FILE), "rb") as vectors_file, \
+                    open(self._file(f"{VECTORS_FILE}.tmp"), "wb") as new_vectors:
+                for entry in entries:
+                    vectors_file.seek(entry["offset"])
+                    data = vectors_file.read(4 * entry["dim"])
+                    entry["offset"] = new_vectors.tell()
+                    new_vectors.write(data)
+            with open(self._file(f"{ENTRIES_FILE}.tmp"), "w", encoding="utf-8") as new_entries:
+                new_entries.writelines(json.dumps(entry) + "\n" for entry in entries)
+            os.replace(self._file(f"{VECTORS_FILE}.tmp"), self._file(VECTORS_FILE))
+            os.replace(self._file(f"{ENTRIES_FILE}.tmp"), self._file(ENTRIES_FILE))
@@ -2,11 +2,34 @@
 Twitter API service for publishing tweets and threads
 """
 
-import tweepy
+from tweepy.asynchronous import AsyncClient
+from tweepy.errors import TooManyRequests
+import aiohttp
+import hashlib
 import json
 import time
-from typing import Dict, Any, List
+import uuid
+from typing import Dict, Any, List, Optional
 from ..core.config import settings
+from .rate_limiter import TokenBucketRateLimiter
+
+# Shared by every TwitterService instance: the POST /2/tweets budget is per user
+tweet_rate_limiter = TokenBucketRateLimiter(
+    settings.TWITTER_TWEETS_PER_WINDOW, settings.TWITTER_RATE_LIMIT_WINDOW_SECONDS
+)
+
+
+class TweetRateLimitedError(Exception):
+    """Raised instead of waiting when a tweet may not be posted before `retry_after` seconds"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Tweet rate limit reached, next tweet allowed in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def tweet_idempotency_key(index: int, text: str) -> str:
+    """Identifies tweet `index` of a thread; a recorded key means it was already posted"""
+    return hashlib.sha256(f"{index}:{text}".encode("utf-8")).hexdigest()[:16]
 
 
 class TwitterService:
@@ -30,17 +53,52 @@ class TwitterService:
             print("Twitter API running in MOCK MODE - no real tweets will be posted")
             self.client = None
         else:
-            # Initialize Twitter API v2 client
-            self.client = tweepy.Client(
+            # Initialize async Twitter API v2 client. Raw responses expose the
+            # x-rate-limit-* headers; rate limits are handled by tweet_rate_limiter
+            # instead of sleeping inside the client
+            self.client = AsyncClient(
                 consumer_key=self.api_key,
                 consumer_secret=self.api_secret,
                 access_token=self.access_token,
                 access_token_secret=self.access_token_secret,
-                wait_on_rate_limit=True
+                return_type=aiohttp.ClientResponse,
+                wait_on_rate_limit=False
             )
             print(f"Twitter API initialized with API key: {self.api_key[:10]}...")
     
-    def verify_credentials(self) -> Dict[str, Any]:
+    async def create_tweet(self, text: str, in_reply_to_tweet_id: Optional[str] = None,
+                           wait: bool = True) -> Optional[str]:
+        """Post one tweet once the shared rate limiter allows it; returns the tweet id.
+
+        Each response's rate-limit headers update the limiter. A 429 parks the
+        tweet until the reported reset and retries it, up to
+        TWITTER_RATE_LIMIT_RETRIES times. With wait=False nothing waits: when no
+        token is free (or after a 429) TweetRateLimitedError says when to retry.
+        """
+        for attempt in range(settings.TWITTER_RATE_LIMIT_RETRIES + 1):
+            if wait:
+                await tweet_rate_limiter.acquire()
+            else:
+                retry_after = tweet_rate_limiter.try_acquire()
+                if retry_after:
+                    raise TweetRateLimitedError(retry_after)
+            try:
+                response = await self.client.create_tweet(
+                    text=text,
+                    in_reply_to_tweet_id=in_reply_to_tweet_id
+                )
+            except TooManyRequests as e:
+                tweet_rate_limiter.update_from_headers(e.response.headers)
+                if attempt == settings.TWITTER_RATE_LIMIT_RETRIES:
+                    raise
+                print("Twitter rate limit hit, tweet parked until the limit resets")
+                continue
+
+            tweet_rate_limiter.update_from_headers(response.headers)
+            data = (await response.json()).get("data") or {}
+            return data.get("id")
+
+    async def verify_credentials(self) -> Dict[str, Any]:
         """Verify Twitter API credentials"""
         if self.mock_mode:
             return {
@@ -54,14 +112,16 @@ class TwitterService:
             }
 
         try:
-            user = self.client.get_me()
-            if user.data:
+            # The client returns raw responses (see __init__), so parse the body here
+            response = await self.client.get_me()
+            user = (await response.json()).get("data")
+            if user:
                 return {
                     "success": True,
                     "user": {
-                        "id": user.data.id,
-                        "username": user.data.username,
-                        "name": user.data.name
+                        "id": user.get("id"),
+                        "username": user.get("username"),
+                        "name": user.get("name")
                     }
                 }
             else:
@@ -114,86 +174,76 @@ class TwitterService:
         
         return cleaned_tweets
     
-    def post_thread(self, thread_content: str) -> Dict[str, Any]:
-        """Post a Twitter thread"""
+    def thread_tweets(self, thread_content: str) -> List[Dict[str, str]]:
+        """Parse a thread into tweets, each with the idempotency key its progress is recorded under"""
+        return [
+            {"key": tweet_idempotency_key(i, text), "text": text}
+            for i, text in enumerate(self.parse_thread_content(thread_content))
+        ]
+
+    async def post_thread_tweet(self, text: str, reply_to_id: Optional[str] = None,
+                                wait: bool = True) -> Dict[str, Any]:
+        """Post one tweet of a thread, replying to `reply_to_id`; raises if it was
+        not posted (see create_tweet for `wait`)"""
+        if self.mock_mode:
+            tweet_id = f"mock_tweet_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+            print(f"MOCK: Posted tweet: {text[:50]}...")
+            return {"id": tweet_id, "text": text, "url": f"https://twitter.com/mock_user/status/{tweet_id}"}
+
+        tweet_id = await self.create_tweet(text, in_reply_to_tweet_id=reply_to_id, wait=wait)
+        if not tweet_id:
+            raise Exception("No response data")
+        return {"id": tweet_id, "text": text, "url": f"https://twitter.com/user/status/{tweet_id}"}
+
+    async def post_thread(self, thread_content: str,
+                          posted: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Post a Twitter thread.
+
+        `posted` is the progress of an earlier attempt: tweets whose idempotency
+        key is already in it are skipped and the thread continues replying to
+        the last of them, so a retry never posts the same tweet twice.
+        """
         try:
             print(f"Posting Twitter thread...")
             print(f"Thread content: {thread_content[:200]}...")
 
             # Parse the thread content into individual tweets
-            tweets = self.parse_thread_content(thread_content)
+            tweets = self.thread_tweets(thread_content)
 
             if not tweets:
                 return {"success": False, "message": "No valid tweets found in thread content"}
 
             print(f"Parsed {len(tweets)} tweets from thread")
 
-            # Handle mock mode
-            if self.mock_mode:
-                print("MOCK MODE: Simulating Twitter thread posting...")
-                mock_tweets = []
-                for i, tweet_text in enumerate(tweets):
-                    mock_tweet_id = f"mock_tweet_{int(time.time())}_{i}"
-                    mock_tweets.append({
-                        "id": mock_tweet_id,
-                        "text": tweet_text,
-                        "url": f"https://twitter.com/mock_user/status/{mock_tweet_id}"
-                    })
-                    print(f"MOCK: Posted tweet {i+1}/{len(tweets)}: {tweet_text[:50]}...")
-
-                return {
-                    "success": True,
-                    "mock": True,
-                    "message": f"MOCK: Successfully posted {len(mock_tweets)} tweets",
-                    "tweets": mock_tweets,
-                    "thread_url": mock_tweets[0]["url"] if mock_tweets else None
-                }
-            
-            posted_tweets = []
-            reply_to_id = None
+            posted_tweets = list(posted or [])
+            done = {tweet.get("key") for tweet in posted_tweets}
+            if done:
+                print(f"Resuming thread after {len(posted_tweets)} already posted tweets")
             
-            for i, tweet_text in enumerate(tweets):
-                print(f"Posting tweet {i+1}/{len(tweets)}: {tweet_text[:50]}...")
+            for i, tweet in enumerate(tweets):
+                if tweet["key"] in done:
+                    continue
+                print(f"Posting tweet {i+1}/{len(tweets)}: {tweet['text'][:50]}...")
                 
                 try:
-                    # Post the tweet
-                    if reply_to_id:
-                        # Reply to previous tweet in thread
-                        response = self.client.create_tweet(
-                            text=tweet_text,
-                            in_reply_to_tweet_id=reply_to_id
-                        )
-                    else:
-                        # First tweet in thread
-                        response = self.client.create_tweet(text=tweet_text)
-                    
-                    if response.data:
-                        tweet_id = response.data['id']
-                        reply_to_id = tweet_id  # Next tweet will reply to this one
-                        
-                        posted_tweets.append({
-                            "id": tweet_id,
-                            "text": tweet_text,
-                            "url": f"https://twitter.com/user/status/{tweet_id}"
-                        })
-                        
-                        print(f"Successfully posted tweet {i+1}: {tweet_id}")
-                        
-                        # Add delay between tweets to avoid rate limiting
-                        if i < len(tweets) - 1:  # Don't delay after last tweet
-                            time.sleep(2)
-                    else:
-                        print(f"Failed to post tweet {i+1}: No response data")
-                        break
+                    # Reply to the last posted tweet after the first; pacing
+                    # comes from the shared rate limiter
+                    reply_to_id = posted_tweets[-1]["id"] if posted_tweets else None
+                    posted_tweet = await self.post_thread_tweet(tweet["text"], reply_to_id)
+                    posted_tweets.append({"key": tweet["key"], **posted_tweet})
+                    print(f"Successfully posted tweet {i+1}: {posted_tweet['id']}")
                         
                 except Exception as tweet_error:
                     print(f"Error posting tweet {i+1}: {str(tweet_error)}")
                     break
             
             if posted_tweets:
+                complete = len(posted_tweets) == len(tweets)
                 return {
                     "success": True,
-                    "message": f"Successfully posted {len(posted_tweets)} tweets",
+                    "mock": self.mock_mode,
+                    "complete": complete,
+                    "message": f"Successfully posted {len(posted_tweets)} of {len(tweets)} tweets",
                     "tweets": posted_tweets,
                     "thread_url": posted_tweets[0]["url"] if posted_tweets else None
                 }
@@ -205,7 +255,7 @@ class TwitterService:
             print(error_message)
             return {"success": False, "message": error_message}
     
-    def post_single_tweet(self, content: str) -> Dict[str, Any]:
+    async def post_single_tweet(self, content: str) -> Dict[str, Any]:
         """Post a single tweet"""
         try:
             print(f"Posting single tweet: {content[:50]}...")
@@ -229,10 +279,9 @@ class TwitterService:
                     }
                 }
 
-            response = self.client.create_tweet(text=content)
+            tweet_id = await self.create_tweet(content)
             
-            if response.data:
-                tweet_id = response.data['id']
+            if tweet_id:
                 return {
                     "success": True,
                     "message": "Tweet posted successfully",
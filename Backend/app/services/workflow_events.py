@@ -0,0 +1,127 @@
+"""
+In-process broker for workflow progress events streamed to clients over SSE
+"""
+
+import asyncio
+import json
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Dict, Optional
+from ..core.config import settings
+
+TERMINAL_STATUSES = ["completed", "failed", "twitter_failed", "twitter_rejected"]
+
+
+class _ThreadChannel:
+    def __init__(self, history_size: int):
+        self.history = deque(maxlen=history_size)
+        self.last_id = 0
+        # Live-only events (LLM tokens): delivered to current subscribers, never replayed
+        self.transient = deque(maxlen=history_size)
+        self.last_transient = 0
+        self.condition = asyncio.Condition()
+
+
+class WorkflowEventBroker:
+    def __init__(self, history_size: Optional[int] = None, max_threads: Optional[int] = None):
+        """Keeps a short replay buffer of events per thread for Last-Event-ID resume"""
+        self.history_size = history_size or settings.WORKFLOW_EVENT_HISTORY
+        self.max_threads = max_threads or settings.WORKFLOW_EVENT_MAX_THREADS
+        self.channels: "OrderedDict[str, _ThreadChannel]" = OrderedDict()
+
+    def _channel(self, thread_id: str) -> _ThreadChannel:
+        channel = self.channels.get(thread_id)
+        if channel is None:
+            channel = self.channels[thread_id] = _ThreadChannel(self.history_size)
+            # Forget the least recently active threads
+            while len(self.channels) > self.max_threads:
+                self.channels.popitem(last=False)
+        else:
+            self.channels.move_to_end(thread_id)
+        return channel
+
+    async def publish(self, thread_id: str, event: str, data: Dict[str, Any]) -> int:
+        """Append an event to the thread's buffer and wake its subscribers.
+
+        Repeats of the most recent event (e.g. the state replayed when a run
+        resumes) are dropped.
+        """
+        channel = self._channel(thread_id)
+        if channel.history and channel.history[-1][1:] == (event, data):
+            return channel.last_id
+        async with channel.condition:
+            channel.last_id += 1
+            channel.history.append((channel.last_id, event, data))
+            channel.condition.notify_all()
+        return channel.last_id
+
+    async def publish_transient(self, thread_id: str, event: str, data: Dict[str, Any]):
+        """Deliver an event to the thread's current subscribers without an event id.
+
+        Transient events stay out of the replay buffer, so a burst of them never
+        pushes status events out of reach of a Last-Event-ID resume.
+        """
+        channel = self._channel(thread_id)
+        async with channel.condition:
+            channel.last_transient += 1
+            channel.transient.append((channel.last_transient, event, data))
+            channel.condition.notify_all()
+
+    def covers(self, thread_id: str, last_event_id: int) -> bool:
+        """Whether every event after last_event_id is still in the replay buffer"""
+        channel = self.channels.get(thread_id)
+        if channel is None or not channel.history or last_event_id > channel.last_id:
+            return False
+        return channel.history[0][0] <= last_event_id + 1
+
+    def last_event_id(self, thread_id: str) -> int:
+        channel = self.channels.get(thread_id)
+        return channel.last_id if channel else 0
+
+    async def subscribe(self, thread_id: str, last_event_id: int = 0,
+                        heartbeat: Optional[float] = None) -> AsyncIterator[Optional[tuple]]:
+        """Yield (id, event, data) after last_event_id; yields None as a heartbeat when idle.
+
+        Transient events published from now on are yielded with a None id, ahead
+        of buffered events that arrived at the same time. A subscriber that falls
+        so far behind that some were dropped from the buffer first gets a
+        "tokens_dropped" event saying how many it missed.
+        """
+        channel = self._channel(thread_id)
+        heartbeat = heartbeat or settings.WORKFLOW_EVENT_HEARTBEAT_SECONDS
+        last_transient = channel.last_transient
+        while True:
+            transient = [item for item in list(channel.transient) if item[0] > last_transient]
+            pending = [item for item in list(channel.history) if item[0] > last_event_id]
+            if not pending and not transient:
+                timed_out = False
+                async with channel.condition:
+                    if channel.last_id <= last_event_id and channel.last_transient <= last_transient:
+                        try:
+                            await asyncio.wait_for(channel.condition.wait(), timeout=heartbeat)
+                        except asyncio.TimeoutError:
+                            timed_out = True
+                if timed_out:
+                    yield None
+                continue
+
+            if transient and transient[0][0] > last_transient + 1:
+                yield None, "tokens_dropped", {
+                    "thread_id": thread_id,
+                    "dropped": transient[0][0] - last_transient - 1
+                }
+            for seq, event, data in transient:
+                last_transient = seq
+                yield None, event, data
+            for item in pending:
+                last_event_id = item[0]
+                yield item
+
+
+def format_sse(event_id: Optional[int], event: str, data: Dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,201 @@
+"""
+In-process asyncio worker pool for running workflow graphs in the background
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from ..core.config import settings
+
+
+class WorkflowQueueFullError(Exception):
+    """Raised when the background queue cannot accept more workflows"""
+
+
+class JobDeferredError(Exception):
+    """Raised by a job that cannot make progress before `delay` seconds (e.g. a
+    rate limit); the runner frees the worker and queues the job again then"""
+
+    def __init__(self, delay: float):
+        super().__init__(f"Job deferred for {delay:.1f}s")
+        self.delay = delay
+
+
+class WorkflowRunner:
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        """Bounded queue drained by a fixed number of worker tasks"""
+        self.worker_count = workers or settings.WORKFLOW_WORKERS
+        self.queue_size = queue_size or settings.WORKFLOW_QUEUE_SIZE
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers = []
+        self.feeders = set()
+        # thread_id -> timer that queues a deferred job again
+        self.parked: Dict[str, asyncio.TimerHandle] = {}
+
+        # thread_id -> "queued" | "running" | "failed"; failures are kept for a while
+        # so status reads can report them after the job has left the pool
+        self.statuses: Dict[str, str] = {}
+        self.failures: "OrderedDict[str, str]" = OrderedDict()
+        self.max_failures = 1000
+
+        # Metrics
+        self.busy_workers = 0
+        self.max_depth = 0
+        self.enqueued_total = 0
+        self.completed_total = 0
+        self.failed_total = 0
+        self.rejected_total = 0
+        self.deferred_total = 0
+        self.wait_times = deque(maxlen=1000)
+
+    async def start(self):
+        """Start the worker tasks"""
+        if self.queue is not None:
+            return
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.workers = [
+            asyncio.create_task(self._worker(i), name=f"workflow-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        print(f"Workflow runner started with {self.worker_count} workers (queue size {self.queue_size})")
+
+    async def stop(self):
+        """Cancel the worker and batch feeder tasks; jobs still queued or parked are dropped"""
+        for timer in self.parked.values():
+            timer.cancel()
+        self.parked = {}
+        tasks = self.workers + list(self.feeders)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self.feeders = set()
+        self.queue = None
+        print("Workflow runner stopped")
+
+    def submit(self, thread_id: str, job: Callable[[], Awaitable[Any]]):
+        """Queue a job for a thread without waiting for it to run"""
+        if self.queue is None:
+            raise RuntimeError("Workflow runner is not started")
+        try:
+            self.queue.put_nowait((thread_id, job, time.monotonic()))
+        except asyncio.QueueFull:
+            self.rejected_total += 1
+            raise WorkflowQueueFullError(f"Workflow queue is full ({self.queue_size} pending)")
+
+        self.statuses[thread_id] = "queued"
+        self.failures.pop(thread_id, None)
+        self.enqueued_total += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def submit_batch(self, jobs: List[Tuple[str, Callable[[], Awaitable[Any]]]], concurrency: int):
+        """Queue many jobs, keeping at most `concurrency` of them in the pool at once.
+
+        A feeder task hands jobs to the queue as earlier ones finish, so a large
+        batch neither fills the queue nor starves single starts of workers.
+        """
+        if self.queue is None:
+            raise RuntimeError("Workflow runner is not started")
+        for thread_id, _ in jobs:
+            self.statuses[thread_id] = "queued"
+            self.failures.pop(thread_id, None)
+
+        feeder = asyncio.create_task(self._feed(jobs, concurrency))
+        self.feeders.add(feeder)
+        feeder.add_done_callback(self.feeders.discard)
+
+    async def _feed(self, jobs: List[Tuple[str, Callable[[], Awaitable[Any]]]], concurrency: int):
+        slots = asyncio.Semaphore(concurrency)
+
+        def release_after(job):
+            async def run():
+                try:
+                    await job()
+                finally:
+                    slots.release()
+            return run
+
+        for thread_id, job in jobs:
+            await slots.acquire()
+            await self.queue.put((thread_id, release_after(job), time.monotonic()))
+            self.enqueued_total += 1
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def get_status(self, thread_id: str) -> Optional[str]:
+        """Return queued/running/failed while the runner knows about a thread"""
+        if thread_id in self.statuses:
+            return self.statuses[thread_id]
+        if thread_id in self.failures:
+            return "failed"
+        return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, worker utilisation and queue wait-time metrics"""
+        waits = sorted(self.wait_times)
+        return {
+            "workers": self.worker_count,
+            "busy_workers": self.busy_workers,
+            "queue_size": self.queue_size,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_depth,
+            "enqueued_total": self.enqueued_total,
+            "completed_total": self.completed_total,
+            "failed_total": self.failed_total,
+            "rejected_total": self.rejected_total,
+            "parked": len(self.parked),
+            "deferred_total": self.deferred_total,
+            "wait_time_seconds": {
+                "avg": sum(waits) / len(waits) if waits else 0.0,
+                "p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "max": waits[-1] if waits else 0.0
+            }
+        }
+
+    async def _worker(self, worker_id: int):
+        """Run queued jobs one at a time"""
+        while True:
+            thread_id, job, enqueued_at = await self.queue.get()
+            self.wait_times.append(time.monotonic() - enqueued_at)
+            self.statuses[thread_id] = "running"
+            self.busy_workers += 1
+            deferred = False
+            try:
+                await job()
+                self.completed_total += 1
+            except asyncio.CancelledError:
+                raise
+            except JobDeferredError as e:
+                deferred = True
+                self._park(thread_id, job, e.delay)
+            except Exception as e:
+                print(f"Workflow {thread_id} failed on worker {worker_id}: {e}")
+                self.failed_total += 1
+                self.failures[thread_id] = str(e)
+                while len(self.failures) > self.max_failures:
+                    self.failures.popitem(last=False)
+            finally:
+                self.busy_workers -= 1
+                if not deferred:
+                    self.statuses.pop(thread_id, None)
+                self.queue.task_done()
+
+    def _park(self, thread_id: str, job: Callable[[], Awaitable[Any]], delay: float):
+        """Hold a deferred job outside the queue until `delay` has passed; its
+        thread still reports "queued" meanwhile"""
+        self.deferred_total += 1
+        self.statuses[thread_id] = "queued"
+        self.parked[thread_id] = asyncio.get_running_loop().call_later(delay, self._unpark, thread_id, job)
+
+    def _unpark(self, thread_id: str, job: Callable[[], Awaitable[Any]]):
+        self.parked.pop(thread_id, None)
+        if self.queue is None:
+            return
+        try:
+            self.queue.put_nowait((thread_id, job, time.monotonic()))
+        except asyncio.QueueFull:
+            # The job was accepted already; try again shortly rather than drop it
+            self.deferred_total -= 1
+            self._park(thread_id, job, 1.0)
+            return
+        self.max_depth = max(self.max_depth, self.queue.qsize())
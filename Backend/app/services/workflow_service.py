@@ -1,144 +1,878 @@
-from langgraph.checkpoint.mongodb import MongoDBSaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import START
+from langgraph.types import Command
 from langchain_core.runnables import RunnableConfig
-from ..workflows.workflow_graph import compile_workflow_with_checkpointer
-from ..schemas.workflow_state import WorkflowState, WorkflowRequest, HumanInputRequest
+from ..workflows.workflow_graph import compile_workflow_with_checkpointer, checkpoint_during
+from ..workflows.nodes import APPROVE_INPUTS, CONFIG_KEY_PARK_RATE_LIMITED
+from ..schemas.workflow_state import WorkflowState, WorkflowRequest, HumanInputRequest, WorkflowDecision
 from ..core.config import settings
+from ..core.checkpointer import ThreadBusyError
+from .workflow_runner import WorkflowRunner, WorkflowQueueFullError, JobDeferredError
+from .twitter_service import TweetRateLimitedError
+from .workflow_events import WorkflowEventBroker, TERMINAL_STATUSES, format_sse
+from .execution_service import ExecutionService, extract_results, STATUS_FIELDS
+from ..models.models import WorkflowExecution
+from pydantic import ValidationError
+import asyncio
+import contextlib
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+
+# Runs that post tweets checkpoint every step whatever the configured mode: each
+# posted tweet id must be stored before the next tweet goes out, or a retry
+# after a crash would post it again
+PUBLISH_DURABILITY = "every-step"
+
+# Projection statuses a Twitter thread whose run crashed ("failed") or was
+# cancelled (still publishing) can be resumed from when no run has it
+INTERRUPTED_TWITTER_STATUSES = ("failed", "publishing_twitter")
+
+# Projection statuses a decision claims a paused thread with (see _claim_decision)
+# that are not final; a thread still paused in one of them at startup was
+# decided just before the process stopped and never resumed
+DECIDED_STATUSES = ("publishing_twitter", "publishing_hashnode", "hashnode_rejected")
 
 class WorkflowService:
-    def __init__(self):
-        self.mongo_uri = settings.MONGODB_URL
+    def __init__(self, checkpointer: BaseCheckpointSaver, runner: Optional[WorkflowRunner] = None,
+                 events: Optional[WorkflowEventBroker] = None,
+                 executions: Optional[ExecutionService] = None,
+                 durability: Optional[str] = None):
+        # Shared async checkpointer backed by the process-wide pooled Mongo client
+        self.checkpointer = checkpointer
+        # Worker pool for background starts (request.background)
+        self.runner = runner
+        # Progress events for /events subscribers
+        self.events = events
+        # WorkflowExecution projection that serves /status without loading checkpoints
+        self.executions = executions
+        # When checkpoints are written: every-step, at-interrupt or at-exit
+        self.durability = durability or settings.WORKFLOW_DURABILITY
+        # thread_id -> graph runs in progress in this process
+        self._active_runs: Dict[str, int] = {}
+
+    def is_running(self, thread_id: str) -> bool:
+        """Whether this process is running the thread or has it queued"""
+        if thread_id in self._active_runs:
+            return True
+        return bool(self.runner) and self.runner.get_status(thread_id) in ["queued", "running"]
     
     async def start_workflow(self, request: WorkflowRequest) -> Dict[str, Any]:
         """Start a new workflow"""
-        with MongoDBSaver.from_conn_string(self.mongo_uri) as checkpointer:
-            workflow = compile_workflow_with_checkpointer(checkpointer)
-            
-            # Generate unique thread ID
-            thread_id = str(uuid.uuid4())
-            
-            # Initialize state
-            initial_state = WorkflowState(
-                messages=[],
-                user_id=request.user_id,
-                topic=request.topic,
-                theme=request.theme,
-                blog_content=None,
-                themed_blog=None,
-                twitter_thread=None,
-                hashnode_post=None,
-                twitter_post=None,
-                publish_schedule={
-                    "twitter": request.schedule_twitter,
-                    "hashnode": request.schedule_hashnode
-                },
-                workflow_status="initialized",
-                current_node="start",
-                human_input=None,
-                hashnode_approval=None,
-                twitter_approval=None
+        workflow = compile_workflow_with_checkpointer(self.checkpointer, self.durability)
+        
+        # Generate unique thread ID
+        thread_id = str(uuid.uuid4())
+        initial_state = self._initial_state(request)
+        config = self._thread_config(thread_id)
+        
+        if self.executions is not None:
+            await self.executions.create(
+                thread_id, request.user_id, request.topic,
+                "queued" if request.background else "initialized"
             )
-            
-            # Configure the workflow
-            config: RunnableConfig = {
-                "configurable": {
-                    "thread_id": thread_id,
-                    "recursion_limit": 50  # Increase recursion limit
-                }
-            }
-            
-            # Start the workflow
-            result = workflow.invoke(initial_state, config)
-            
-            return {
+
+        if request.background:
+            return await self._start_in_background(workflow, thread_id, initial_state, config)
+
+        # Start the workflow
+        result = await self._run_graph(workflow, initial_state, config)
+        
+        return {
+            "thread_id": thread_id,
+            "status": result.get("workflow_status", "started"),
+            "current_node": result.get("current_node", "start"),
+            "message": "Workflow started successfully",
+            "requires_human_input": self._requires_human_input(result.get("current_node", "")),
+            "result": result
+        }
+
+    async def start_workflow_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate and queue many workflows at once.
+
+        Invalid items are reported per index without failing the batch, and so
+        are items whose initial state could not be checkpointed. Valid ones get
+        their projections in a single bulk insert and are fed to the worker pool
+        at most WORKFLOW_BATCH_CONCURRENCY at a time.
+        """
+        if self.runner is None:
+            raise RuntimeError("Background execution is not available")
+
+        workflow = compile_workflow_with_checkpointer(self.checkpointer, self.durability)
+        results = []
+        accepted = []
+        for index, item in enumerate(items):
+            try:
+                request = WorkflowRequest.model_validate(item)
+            except ValidationError as e:
+                error = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+                results.append({"index": index, "thread_id": None, "status": "rejected", "error": error})
+                continue
+
+            thread_id = str(uuid.uuid4())
+            accepted.append((index, thread_id, request))
+            results.append({"index": index, "thread_id": thread_id, "status": "queued", "error": None})
+
+        if self.executions is not None:
+            await self.executions.create_many([
+                self.executions.new_execution(thread_id, request.user_id, request.topic, "queued")
+                for _, thread_id, request in accepted
+            ])
+
+        # Checkpoint every initial state before queueing, so a restart cannot lose
+        # a queued job (requeue_queued picks them up again on startup)
+        slots = asyncio.Semaphore(settings.WORKFLOW_BATCH_PERSIST_CONCURRENCY)
+
+        async def persist(thread_id: str, request: WorkflowRequest):
+            initial_state = self._initial_state(request)
+            initial_state["workflow_status"] = "queued"
+            async with slots:
+                await workflow.aupdate_state(self._thread_config(thread_id), initial_state, as_node=START)
+
+        outcomes = await asyncio.gather(
+            *(persist(thread_id, request) for _, thread_id, request in accepted), return_exceptions=True
+        )
+        # An item whose initial state could not be stored is rejected on its own;
+        # it must not stay "queued" for requeue_queued to run after a restart
+        persisted = []
+        for (index, thread_id, request), outcome in zip(accepted, outcomes):
+            if isinstance(outcome, BaseException):
+                results[index] = {"index": index, "thread_id": None, "status": "rejected", "error": str(outcome)}
+                if self.executions is not None:
+                    await self.executions.delete(thread_id)
+                with contextlib.suppress(Exception):
+                    await self.checkpointer.adelete_thread(thread_id)
+            else:
+                persisted.append((index, thread_id, request))
+        accepted = persisted
+
+        self.runner.submit_batch(
+            [(thread_id, self._background_job(workflow, thread_id, None)) for _, thread_id, _ in accepted],
+            settings.WORKFLOW_BATCH_CONCURRENCY
+        )
+
+        if self.events is not None:
+            for _, thread_id, _ in accepted:
+                await self.events.publish(thread_id, "status", self._status_payload(thread_id, "queued", "start"))
+
+        return {
+            "accepted": len(accepted),
+            "rejected": len(items) - len(accepted),
+            "items": results
+        }
+
+    async def requeue_queued(self) -> Dict[str, Any]:
+        """Resubmit background jobs that were still queued or posting a Twitter
+        thread when the process stopped.
+
+        Queued runs have their initial state checkpointed before they are
+        queued, so they continue from START; a queued projection without a
+        checkpoint is marked failed instead of staying "queued" forever. A
+        thread stopped while posting (stop() cancels the job, so no failure was
+        recorded) still has publish_twitter next and continues from its last
+        recorded tweet, and a decision that was claimed but never resumed is
+        put back to waiting.
+        """
+        if self.runner is None or self.executions is None:
+            return {"requeued": 0, "failed": 0}
+
+        workflow = compile_workflow_with_checkpointer(self.checkpointer, self.durability)
+        jobs, lost = [], []
+        for thread_id in await self.executions.get_with_status("queued"):
+            snapshot = await workflow.aget_state(self._thread_config(thread_id))
+            if snapshot.values and snapshot.next:
+                jobs.append((thread_id, self._background_job(workflow, thread_id, None)))
+            else:
+                lost.append(thread_id)
+        released = 0
+        for status in DECIDED_STATUSES:
+            for thread_id in await self.executions.get_with_status(status):
+                if self.is_running(thread_id):
+                    continue
+                execution = await self.executions.get(thread_id)
+                snapshot = await workflow.aget_state(self._thread_config(thread_id))
+                pending = self._pending_decision(snapshot)
+                if pending is not None:
+                    await self._reopen_decision(thread_id, pending)
+                    released += 1
+                # Claimed like a retry, so a retry racing the requeue does not resume it as well
+                elif "publish_twitter" in snapshot.next and await self._claim_twitter_publish(
+                    execution, ("publishing_twitter",)
+                ):
+                    jobs.append((thread_id, self._publish_job(workflow, thread_id)))
+
+        if jobs:
+            self.runner.submit_batch(jobs, settings.WORKFLOW_BATCH_CONCURRENCY)
+        for thread_id in lost:
+            await self._record_status(thread_id, "failed", None, error="Queued run was lost before it started")
+        if jobs or lost or released:
+            print(f"Requeued {len(jobs)} interrupted workflows, {len(lost)} could not be recovered, "
+                  f"{released} undecided again")
+        return {"requeued": len(jobs), "failed": len(lost)}
+
+    def _initial_state(self, request: WorkflowRequest) -> WorkflowState:
+        """Initial graph state for a start request"""
+        return WorkflowState(
+            messages=[],
+            user_id=request.user_id,
+            topic=request.topic,
+            theme=request.theme,
+            include_plain_draft=request.include_plain_draft,
+            blog_content=None,
+            themed_blog=None,
+            twitter_thread=None,
+            hashnode_post=None,
+            twitter_post=None,
+            publish_schedule={
+                "twitter": request.schedule_twitter,
+                "hashnode": request.schedule_hashnode
+            },
+            workflow_status="initialized",
+            current_node="start",
+            human_input=None,
+            hashnode_approval=None,
+            twitter_approval=None
+        )
+
+    def _thread_config(self, thread_id: str) -> RunnableConfig:
+        """Run config for a new thread"""
+        return {
+            "configurable": {
                 "thread_id": thread_id,
-                "status": result.get("workflow_status", "started"),
-                "current_node": result.get("current_node", "start"),
-                "message": "Workflow started successfully",
-                "requires_human_input": self._requires_human_input(result.get("current_node", "")),
-                "result": result
+                "recursion_limit": 50  # Increase recursion limit
             }
+        }
+
+    def _background_job(self, workflow, thread_id: str, graph_input: Any, durability: Optional[str] = None,
+                        park_rate_limited: bool = False):
+        """Worker-pool job that runs a thread and records a failure on the projection.
+
+        With park_rate_limited, a tweet that has to wait for the rate limit ends
+        the run instead; the runner parks the job and runs it again (continuing
+        from that tweet) when the next token is due, so no worker waits.
+        """
+        config = self._thread_config(thread_id)
+        if park_rate_limited:
+            config["configurable"][CONFIG_KEY_PARK_RATE_LIMITED] = True
+
+        async def run():
+            try:
+                await self._run_graph(workflow, graph_input, config, durability)
+            except ThreadBusyError:
+                # Another run on this thread is still going and owns its status
+                raise
+            except TweetRateLimitedError as e:
+                raise JobDeferredError(e.retry_after) from e
+            except Exception as e:
+                await self._record_status(thread_id, "failed", None, error=str(e))
+                raise
+
+        return run
     
+    async def _start_in_background(self, workflow, thread_id: str, initial_state: WorkflowState,
+                                   config: RunnableConfig) -> Dict[str, Any]:
+        """Persist the initial state and queue the run on the worker pool"""
+        if self.runner is None:
+            raise RuntimeError("Background execution is not available")
+
+        initial_state["workflow_status"] = "queued"
+        await workflow.aupdate_state(config, initial_state, as_node=START)
+
+        # Input is already checkpointed, so the worker continues the thread from START
+        try:
+            self.runner.submit(thread_id, self._background_job(workflow, thread_id, None))
+        except WorkflowQueueFullError:
+            await self.checkpointer.adelete_thread(thread_id)
+            if self.executions is not None:
+                await self.executions.delete(thread_id)
+            raise
+        if self.events is not None:
+            await self.events.publish(thread_id, "status", self._status_payload(thread_id, "queued", "start"))
+
+        return {
+            "thread_id": thread_id,
+            "status": "queued",
+            "current_node": "start",
+            "message": "Workflow queued for background execution",
+            "requires_human_input": False
+        }
+
     async def provide_human_input(self, request: HumanInputRequest) -> Dict[str, Any]:
         """Provide human input to continue workflow"""
-        with MongoDBSaver.from_conn_string(self.mongo_uri) as checkpointer:
-            workflow = compile_workflow_with_checkpointer(checkpointer)
-
-            # Get current state
-            config: RunnableConfig = {
-                "configurable": {
-                    "thread_id": request.thread_id
-                },
-                "recursion_limit": 50
-            }
+        workflow = compile_workflow_with_checkpointer(self.checkpointer, self.durability)
 
-            # Get current state to determine which approval to set
-            current_state = checkpointer.get(config)
-            current_node = ""
-            if current_state:
-                channel_values = current_state.get("channel_values", {})
-                current_node = channel_values.get("current_node", "")
+        # Get current state
+        config: RunnableConfig = {
+            "configurable": {
+                "thread_id": request.thread_id
+            },
+            "recursion_limit": 50
+        }
 
-            # Determine which approval field to set based on current node
-            if current_node == "hashnode_post":
-                update_state = {"hashnode_approval": request.user_input, "human_input": request.user_input}
-            elif current_node == "twitter_post":
-                update_state = {"twitter_approval": request.user_input, "human_input": request.user_input}
-            else:
-                update_state = {"human_input": request.user_input}
-            
-            # Continue workflow
-            result = workflow.invoke(update_state, config)
-            
-            return {
-                "thread_id": request.thread_id,
-                "status": result.get("workflow_status", "continued"),
-                "current_node": result.get("current_node", ""),
-                "message": f"Workflow continued with input: {request.user_input}",
-                "requires_human_input": self._requires_human_input(result.get("current_node", "")),
-                "result": result
-            }
-    
-    async def get_workflow_status(self, thread_id: str) -> Dict[str, Any]:
-        """Get current workflow status"""
-        with MongoDBSaver.from_conn_string(self.mongo_uri) as checkpointer:
-            # Get current state from checkpointer
-            config: RunnableConfig = {
-                "configurable": {
-                    "thread_id": thread_id
-                },
-                "recursion_limit": 50
-            }
-            
+        # Approvals resume the run suspended inside an await_* node, so only
+        # the nodes after the pause point execute
+        snapshot = await workflow.aget_state(config)
+        not_waiting = {
+            "thread_id": request.thread_id,
+            "status": snapshot.values.get("workflow_status", "not_found"),
+            "current_node": snapshot.values.get("current_node", ""),
+            "message": "Workflow is not waiting for input",
+            "requires_human_input": False
+        }
+        if not any(task.interrupts for task in snapshot.tasks):
+            return not_waiting
+        # A decision being resumed still leaves the checkpoint paused until its
+        # run writes one, so a second one is refused rather than resumed again
+        if self.is_running(request.thread_id):
+            raise ThreadBusyError(f"Thread {request.thread_id} already has a run in progress")
+
+        # Continue workflow
+        async with self._track_run(request.thread_id):
+            pending = self._pending_decision(snapshot)
+            if not await self._claim_decision(request.thread_id, pending, request.user_input):
+                return not_waiting
             try:
-                state = checkpointer.get(config)
-                if state:
-                    # Extract values from the nested state structure
-                    channel_values = state.get("channel_values", {})
-                    workflow_status = channel_values.get("workflow_status", "unknown")
-                    current_node = channel_values.get("current_node", "")
+                if self._posts_in_background(pending, request.user_input):
+                    result = await self._approve_twitter_in_background(workflow, config, request.user_input)
+                else:
+                    result = await self._run_graph(workflow, Command(resume=request.user_input), config,
+                                                   self._resume_durability(pending))
+                    if self.executions is not None and result.get("workflow_status") == f"waiting_{pending}":
+                        # An invalid decision pauses on the same approval again
+                        await self._reopen_decision(request.thread_id, pending)
+            except BaseException:
+                await self._release_decision(workflow, config, pending)
+                raise
+
+        return {
+            "thread_id": request.thread_id,
+            "status": result.get("workflow_status", "continued"),
+            "current_node": result.get("current_node", ""),
+            "message": f"Workflow continued with input: {request.user_input}",
+            "requires_human_input": self._requires_human_input(result.get("current_node", "")),
+            "result": result
+        }
+
+    async def retry_twitter_publish(self, thread_id: str) -> Dict[str, Any]:
+        """Resume a failed or interrupted Twitter thread from its last recorded tweet.
+
+        After a recorded failure the approval is replayed as the last completed
+        step, so publish_twitter runs again with the tweets already checkpointed
+        in twitter_post and only posts the rest of the thread; a thread whose
+        run crashed or was cancelled still has publish_twitter next and simply
+        continues. Only one retry of a thread runs at a time: the projection is
+        claimed (see _claim_twitter_publish) before the checkpoint is touched,
+        and a retry that loses that race is refused.
+        """
+        workflow = compile_workflow_with_checkpointer(self.checkpointer, self.durability)
+        config: RunnableConfig = {"configurable": {"thread_id": thread_id}, "recursion_limit": 50}
+
+        if self.is_running(thread_id):
+            return self._not_retried(thread_id, "publishing_twitter", "publish_twitter",
+                                     "Twitter thread is already being published")
+
+        # Counts as running from here on, which also takes an expiring thread off
+        # the TTL schedule before its checkpoint is extended
+        async with self._track_run(thread_id):
+            # Read before the checkpoint: a retry claiming the thread in between
+            # changes the revision this one has to claim it at
+            execution = await self.executions.get(thread_id) if self.executions is not None else None
+            snapshot = await workflow.aget_state(config)
+            status = snapshot.values.get("workflow_status", "not_found")
+            current_node = snapshot.values.get("current_node", "")
+            interrupted = "publish_twitter" in snapshot.next
+            if status != "twitter_failed" and not interrupted:
+                return self._not_retried(thread_id, status, current_node,
+                                         "Workflow has no failed Twitter thread to retry")
+            if self.executions is not None:
+                retryable = INTERRUPTED_TWITTER_STATUSES if interrupted else ("twitter_failed",)
+                if not await self._claim_twitter_publish(execution, retryable):
+                    return self._not_retried(thread_id, "publishing_twitter", "publish_twitter",
+                                             "Twitter thread is already being published")
 
+            values = {"workflow_status": "publishing_twitter", "current_node": "publish_twitter"}
+            try:
+                if self.runner is not None:
+                    if interrupted:
+                        self.runner.submit(thread_id, self._publish_job(workflow, thread_id))
+                    else:
+                        await self._publish_twitter_in_background(workflow, config, values)
                     return {
                         "thread_id": thread_id,
-                        "status": workflow_status,
-                        "current_node": current_node,
-                        "requires_human_input": self._requires_human_input(current_node),
-                        "state": state
+                        "status": "publishing_twitter",
+                        "current_node": "publish_twitter",
+                        "message": "Twitter thread retry queued",
+                        "requires_human_input": False
                     }
-                else:
+                if not interrupted:
+                    await workflow.aupdate_state(config, values, as_node="await_twitter_approval")
+            except BaseException:
+                # Nothing was resumed, so the thread can be retried again
+                if execution is not None:
+                    await self.executions.record_transition(thread_id, execution.workflow_status,
+                                                            execution.current_node)
+                raise
+            result = await self._run_graph(workflow, None, config, PUBLISH_DURABILITY)
+
+        posted = len((result.get("twitter_post") or {}).get("tweets") or [])
+        return {
+            "thread_id": thread_id,
+            "status": result.get("workflow_status", "continued"),
+            "current_node": result.get("current_node", ""),
+            "message": f"Twitter thread retried, {posted} tweets posted",
+            "requires_human_input": False,
+            "result": result
+        }
+
+    async def _claim_twitter_publish(self, execution: Optional[WorkflowExecution],
+                                     retryable: Tuple[str, ...]) -> bool:
+        """Move the projection, as read in `execution`, to publishing_twitter
+        atomically; False when its status is not one of `retryable` or another
+        writer changed it since it was read.
+
+        The revision is compared too, since a thread that was interrupted while
+        publishing is already in that status.
+        """
+        if execution is None or execution.workflow_status not in retryable:
+            return False
+        return await self.executions.compare_and_set_status(
+            execution.thread_id, execution.workflow_status, "publishing_twitter", "publish_twitter",
+            execution.revision
+        )
+
+    def _publish_job(self, workflow, thread_id: str):
+        """Background job continuing a thread whose next step is publish_twitter"""
+        return self._background_job(workflow, thread_id, None, PUBLISH_DURABILITY, park_rate_limited=True)
+
+    def _not_retried(self, thread_id: str, status: str, current_node: str, message: str) -> Dict[str, Any]:
+        return {
+            "thread_id": thread_id,
+            "status": status,
+            "current_node": current_node,
+            "message": message,
+            "requires_human_input": False
+        }
+
+    async def apply_decisions(self, decisions: List[WorkflowDecision]) -> Dict[str, Any]:
+        """Approve or reject many paused threads at once.
+
+        Which threads are actually waiting on the requested target is read with
+        one query against the execution projection; the matching threads are
+        then resumed concurrently, at most WORKFLOW_DECISION_CONCURRENCY at once.
+        """
+        workflow = compile_workflow_with_checkpointer(self.checkpointer, self.durability)
+        thread_ids = list(dict.fromkeys(decision.thread_id for decision in decisions))
+        waiting = await self._wait_states(workflow, thread_ids)
+        slots = asyncio.Semaphore(settings.WORKFLOW_DECISION_CONCURRENCY)
+        seen = set()
+
+        async def apply(decision: WorkflowDecision) -> Dict[str, Any]:
+            thread_id = decision.thread_id
+            status = waiting.get(thread_id)
+            if thread_id in seen:
+                return {"thread_id": thread_id, "applied": False, "status": status or "not_found",
+                        "error": "Duplicate decision for thread"}
+            seen.add(thread_id)
+            if status is None:
+                return {"thread_id": thread_id, "applied": False, "status": "not_found",
+                        "error": "Workflow not found"}
+            if status != f"waiting_{decision.target}_approval":
+                return {"thread_id": thread_id, "applied": False, "status": status,
+                        "error": f"Workflow is not waiting for {decision.target} approval"}
+
+            if self.is_running(thread_id):
+                return {"thread_id": thread_id, "applied": False, "status": status,
+                        "error": "Workflow already has a run in progress"}
+
+            user_input = "yes" if decision.decision == "approve" else "no"
+            pending = f"{decision.target}_approval"
+            config: RunnableConfig = {"configurable": {"thread_id": thread_id}, "recursion_limit": 50}
+            async with self._track_run(thread_id), slots:
+                if not await self._claim_decision(thread_id, pending, user_input):
+                    return {"thread_id": thread_id, "applied": False, "status": status,
+                            "error": f"Workflow is not waiting for {decision.target} approval"}
+                try:
+                    if self._posts_in_background(pending, user_input):
+                        result = await self._approve_twitter_in_background(workflow, config, user_input)
+                    else:
+                        result = await self._run_graph(workflow, Command(resume=user_input), config,
+                                                       self._resume_durability(pending))
+                except Exception as e:
+                    if await self._release_decision(workflow, config, pending):
+                        return {"thread_id": thread_id, "applied": False, "status": status, "error": str(e)}
+                    await self._record_status(thread_id, "failed", None, error=str(e))
+                    return {"thread_id": thread_id, "applied": False, "status": "failed", "error": str(e)}
+            return {
+                "thread_id": thread_id,
+                "applied": True,
+                "status": result.get("workflow_status", "continued"),
+                "current_node": result.get("current_node", "")
+            }
+
+        # Duplicates are flagged in submission order before any resume starts
+        items = await asyncio.gather(*(apply(decision) for decision in decisions))
+        applied = sum(1 for item in items if item["applied"])
+        return {"applied": applied, "skipped": len(items) - applied, "items": items}
+
+    def _pending_decision(self, snapshot) -> Optional[str]:
+        """Type of the decision a paused thread waits for (e.g. "twitter_approval")"""
+        for task in snapshot.tasks:
+            for interrupt in task.interrupts:
+                if isinstance(interrupt.value, dict):
+                    return interrupt.value.get("type")
+        return None
+
+    async def _claim_decision(self, thread_id: str, pending: Optional[str], user_input: str) -> bool:
+        """Move the projection off waiting_<pending> atomically before a decision
+        resumes the thread; False when a concurrent decision got there first.
+
+        Threads without a projection (started before projections existed) only
+        have the in-process is_running guard.
+        """
+        if self.executions is None or pending is None:
+            return True
+        target = pending[:-len("_approval")]
+        if str(user_input).lower() in APPROVE_INPUTS:
+            decided, current_node = f"publishing_{target}", f"publish_{target}"
+        else:
+            decided, current_node = f"{target}_rejected", f"await_{pending}"
+        if await self.executions.compare_and_set_status(thread_id, f"waiting_{pending}", decided, current_node):
+            return True
+        return await self.executions.get_revision(thread_id) is None
+
+    async def _release_decision(self, workflow, config: RunnableConfig, pending: Optional[str]) -> bool:
+        """Put the projection back to waiting_<pending> after a decision failed
+        before its resume was consumed; False when the thread moved on"""
+        if not await self._is_waiting(workflow, config):
+            return False
+        if self.executions is not None and pending is not None:
+            await self._reopen_decision(config["configurable"]["thread_id"], pending)
+        return True
+
+    async def _reopen_decision(self, thread_id: str, pending: str):
+        """Project a thread as paused on `pending` again, as the node that paused it did"""
+        target = pending[:-len("_approval")]
+        await self.executions.record_transition(thread_id, f"waiting_{pending}", f"{target}_post")
+
+    def _posts_in_background(self, pending: Optional[str], user_input: str) -> bool:
+        """Whether a decision approves a Twitter thread that the worker pool can post"""
+        return (
+            self.runner is not None
+            and pending == "twitter_approval"
+            and str(user_input).lower() in APPROVE_INPUTS
+        )
+
+    def _resume_durability(self, pending: Optional[str]) -> Optional[str]:
+        """Durability for resuming a thread paused on `pending`; None keeps the configured mode"""
+        return PUBLISH_DURABILITY if pending == "twitter_approval" else None
+
+    async def _approve_twitter_in_background(self, workflow, config: RunnableConfig,
+                                             user_input: str) -> Dict[str, Any]:
+        """Record a Twitter approval and leave posting the thread to the worker pool.
+
+        Tweets wait on the shared rate limiter, possibly for a whole window, so
+        they are not posted while the approving request (or decision batch slot)
+        waits; the publish job parks on the runner while it has no token.
+        """
+        values = {
+            "twitter_approval": user_input,
+            "human_input": user_input,
+            "workflow_status": "publishing_twitter",
+            "current_node": "publish_twitter"
+        }
+        await self._publish_twitter_in_background(workflow, config, values)
+        await self._record_status(config["configurable"]["thread_id"], "publishing_twitter", "publish_twitter")
+        return values
+
+    async def _publish_twitter_in_background(self, workflow, config: RunnableConfig, values: Dict[str, Any]):
+        """Checkpoint `values` as await_twitter_approval's result, which makes
+        publish_twitter the thread's next step, and queue that on the worker pool"""
+        thread_id = config["configurable"]["thread_id"]
+        ready = asyncio.get_running_loop().create_future()
+        job = self._publish_job(workflow, thread_id)
+
+        async def publish():
+            # Only once the update is checkpointed; resuming before would pause again
+            if await ready:
+                await job()
+
+        # Queued first, so a full queue rejects the request before anything is recorded
+        self.runner.submit(thread_id, publish)
+        try:
+            await workflow.aupdate_state(config, values, as_node="await_twitter_approval")
+        except BaseException:
+            ready.set_result(False)
+            raise
+        ready.set_result(True)
+
+    async def _is_waiting(self, workflow, config: RunnableConfig) -> bool:
+        """Whether the thread's checkpoint still has a pending interrupt"""
+        try:
+            snapshot = await workflow.aget_state(config)
+        except Exception:
+            return False
+        return any(task.interrupts for task in snapshot.tasks)
+
+    async def _wait_states(self, workflow, thread_ids: List[str]) -> Dict[str, str]:
+        """workflow_status per existing thread, from the projection when available"""
+        if self.executions is not None:
+            return await self.executions.get_wait_states(thread_ids)
+
+        states = {}
+        for thread_id in thread_ids:
+            snapshot = await workflow.aget_state({"configurable": {"thread_id": thread_id}})
+            if snapshot.values:
+                states[thread_id] = snapshot.values.get("workflow_status", "unknown")
+        return states
+
+    async def get_workflow_status(self, thread_id: str) -> Dict[str, Any]:
+        """Get current workflow status from the execution projection"""
+        try:
+            if self.executions is not None:
+                execution = await self.executions.get(thread_id)
+                if execution:
+                    current_node = execution.current_node or ""
+                    workflow_status = self._effective_status(thread_id, execution.workflow_status, current_node)
                     return {
-                        "thread_id": thread_id,
-                        "status": "not_found",
-                        "message": "Workflow not found"
+                        **self._status_payload(thread_id, workflow_status, current_node),
+                        "execution_status": execution.status,
+                        "results": execution.results,
+                        "error_message": execution.error_message,
+                        "revision": execution.revision,
+                        "last_updated": execution.last_updated
                     }
-            except Exception as e:
+
+            # Threads without a projection (e.g. started before projections existed)
+            state = await self.get_workflow_state(thread_id)
+            if state:
+                # Extract values from the nested state structure
+                channel_values = state.get("channel_values", {})
+                current_node = channel_values.get("current_node", "")
+                workflow_status = self._effective_status(
+                    thread_id, channel_values.get("workflow_status", "unknown"), current_node
+                )
+                return {
+                    **self._status_payload(thread_id, workflow_status, current_node),
+                    "results": extract_results(channel_values)
+                }
+            else:
                 return {
                     "thread_id": thread_id,
-                    "status": "error",
-                    "message": str(e)
+                    "status": "not_found",
+                    "message": "Workflow not found"
                 }
-    
+        except Exception as e:
+            return {
+                "thread_id": thread_id,
+                "status": "error",
+                "message": str(e)
+            }
+
+    async def get_workflow_statuses(self, thread_ids: List[str],
+                                    fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Compact status records for many threads from a single projection query"""
+        fields = fields or list(STATUS_FIELDS)
+        unknown = [field for field in fields if field not in STATUS_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown status fields: {', '.join(unknown)}")
+        thread_ids = list(dict.fromkeys(thread_ids))
+
+        if self.executions is None:
+            # No projection to query; fall back to one status read per thread
+            records = [await self.get_workflow_status(thread_id) for thread_id in thread_ids]
+            found = [record for record in records if record.get("status") != "not_found"]
+            return {
+                "items": [
+                    {"thread_id": record["thread_id"], **{field: record.get(field) for field in fields}}
+                    for record in found
+                ],
+                "missing": [record["thread_id"] for record in records if record.get("status") == "not_found"]
+            }
+
+        documents = await self.executions.get_many(
+            thread_ids, sorted({column for field in fields for column in STATUS_FIELDS[field]})
+        )
+        items = []
+        for thread_id in thread_ids:
+            doc = documents.get(thread_id)
+            if doc is None:
+                continue
+            item = {"thread_id": thread_id}
+            for field in fields:
+                if field == "status":
+                    item["status"] = self._effective_status(
+                        thread_id, doc.get("workflow_status", "unknown"), doc.get("current_node") or ""
+                    )
+                elif field == "execution_status":
+                    item["execution_status"] = doc.get("status")
+                else:
+                    item[field] = doc.get(field)
+            items.append(item)
+
+        return {
+            "items": items,
+            "missing": [thread_id for thread_id in thread_ids if thread_id not in documents]
+        }
+
+    async def get_status_version(self, thread_id: str) -> Optional[str]:
+        """ETag for /status, read from the projection's revision only"""
+        if self.executions is None:
+            return None
+        revision = await self.executions.get_revision(thread_id)
+        if revision is None:
+            return None
+        # Queued/running come from the worker pool rather than the projection
+        runner_status = self.runner.get_status(thread_id) if self.runner else None
+        return f'"{revision}-{runner_status}"' if runner_status else f'"{revision}"'
+
+    async def get_state_version(self, thread_id: str) -> Optional[str]:
+        """ETag for /state; the revision is bumped whenever a checkpoint is written"""
+        if self.executions is None:
+            return None
+        revision = await self.executions.get_revision(thread_id)
+        return f'"{revision}"' if revision is not None else None
+
+    async def get_workflow_state(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Load the full checkpointed state of a thread"""
+        config: RunnableConfig = {
+            "configurable": {
+                "thread_id": thread_id
+            }
+        }
+        return await self.checkpointer.aget(config)
+
+    async def stream_events(self, thread_id: str, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """Server-Sent Events stream of status transitions for a thread.
+
+        Resumes after Last-Event-ID while the event is still buffered; otherwise
+        starts from a single status snapshot read from the checkpointer. Token
+        events of running LLM nodes carry no id and are not replayed on resume.
+        """
+        last_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+        if last_id is None or not self.events.covers(thread_id, last_id):
+            last_id = self.events.last_event_id(thread_id)
+            snapshot = await self.get_workflow_status(thread_id)
+            yield format_sse(last_id, "status", snapshot)
+            if snapshot.get("status") in TERMINAL_STATUSES + ["not_found"]:
+                return
+
+        async for item in self.events.subscribe(thread_id, last_id):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            event_id, event, data = item
+            yield format_sse(event_id, event, data)
+            if data.get("status") in TERMINAL_STATUSES:
+                return
+
+    async def _run_graph(self, workflow, graph_input: Any, config: RunnableConfig,
+                         durability: Optional[str] = None) -> Dict[str, Any]:
+        """Run the graph to its next pause point, publishing every state transition.
+
+        `durability` overrides the service's checkpoint durability for this run.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        durability = durability or self.durability
+        values: Dict[str, Any] = {}
+        first_chunk = True
+        # Token chunks from the LLM nodes only matter when someone can subscribe to them
+        stream_mode = ["values", "custom"] if self.events is not None and settings.LLM_STREAM_NODES else ["values"]
+        async with self._track_run(thread_id), self._durability_scope(thread_id, durability):
+            async for mode, chunk in workflow.astream(graph_input, config, stream_mode=stream_mode,
+                                                      checkpoint_during=checkpoint_during(durability)):
+                if mode == "custom":
+                    if chunk.get("type") == "token":
+                        await self.events.publish_transient(thread_id, "token", {
+                            "thread_id": thread_id,
+                            "node": chunk["node"],
+                            "content": chunk["content"]
+                        })
+                    continue
+                if "__interrupt__" in chunk:
+                    # Pause marker; the state before it already reports the waiting status
+                    continue
+                values = chunk
+
+                # The first chunk replays the input / already-saved state; every later one
+                # is a new checkpoint, so the projection revision tracks checkpoints 1:1
+                if first_chunk:
+                    first_chunk = False
+                    continue
+
+                await self._record_status(
+                    thread_id,
+                    values.get("workflow_status", "running"),
+                    values.get("current_node", ""),
+                    values=values
+                )
+
+        if self.durability != "every-step" and self.executions is not None:
+            # Checkpoints only landed now, after the revisions above were handed out
+            await self.executions.bump_revision(thread_id)
+        return values
+
+    @contextlib.asynccontextmanager
+    async def _track_run(self, thread_id: str):
+        """Mark the thread as running (see is_running) and take a thread that was
+        finished and scheduled to expire off the TTL schedule before it changes"""
+        self._active_runs[thread_id] = self._active_runs.get(thread_id, 0) + 1
+        try:
+            if self.executions is not None and await self.executions.has_expiry(thread_id):
+                # Checkpoint documents first, so a failure leaves the projection
+                # flagged and the next run tries again
+                aclear_expiry = getattr(self.checkpointer, "aclear_expiry", None)
+                if aclear_expiry is not None:
+                    await aclear_expiry(thread_id)
+                await self.executions.clear_expiry(thread_id)
+            yield
+        finally:
+            self._active_runs[thread_id] -= 1
+            if not self._active_runs[thread_id]:
+                del self._active_runs[thread_id]
+
+    def _durability_scope(self, thread_id: str, durability: str):
+        """Buffer a run's checkpoint writes until it exits in at-exit mode"""
+        coalesce = getattr(self.checkpointer, "coalesce", None)
+        if durability == "at-exit" and coalesce is not None:
+            return coalesce(thread_id)
+        return contextlib.nullcontext()
+
+    async def _record_status(self, thread_id: str, status: str, current_node: Optional[str],
+                             values: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Apply a state transition to the execution projection and publish it"""
+        if self.events is not None:
+            payload = self._status_payload(thread_id, status, current_node or "")
+            if error:
+                payload["error"] = error
+            await self.events.publish(thread_id, "status", payload)
+
+        if self.executions is not None:
+            await self.executions.record_transition(thread_id, status, current_node, values, error)
+
+    def _effective_status(self, thread_id: str, workflow_status: str, current_node: str) -> str:
+        """Queued/running/failed background runs take precedence over the last
+        recorded state, unless that state is already a pause or final state"""
+        runner_status = self.runner.get_status(thread_id) if self.runner else None
+        if runner_status == "failed" or (
+            runner_status
+            and not self._requires_human_input(current_node)
+            and workflow_status not in TERMINAL_STATUSES
+        ):
+            return runner_status
+        return workflow_status
+
+    def _status_payload(self, thread_id: str, workflow_status: str, current_node: str) -> Dict[str, Any]:
+        """Compact status record shared by /status and the event stream"""
+        return {
+            "thread_id": thread_id,
+            "status": workflow_status,
+            "current_node": current_node,
+            "requires_human_input": self._requires_human_input(current_node)
+        }
+
     def _requires_human_input(self, current_node: str) -> bool:
         """Check if current node requires human input"""
         return current_node in ["hashnode_post", "twitter_post"]
\ No newline at end of file
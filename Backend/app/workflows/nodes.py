@@ -1,9 +1,16 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.config import get_config
+from langgraph.constants import CONFIG_KEY_STREAM_WRITER
+from langgraph.types import interrupt
 from pydantic import SecretStr
 from ..core.config import settings
-from ..services.hashnode_service import HashnodeService
+from ..services.hashnode_service import HashnodeService, HashnodeAPIError
+from ..services.llm_cache import LLMCache
+from ..services.semantic_cache import SemanticBlogCache
+from ..services.twitter_service import TwitterService, TweetRateLimitedError
 from ..schemas.workflow_state import WorkflowState
 from datetime import datetime
 
@@ -17,19 +24,128 @@ llm = ChatOpenAI(
 # Initialize Hashnode service
 hashnode_service = HashnodeService()
 
-def start_node(state: WorkflowState) -> Dict[str, Any]:
+# Initialize Twitter service (tweets are paced by its shared rate limiter)
+twitter_service = TwitterService()
+
+# Response cache shared by the prompt-template nodes (see LLM_CACHE_NODES)
+llm_cache = LLMCache()
+
+# Embedding index of generated blogs (see SEMANTIC_CACHE_MODE)
+blog_cache = SemanticBlogCache()
+
+def _token_writer(node: str) -> Optional[Callable[[Any], None]]:
+    """Custom stream writer of the current graph run, if it streams tokens for this node"""
+    if node not in settings.LLM_STREAM_NODES:
+        return None
+    try:
+        return get_config()["configurable"].get(CONFIG_KEY_STREAM_WRITER)
+    except RuntimeError:
+        return None  # Called outside a graph run
+
+async def _invoke_llm(node: str, prompt: str) -> str:
+    """Call the LLM with a single prompt, through the response cache if the node opts in.
+
+    When the graph is streamed with stream_mode="custom", nodes listed in
+    LLM_STREAM_NODES emit {"type": "token", ...} chunks as the model produces
+    them; the full text is still returned (and checkpointed) once.
+    """
+    messages = [HumanMessage(content=prompt)]
+    writer = _token_writer(node)
+    streamed = False
+
+    async def invoke(messages: List[Any]) -> str:
+        nonlocal streamed
+        if writer is None:
+            return (await llm.ainvoke(messages)).content
+        streamed = True
+        parts = []
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                writer({"type": "token", "node": node, "content": chunk.content})
+        return "".join(parts)
+
+    if llm_cache.enabled_for(node):
+        content = await llm_cache.get_or_invoke(node, llm, messages, invoke=invoke)
+    else:
+        content = await invoke(messages)
+
+    if writer is not None and not streamed:
+        # Served from the cache (or a concurrent identical call): send it in one piece
+        writer({"type": "token", "node": node, "content": content})
+    return content
+
+async def start_node(state: WorkflowState) -> Dict[str, Any]:
     """Start node - initializes the workflow with user_id"""
     print(f"Starting workflow for user: {state['user_id']}")
     return {
         "workflow_status": "started",
         "current_node": "generate_blog",
-        "messages": state["messages"] + [{"role": "system", "content": f"Workflow started for user {state['user_id']}"}]
+        "messages": [{"role": "system", "content": f"Workflow started for user {state['user_id']}"}]
     }
 
-def generate_blog_node(state: WorkflowState) -> Dict[str, Any]:
+async def generate_blog_node(state: WorkflowState) -> Dict[str, Any]:
     """Generate blog content based on topic"""
     topic = state.get("topic", "")
-    
+
+    # A blog generated earlier for a near-duplicate topic is reused or adapted
+    # instead of writing a new one from scratch
+    vector, match = None, None
+    if blog_cache.enabled and topic:
+        try:
+            vector = await blog_cache.embed(topic)
+            match = await blog_cache.search(vector)
+        except Exception as e:
+            print(f"Semantic blog cache lookup failed, generating from scratch: {e}")
+
+    if match and blog_cache.mode == "reuse":
+        similarity, entry = match
+        return {
+            "blog_content": entry["blog_content"],
+            "current_node": "apply_theme",
+            "workflow_status": "blog_generated",
+            "messages": [{
+                "role": "assistant",
+                "content": f"Blog reused from similar topic '{entry['topic']}' (similarity {similarity:.2f})"
+            }]
+        }
+
+    if match:
+        similarity, entry = match
+        prompt = f"""
+    Adapt the following blog post, written about "{entry['topic']}", into a blog post about: {topic}
+
+    Existing blog:
+    {entry['blog_content']}
+
+    Requirements:
+    - Keep the structure and any points that still apply
+    - Rewrite whatever is specific to the original topic
+    - Minimum 800 words
+    """
+        blog_content = await _invoke_llm("adapt_blog", prompt)
+    else:
+        blog_content = await _generate_blog(topic)
+
+    if vector is not None:
+        try:
+            await blog_cache.add(topic, vector, blog_content)
+        except Exception as e:
+            print(f"Failed to add blog to the semantic cache: {e}")
+
+    return {
+        "blog_content": blog_content,
+        "current_node": "apply_theme",  # This will be overridden by conditional edge
+        "workflow_status": "blog_generated",
+        "messages": [{"role": "assistant", "content": f"Blog generated: {blog_content[:100]}..."}]
+    }
+
+async def _generate_blog(topic: str) -> str:
+    if settings.BLOG_GENERATION_MODE == "sectioned":
+        blog_content = await _generate_sectioned_blog(topic)
+        if blog_content is not None:
+            return blog_content
+
     prompt = f"""
     Write a comprehensive blog post about: {topic}
     
@@ -41,17 +157,68 @@ def generate_blog_node(state: WorkflowState) -> Dict[str, Any]:
     - Include relevant examples or case studies
     """
     
-    response = llm.invoke([HumanMessage(content=prompt)])
-    blog_content = response.content
-    
-    return {
-        "blog_content": blog_content,
-        "current_node": "apply_theme",  # This will be overridden by conditional edge
-        "workflow_status": "blog_generated",
-        "messages": state["messages"] + [{"role": "assistant", "content": f"Blog generated: {blog_content[:100]}..."}]
-    }
+    return await _invoke_llm("generate_blog", prompt)
+
+def _parse_outline(outline: str) -> Tuple[Optional[str], List[str]]:
+    """Title ("# ...") and section headings ("## ...") of a Markdown outline"""
+    title, sections = None, []
+    for line in outline.splitlines():
+        line = line.strip()
+        if line.startswith("## "):
+            sections.append(line[3:].strip())
+        elif line.startswith("# ") and title is None:
+            title = line[2:].strip()
+    return title, sections[:settings.BLOG_MAX_SECTIONS]
+
+async def _generate_sectioned_blog(topic: str) -> Optional[str]:
+    """Ask for an outline, then write its sections concurrently and stitch them in order.
 
-def apply_theme_node(state: WorkflowState) -> Dict[str, Any]:
+    Returns None when the outline cannot be parsed, so the caller falls back to
+    generating the whole post in one call.
+    """
+    outline_prompt = f"""
+    Create an outline for a comprehensive blog post about: {topic}
+
+    Format:
+    - First line: the title as "# Title"
+    - Then {settings.BLOG_MAX_SECTIONS // 2}-{settings.BLOG_MAX_SECTIONS} sections, one per line as "## Section heading"
+    - Start with an introduction and end with a conclusion
+    - Output only the outline
+    """
+    title, sections = _parse_outline(await _invoke_llm("generate_blog_outline", outline_prompt))
+    if len(sections) < 2:
+        print(f"Blog outline for '{topic}' has no usable sections, generating in one call")
+        return None
+
+    outline = "\n".join(f"{i + 1}. {heading}" for i, heading in enumerate(sections))
+    words_per_section = max(150, 800 // len(sections))
+    slots = asyncio.Semaphore(settings.BLOG_SECTION_CONCURRENCY)
+
+    async def write_section(heading: str) -> str:
+        prompt = f"""
+    You are writing one section of a blog post titled: {title or topic}
+
+    Full outline:
+    {outline}
+
+    Write only the section "{heading}".
+
+    Requirements:
+    - About {words_per_section} words
+    - Do not repeat the heading and do not write the other sections
+    - Engaging and informative, in clear, professional language
+    - Include relevant examples where they fit
+    """
+        async with slots:
+            return await _invoke_llm("generate_blog_section", prompt)
+
+    bodies = await asyncio.gather(*(write_section(heading) for heading in sections))
+    parts = [f"# {title or topic}"]
+    for heading, body in zip(sections, bodies):
+        parts.append(f"## {heading}\n\n{body.strip()}")
+    return "\n\n".join(parts)
+
+async def apply_theme_node(state: WorkflowState) -> Dict[str, Any]:
     """Apply theme to the blog content"""
     blog_content = state.get("blog_content", "")
     theme = state.get("theme")
@@ -62,7 +229,7 @@ def apply_theme_node(state: WorkflowState) -> Dict[str, Any]:
             "themed_blog": blog_content,
             "current_node": "twitter_thread",
             "workflow_status": "theme_applied",
-            "messages": state["messages"] + [{"role": "assistant", "content": "No theme applied, proceeding to Twitter thread generation"}]
+            "messages": [{"role": "assistant", "content": "No theme applied, proceeding to Twitter thread generation"}]
         }
     
     prompt = f"""
@@ -78,17 +245,44 @@ def apply_theme_node(state: WorkflowState) -> Dict[str, Any]:
     - Make it engaging for fans of {theme}
     """
     
-    response = llm.invoke([HumanMessage(content=prompt)])
-    themed_blog = response.content
+    themed_blog = await _invoke_llm("apply_theme", prompt)
     
     return {
         "themed_blog": themed_blog,
         "current_node": "twitter_thread",
         "workflow_status": "theme_applied",
-        "messages": state["messages"] + [{"role": "assistant", "content": f"Theme applied: {themed_blog[:100]}..."}]
+        "messages": [{"role": "assistant", "content": f"Theme applied: {themed_blog[:100]}..."}]
     }
 
-def twitter_thread_node(state: WorkflowState) -> Dict[str, Any]:
+async def generate_themed_blog_node(state: WorkflowState) -> Dict[str, Any]:
+    """Generate the themed blog in one call, without a plain draft"""
+    topic = state.get("topic", "")
+    theme = state.get("theme")
+
+    prompt = f"""
+    Write a comprehensive blog post about: {topic}
+    The whole post should revolve around the theme: {theme}
+
+    Requirements:
+    - Minimum 800 words
+    - Engaging and informative
+    - Include introduction, main points, and conclusion
+    - Incorporate the theme naturally throughout the content
+    - Use clear, professional language
+    - Include relevant examples or case studies
+    - Make it engaging for fans of {theme}
+    """
+
+    themed_blog = await _invoke_llm("generate_themed_blog", prompt)
+
+    return {
+        "themed_blog": themed_blog,
+        "current_node": "twitter_thread",
+        "workflow_status": "theme_applied",
+        "messages": [{"role": "assistant", "content": f"Themed blog generated: {themed_blog[:100]}..."}]
+    }
+
+async def twitter_thread_node(state: WorkflowState) -> Dict[str, Any]:
     """Generate Twitter thread content"""
     blog_content = state.get("themed_blog") or state.get("blog_content", "")
     
@@ -107,17 +301,26 @@ def twitter_thread_node(state: WorkflowState) -> Dict[str, Any]:
     - Number each tweet (1/5, 2/5, etc.)
     """
     
-    response = llm.invoke([HumanMessage(content=prompt)])
-    twitter_thread = response.content
+    twitter_thread = await _invoke_llm("twitter_thread", prompt)
     
     return {
         "twitter_thread": twitter_thread,
         "current_node": "hashnode_post",
         "workflow_status": "twitter_thread_created",
-        "messages": state["messages"] + [{"role": "assistant", "content": f"Twitter thread created: {twitter_thread[:100]}..."}]
+        "messages": [{"role": "assistant", "content": f"Twitter thread created: {twitter_thread[:100]}..."}]
     }
 
-def hashnode_post_node(state: WorkflowState) -> Dict[str, Any]:
+def _publishable_tags(tags: list) -> List[str]:
+    """Create tags list (ensure they're strings and not too long)"""
+    processed_tags = []
+    for tag in tags:
+        if isinstance(tag, str) and len(tag) <= 20:
+            processed_tags.append(tag)
+
+    # Add default tag if none provided
+    return processed_tags or ["blog"]
+
+async def hashnode_post_node(state: WorkflowState) -> Dict[str, Any]:
     """Prepare Hashnode post data and pause for human approval"""
     blog_content = state.get("themed_blog") or state.get("blog_content", "")
     topic = state.get("topic", "")
@@ -134,15 +337,28 @@ def hashnode_post_node(state: WorkflowState) -> Dict[str, Any]:
         "tags": [topic.lower().replace(' ', '-')] if topic else ["blog"],
         "subdomain": "your-subdomain"
     }
+
+    if settings.HASHNODE_SPECULATIVE_DRAFT:
+        # Create the draft now, so approval only has to publish it
+        try:
+            draft_result = await hashnode_service.create_post(
+                title=title,
+                content=blog_content,
+                tags=_publishable_tags(hashnode_post["tags"])
+            )
+            hashnode_post["draft_id"] = draft_result.get("draft_id")
+            hashnode_post["speculative_draft"] = True
+        except Exception as e:
+            print(f"Speculative Hashnode draft failed, it will be created on approval: {e}")
     
     return {
         "hashnode_post": hashnode_post,
         "current_node": "hashnode_post",  # Stay at this node
         "workflow_status": "waiting_hashnode_approval",  # Indicate waiting
-        "messages": state["messages"] + [{"role": "assistant", "content": f"Hashnode post prepared: {title}. Waiting for approval."}]
+        "messages": [{"role": "assistant", "content": f"Hashnode post prepared: {title}. Waiting for approval."}]
     }
 
-def twitter_post_node(state: WorkflowState) -> Dict[str, Any]:
+async def twitter_post_node(state: WorkflowState) -> Dict[str, Any]:
     """Prepare Twitter post data and pause for human approval"""
     twitter_thread = state.get("twitter_thread", "")
     
@@ -155,10 +371,76 @@ def twitter_post_node(state: WorkflowState) -> Dict[str, Any]:
         "twitter_post": twitter_post,
         "current_node": "twitter_post",  # Stay at this node
         "workflow_status": "waiting_twitter_approval",  # Indicate waiting
-        "messages": state["messages"] + [{"role": "assistant", "content": "Twitter post prepared. Waiting for approval."}]
+        "messages": [{"role": "assistant", "content": "Twitter post prepared. Waiting for approval."}]
     }
 
-def publish_hashnode_node(state: WorkflowState) -> Dict[str, Any]:
+APPROVE_INPUTS = ["yes", "approve"]
+REJECT_INPUTS = ["no", "reject"]
+
+def _await_decision(request: Dict[str, Any]) -> str:
+    """Pause for an approval decision, pausing again until it is a valid one.
+
+    Ending the run on unrecognised input would leave the thread with neither a
+    pending interrupt nor a final status, so it could never be resumed.
+    """
+    decision = interrupt(request)
+    while str(decision).lower() not in APPROVE_INPUTS + REJECT_INPUTS:
+        decision = interrupt({
+            **request,
+            "error": f"Invalid decision {decision!r}; answer one of {APPROVE_INPUTS + REJECT_INPUTS}"
+        })
+    return decision
+
+async def await_hashnode_approval_node(state: WorkflowState) -> Dict[str, Any]:
+    """Suspend the run until a reviewer approves or rejects the Hashnode post"""
+    hashnode_post = state.get("hashnode_post") or {}
+
+    # interrupt() checkpoints the thread here; the resume value supplied through
+    # Command(resume=...) is returned when the run continues from this node.
+    decision = _await_decision({
+        "type": "hashnode_approval",
+        "title": hashnode_post.get("title")
+    })
+
+    update = {
+        "hashnode_approval": decision,
+        "human_input": decision
+    }
+    if str(decision).lower() in REJECT_INPUTS:
+        draft_id = hashnode_post.get("draft_id") if hashnode_post.get("speculative_draft") else None
+        if draft_id:
+            # The speculative draft will never be published
+            try:
+                await hashnode_service.delete_draft(draft_id)
+                update["hashnode_post"] = {**hashnode_post, "draft_id": None, "speculative_draft": False}
+            except Exception as e:
+                print(f"Failed to delete speculative draft {draft_id}: {e}")
+        update.update({
+            "workflow_status": "hashnode_rejected",
+            "messages": [{"role": "system", "content": "Hashnode post rejected"}]
+        })
+    return update
+
+async def await_twitter_approval_node(state: WorkflowState) -> Dict[str, Any]:
+    """Suspend the run until a reviewer approves or rejects the Twitter thread"""
+    decision = _await_decision({
+        "type": "twitter_approval",
+        "content": (state.get("twitter_post") or {}).get("content")
+    })
+
+    update = {
+        "twitter_approval": decision,
+        "human_input": decision
+    }
+    if str(decision).lower() in REJECT_INPUTS:
+        update.update({
+            "current_node": "end",
+            "workflow_status": "twitter_rejected",
+            "messages": [{"role": "system", "content": "Twitter thread rejected"}]
+        })
+    return update
+
+async def publish_hashnode_node(state: WorkflowState) -> Dict[str, Any]:
     """Publish to Hashnode using real API"""
     hashnode_post = state.get("hashnode_post", {})
     
@@ -175,38 +457,26 @@ def publish_hashnode_node(state: WorkflowState) -> Dict[str, Any]:
         if not content:
             raise ValueError("Blog content is empty")
         
-        # Create tags list (ensure they're strings and not too long)
-        processed_tags = []
-        for tag in tags:
-            if isinstance(tag, str) and len(tag) <= 20:
-                processed_tags.append(tag)
-        
-        # Add default tag if none provided
-        if not processed_tags:
-            processed_tags = ["blog"]
-        
-        # First create a draft
-        print(f"Creating draft for title: {title}")
-        draft_result = hashnode_service.create_post(
-            title=title,
-            content=content,
-            tags=processed_tags
-        )
+        processed_tags = _publishable_tags(tags)
 
-        print(f"Draft creation result: {draft_result}")
+        # A draft created while waiting for approval only needs publishing
+        publish_result = None
+        draft_id = hashnode_post.get("draft_id") if hashnode_post.get("speculative_draft") else None
+        if draft_id:
+            print(f"Publishing speculative draft with ID: {draft_id}")
+            try:
+                publish_result = {**await hashnode_service.publish_draft(draft_id), "draft_id": draft_id}
+            except HashnodeAPIError as e:
+                print(f"Speculative draft {draft_id} could not be published, publishing from scratch: {e}")
 
-        if not draft_result.get("success"):
-            raise Exception(f"Failed to create draft: {draft_result.get('message', 'Unknown error')}")
-
-        draft_id = draft_result.get("draft_id")
-        print(f"Draft ID received: {draft_id}")
-
-        if not draft_id:
-            raise Exception("Draft ID not returned from Hashnode")
-
-        # Then publish the draft
-        print(f"Publishing draft with ID: {draft_id}")
-        publish_result = hashnode_service.publish_draft(draft_id)
+        if publish_result is None:
+            # Publish directly, or through a draft (see HASHNODE_PUBLISH_MODE)
+            print(f"Publishing post with title: {title}")
+            publish_result = await hashnode_service.publish(
+                title=title,
+                content=content,
+                tags=processed_tags
+            )
         print(f"Publish result: {publish_result}")
         
         if not publish_result.get("success"):
@@ -221,14 +491,14 @@ def publish_hashnode_node(state: WorkflowState) -> Dict[str, Any]:
             "slug": publish_result.get("post", {}).get("slug"),
             "success": publish_result.get("success", False),
             "message": publish_result.get("message", "Post published successfully"),
-            "draft_id": draft_id
+            "draft_id": publish_result.get("draft_id")
         }
         
         return {
             "hashnode_post": published_post,
             "current_node": "twitter_post",
             "workflow_status": "hashnode_published",
-            "messages": state["messages"] + [
+            "messages": [
                 {
                     "role": "assistant", 
                     "content": f"Published on Hashnode: {published_post.get('url', 'URL not available')}"
@@ -250,7 +520,7 @@ def publish_hashnode_node(state: WorkflowState) -> Dict[str, Any]:
             },
             "current_node": "twitter_post",  # Continue to next step even if failed
             "workflow_status": "hashnode_failed",
-            "messages": state["messages"] + [
+            "messages": [
                 {
                     "role": "system", 
                     "content": error_message
@@ -258,48 +528,77 @@ def publish_hashnode_node(state: WorkflowState) -> Dict[str, Any]:
             ]
         }
 
-def publish_twitter_node(state: WorkflowState) -> Dict[str, Any]:
-    """Publish to Twitter using real API"""
-    from ..services.twitter_service import TwitterService
+# Run config key: stop at a rate-limited tweet (TweetRateLimitedError) instead
+# of waiting for a token, so the caller can park the run and free its worker
+CONFIG_KEY_PARK_RATE_LIMITED = "park_rate_limited"
+
+def _parks_rate_limited() -> bool:
+    try:
+        return bool(get_config()["configurable"].get(CONFIG_KEY_PARK_RATE_LIMITED))
+    except RuntimeError:
+        return False  # Called outside a graph run
+
+async def publish_twitter_node(state: WorkflowState) -> Dict[str, Any]:
+    """Post the next tweet of the approved thread.
 
+    One tweet per step: the graph loops back here until the thread is done, so
+    every posted tweet id (with its idempotency key) is checkpointed as soon as
+    it exists. A retry after a failure resumes replying from the last recorded
+    tweet instead of reposting the thread. In runs that park rate-limited
+    tweets, TweetRateLimitedError ends the run with the thread still on the
+    tweet it could not post yet.
+    """
     twitter_post = state.get("twitter_post", {})
 
     if not isinstance(twitter_post, dict):
         raise ValueError("Twitter post data is invalid")
 
+    posted = list(twitter_post.get("tweets") or [])
     try:
-        # Initialize Twitter service
-        twitter_service = TwitterService()
-
         # Get the thread content
         thread_content = twitter_post.get("content", "")
         if not thread_content:
             raise ValueError("No content found for Twitter post")
 
-        print(f"Publishing Twitter thread...")
-        print(f"Thread content: {thread_content[:200]}...")
+        tweets = twitter_service.thread_tweets(thread_content)
+        if not tweets:
+            raise ValueError("No valid tweets found in thread content")
 
-        # Post the thread
-        publish_result = twitter_service.post_thread(thread_content)
+        done = {tweet.get("key") for tweet in posted}
+        remaining = [tweet for tweet in tweets if tweet["key"] not in done]
+        if remaining:
+            tweet = remaining[0]
+            print(f"Posting tweet {len(tweets) - len(remaining) + 1}/{len(tweets)}: {tweet['text'][:50]}...")
+            reply_to_id = posted[-1]["id"] if posted else None
+            posted_tweet = await twitter_service.post_thread_tweet(
+                tweet["text"], reply_to_id, wait=not _parks_rate_limited()
+            )
+            posted.append({"key": tweet["key"], **posted_tweet})
 
-        if not publish_result.get("success"):
-            raise Exception(f"Failed to publish Twitter thread: {publish_result.get('message', 'Unknown error')}")
+        if len(remaining) > 1:
+            return {
+                "twitter_post": {**twitter_post, "tweets": posted, "error": None},
+                "current_node": "publish_twitter",
+                "workflow_status": "publishing_twitter",
+                "messages": [{"role": "assistant", "content": f"Posted tweet {len(posted)}/{len(tweets)}"}]
+            }
 
         # Update the twitter_post with real data
         published_post = {
             **twitter_post,
             "published_at": datetime.now().isoformat(),
-            "tweets": publish_result.get("tweets", []),
-            "thread_url": publish_result.get("thread_url"),
-            "success": publish_result.get("success", False),
-            "message": publish_result.get("message", "Thread published successfully")
+            "tweets": posted,
+            "thread_url": posted[0]["url"],
+            "success": True,
+            "error": None,
+            "message": f"Successfully posted {len(posted)} tweets"
         }
 
         return {
             "twitter_post": published_post,
             "current_node": "end",
             "workflow_status": "completed",
-            "messages": state["messages"] + [
+            "messages": [
                 {
                     "role": "assistant",
                     "content": f"Published Twitter thread: {published_post.get('thread_url', 'URL not available')}"
@@ -307,24 +606,30 @@ def publish_twitter_node(state: WorkflowState) -> Dict[str, Any]:
             ]
         }
 
+    except TweetRateLimitedError:
+        # Parked by the caller (see _parks_rate_limited); not a failure
+        raise
     except Exception as e:
-        # Log the error and return error state
+        # Log the error and return error state; the tweets posted so far stay
+        # recorded so a retry continues from the last of them
         error_message = f"Failed to publish on Twitter: {str(e)}"
         print(error_message)
 
         return {
             "twitter_post": {
                 **twitter_post,
+                "tweets": posted,
+                "thread_url": posted[0]["url"] if posted else None,
                 "error": error_message,
                 "published_at": datetime.now().isoformat(),
                 "success": False
             },
             "current_node": "end",  # End workflow even if failed
             "workflow_status": "twitter_failed",
-            "messages": state["messages"] + [
+            "messages": [
                 {
                     "role": "system",
                     "content": error_message
                 }
             ]
-        }
\ No newline at end of file
+        }
@@ -1,9 +1,22 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.mongodb import MongoDBSaver
 from langgraph.graph.message import add_messages
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from .nodes import *
 from ..schemas.workflow_state import WorkflowState
+from ..core.config import settings
+import hashlib
+import json
+import threading
+
+# Compiled graphs keyed by (graph definition hash, id(checkpointer)).
+# The checkpointer itself is kept in the value so a recycled id() never matches.
+_compiled_workflows: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+_workflow_graph: Optional[StateGraph] = None
+_workflow_graph_hash: Optional[str] = None
+_registry_lock = threading.Lock()
+
+DURABILITY_MODES = ["every-step", "at-interrupt", "at-exit"]
 
 def create_workflow_graph():
     """Create the N8N workflow graph"""
@@ -11,17 +24,28 @@ def create_workflow_graph():
     # Create the state graph
     workflow = StateGraph(WorkflowState)
     
-    # Add nodes (REMOVE the human approval nodes)
+    # Add nodes
     workflow.add_node("start", start_node)
     workflow.add_node("generate_blog", generate_blog_node)
+    workflow.add_node("generate_themed_blog", generate_themed_blog_node)
     workflow.add_node("apply_theme", apply_theme_node)
     workflow.add_node("twitter_thread", twitter_thread_node)
     workflow.add_node("hashnode_post", hashnode_post_node)
+    workflow.add_node("await_hashnode_approval", await_hashnode_approval_node)
     workflow.add_node("twitter_post", twitter_post_node)
+    workflow.add_node("await_twitter_approval", await_twitter_approval_node)
     workflow.add_node("publish_hashnode", publish_hashnode_node)
     workflow.add_node("publish_twitter", publish_twitter_node)
     
     # Define conditional edges
+    def should_generate_themed(state: Dict[str, Any]) -> str:
+        """Decide whether to write the themed blog in one call (fused generation)
+        or draft the plain blog first and theme it afterwards"""
+        fused = settings.WORKFLOW_THEME_GENERATION == "fused"
+        if fused and state.get("theme") and not state.get("include_plain_draft"):
+            return "generate_themed_blog"
+        return "generate_blog"
+
     def should_continue_to_theme(state: Dict[str, Any]) -> str:
         """Decide whether to apply theme or skip to Twitter thread"""
         theme = state.get("theme")
@@ -29,13 +53,7 @@ def create_workflow_graph():
     
     def should_publish_hashnode(state: Dict[str, Any]) -> str:
         """Decide whether to publish on Hashnode based on human input"""
-        hashnode_approval = state.get("hashnode_approval")
-
-        if hashnode_approval is None:
-            # PAUSE the workflow here - don't route anywhere
-            return END  # End the workflow until human input is provided
-
-        hashnode_approval = str(hashnode_approval).lower()
+        hashnode_approval = str(state.get("hashnode_approval")).lower()
         if hashnode_approval in ["yes", "approve"]:
             return "publish_hashnode"
         elif hashnode_approval in ["no", "reject"]:
@@ -45,34 +63,113 @@ def create_workflow_graph():
     
     def should_publish_twitter(state: Dict[str, Any]) -> str:
         """Decide whether to publish on Twitter based on human input"""
-        twitter_approval = state.get("twitter_approval")
-
-        if twitter_approval is None:
-            # PAUSE the workflow here - don't route anywhere
-            return END  # End the workflow until human input is provided
-
-        twitter_approval = str(twitter_approval).lower()
+        twitter_approval = str(state.get("twitter_approval")).lower()
         if twitter_approval in ["yes", "approve"]:
             return "publish_twitter"
         elif twitter_approval in ["no", "reject"]:
             return END
         else:
             return END  # End the workflow for invalid input
-    
-    # Add edges - LINEAR FLOW with pauses
+
+    def should_post_next_tweet(state: Dict[str, Any]) -> str:
+        """Loop publish_twitter once per tweet until the thread is posted or fails"""
+        if state.get("workflow_status") == "publishing_twitter":
+            return "publish_twitter"
+        return END
+
+    # Add edges - LINEAR FLOW, the await_* nodes suspend the run via interrupt()
     workflow.add_edge(START, "start")
-    workflow.add_edge("start", "generate_blog")
+    workflow.add_conditional_edges("start", should_generate_themed)
     workflow.add_conditional_edges("generate_blog", should_continue_to_theme)
+    workflow.add_edge("generate_themed_blog", "twitter_thread")
     workflow.add_edge("apply_theme", "twitter_thread")
     workflow.add_edge("twitter_thread", "hashnode_post")
-    workflow.add_conditional_edges("hashnode_post", should_publish_hashnode)
+    workflow.add_edge("hashnode_post", "await_hashnode_approval")
+    workflow.add_conditional_edges("await_hashnode_approval", should_publish_hashnode)
     workflow.add_edge("publish_hashnode", "twitter_post")
-    workflow.add_conditional_edges("twitter_post", should_publish_twitter)
-    workflow.add_edge("publish_twitter", END)
+    workflow.add_edge("twitter_post", "await_twitter_approval")
+    workflow.add_conditional_edges("await_twitter_approval", should_publish_twitter)
+    workflow.add_conditional_edges("publish_twitter", should_post_next_tweet)
     
     return workflow
 
-def compile_workflow_with_checkpointer(checkpointer):
-    """Compile the workflow with MongoDB checkpointer"""
-    workflow = create_workflow_graph()
-    return workflow.compile(checkpointer=checkpointer) 
\ No newline at end of file
+def _callable_fingerprint(runnable) -> str:
+    """Identify a node/router callable by name and bytecode"""
+    func = getattr(runnable, "afunc", None) or getattr(runnable, "func", None) or runnable
+    code = getattr(func, "__code__", None)
+    code_hash = hashlib.sha256(code.co_code).hexdigest()[:16] if code else ""
+    return f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}:{code_hash}"
+
+def get_graph_definition_hash(workflow: StateGraph) -> str:
+    """Hash the structure of a graph definition (nodes, edges and routers)"""
+    definition = {
+        "nodes": {name: _callable_fingerprint(spec.runnable) for name, spec in workflow.nodes.items()},
+        "edges": sorted(list(edge) for edge in workflow.edges),
+        "branches": {
+            source: {name: _callable_fingerprint(branch.path) for name, branch in branches.items()}
+            for source, branches in workflow.branches.items()
+        }
+    }
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+def _get_workflow_graph() -> Tuple[StateGraph, str]:
+    """Build the graph definition once per process"""
+    global _workflow_graph, _workflow_graph_hash
+    if _workflow_graph is None:
+        _workflow_graph = create_workflow_graph()
+        _workflow_graph_hash = get_graph_definition_hash(_workflow_graph)
+    return _workflow_graph, _workflow_graph_hash
+
+def compile_workflow_with_checkpointer(checkpointer, durability: Optional[str] = None):
+    """Return the compiled workflow for this checkpointer, compiling it on first use.
+
+    The durability mode only changes how a run is invoked (see
+    checkpoint_during), so it is validated here but shares the compiled graph.
+    """
+    durability = durability or settings.WORKFLOW_DURABILITY
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {durability}")
+
+    with _registry_lock:
+        workflow, definition_hash = _get_workflow_graph()
+        key = (definition_hash, id(checkpointer))
+
+        cached = _compiled_workflows.get(key)
+        if cached is not None and cached[0] is checkpointer:
+            return cached[1]
+
+        compiled = workflow.compile(checkpointer=checkpointer)
+        _compiled_workflows[key] = (checkpointer, compiled)
+        return compiled
+
+def checkpoint_during(durability: Optional[str] = None) -> Optional[bool]:
+    """checkpoint_during= argument of astream/ainvoke for a durability mode.
+
+    every-step:   checkpoint after every node (LangGraph's default)
+    at-interrupt: keep intermediate state in memory and checkpoint only when a
+                  run pauses for approval or finishes
+    at-exit:      checkpoint every step, but the caller buffers the writes and
+                  flushes them when the run exits (WorkflowService._run_graph)
+    """
+    durability = durability or settings.WORKFLOW_DURABILITY
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {durability}")
+    return False if durability == "at-interrupt" else None
+
+def invalidate_compiled_workflows(checkpointer=None):
+    """Drop cached compiled graphs, for one checkpointer or all of them.
+
+    Invalidating everything also discards the cached graph definition so the
+    next compile picks up a changed create_workflow_graph().
+    """
+    global _workflow_graph, _workflow_graph_hash
+    with _registry_lock:
+        if checkpointer is None:
+            _compiled_workflows.clear()
+            _workflow_graph = None
+            _workflow_graph_hash = None
+            return
+
+        for key, (cached_checkpointer, _) in list(_compiled_workflows.items()):
+            if cached_checkpointer is checkpointer:
+                del _compiled_workflows[key]
\ No newline at end of file
@@ -139,11 +139,11 @@ export default function StatusPanel({ status, workflow }) {
 
           {activeTab === 'content' && (
             <div className="space-y-4">
-              {channelValues.blog_content && (
+              {(channelValues.blog_content || channelValues.themed_blog) && (
                 <div>
                   <h4 className="font-medium text-gray-900 mb-2">Generated Blog Content</h4>
                   <div className="bg-gray-50 p-3 rounded-lg text-sm text-gray-700 max-h-40 overflow-y-auto">
-                    {channelValues.blog_content.substring(0, 500)}...
+                    {(channelValues.blog_content || channelValues.themed_blog).substring(0, 500)}...
                   </div>
                 </div>
               )}
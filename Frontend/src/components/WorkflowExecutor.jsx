@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import {
   X,
   Play,
@@ -10,6 +10,7 @@ import {
 import axios from 'axios';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const TERMINAL_STATUSES = ['completed', 'failed', 'twitter_failed', 'twitter_rejected'];
 
 export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
   const [isVisible, setIsVisible] = useState(false);
@@ -17,6 +18,7 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
   const [theme, setTheme] = useState('');
   const [isExecuting, setIsExecuting] = useState(false);
   const [currentThreadId, setCurrentThreadId] = useState(null);
+  const eventSourceRef = useRef(null);
 
   // Show panel when workflow is ready to execute
   useEffect(() => {
@@ -25,6 +27,11 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
     }
   }, [workflow, status]);
 
+  // Close the event stream when the executor unmounts
+  useEffect(() => {
+    return () => eventSourceRef.current?.close();
+  }, []);
+
   const startWorkflow = async () => {
     if (!topic.trim()) {
       alert('Please enter a topic for your content');
@@ -37,14 +44,16 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
       const response = await axios.post(`${API_BASE_URL}/workflows/start`, {
         user_id: 'frontend_user',
         topic: topic.trim(),
-        theme: theme.trim() || null
+        theme: theme.trim() || null,
+        background: true
       });
 
       const threadId = response.data.thread_id;
       setCurrentThreadId(threadId);
+      onStatusChange(response.data);
       
-      // Start polling for status
-      pollWorkflowStatus(threadId);
+      // Follow status transitions pushed by the server
+      followWorkflowEvents(threadId);
       
       setIsVisible(false);
     } catch (error) {
@@ -54,13 +63,55 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
     }
   };
 
+  // /status is a small projection; the full state is only loaded from /state
+  // when there is content to review or show
+  const updateStatus = async (threadId, data) => {
+    onStatusChange(data);
+    if (!data.requires_human_input && !TERMINAL_STATUSES.includes(data.status)) return;
+
+    try {
+      const response = await axios.get(`${API_BASE_URL}/workflows/${threadId}/state`);
+      onStatusChange({ ...data, state: response.data });
+    } catch (error) {
+      console.error('Failed to get workflow state:', error);
+    }
+  };
+
+  const followWorkflowEvents = (threadId) => {
+    if (eventSourceRef.current) return;
+
+    // EventSource reconnects on its own and resumes with Last-Event-ID
+    const source = new EventSource(`${API_BASE_URL}/workflows/${threadId}/events`);
+    eventSourceRef.current = source;
+
+    source.addEventListener('status', (event) => {
+      const data = JSON.parse(event.data);
+      if (TERMINAL_STATUSES.includes(data.status)) {
+        source.close();
+        eventSourceRef.current = null;
+        // One full read for the published links
+        pollWorkflowStatus(threadId);
+      } else {
+        updateStatus(threadId, data);
+      }
+    });
+
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        // Streaming unavailable, fall back to polling
+        eventSourceRef.current = null;
+        pollWorkflowStatus(threadId);
+      }
+    };
+  };
+
   const pollWorkflowStatus = async (threadId) => {
     try {
       const response = await axios.get(`${API_BASE_URL}/workflows/${threadId}/status`);
-      onStatusChange(response.data);
+      await updateStatus(threadId, response.data);
 
       // Continue polling if workflow is still running
-      if (response.data.status && !['completed', 'failed'].includes(response.data.status)) {
+      if (response.data.status && !TERMINAL_STATUSES.includes(response.data.status)) {
         setTimeout(() => pollWorkflowStatus(threadId), 2000);
       } else {
         setIsExecuting(false);
@@ -76,7 +127,7 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
     
     try {
       await axios.post(`${API_BASE_URL}/workflows/${currentThreadId}/approve/hashnode`);
-      pollWorkflowStatus(currentThreadId);
+      followWorkflowEvents(currentThreadId);
     } catch (error) {
       console.error('Failed to approve Hashnode:', error);
     }
@@ -87,7 +138,7 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
     
     try {
       await axios.post(`${API_BASE_URL}/workflows/${currentThreadId}/approve/twitter`);
-      pollWorkflowStatus(currentThreadId);
+      followWorkflowEvents(currentThreadId);
     } catch (error) {
       console.error('Failed to approve Twitter:', error);
     }
@@ -98,7 +149,7 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
     
     try {
       await axios.post(`${API_BASE_URL}/workflows/${currentThreadId}/reject/hashnode`);
-      pollWorkflowStatus(currentThreadId);
+      followWorkflowEvents(currentThreadId);
     } catch (error) {
       console.error('Failed to reject Hashnode:', error);
     }
@@ -109,7 +160,7 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
     
     try {
       await axios.post(`${API_BASE_URL}/workflows/${currentThreadId}/reject/twitter`);
-      pollWorkflowStatus(currentThreadId);
+      followWorkflowEvents(currentThreadId);
     } catch (error) {
       console.error('Failed to reject Twitter:', error);
     }
@@ -238,13 +289,13 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
             )}
 
             {/* Results */}
-            {status?.status === 'completed' && status?.state?.channel_values && (
+            {status?.status === 'completed' && status?.results && (
               <div className="space-y-2 text-sm">
-                {status.state.channel_values.hashnode_post?.url && (
+                {status.results.hashnode_url && (
                   <div>
                     <span className="font-medium">Hashnode: </span>
                     <a 
-                      href={status.state.channel_values.hashnode_post.url}
+                      href={status.results.hashnode_url}
                       target="_blank"
                       rel="noopener noreferrer"
                       className="text-blue-600 hover:underline"
@@ -253,11 +304,11 @@ export default function WorkflowExecutor({ workflow, status, onStatusChange }) {
                     </a>
                   </div>
                 )}
-                {status.state.channel_values.twitter_post?.thread_url && (
+                {status.results.twitter_thread_url && (
                   <div>
                     <span className="font-medium">Twitter: </span>
                     <a 
-                      href={status.state.channel_values.twitter_post.thread_url}
+                      href={status.results.twitter_thread_url}
                       target="_blank"
                       rel="noopener noreferrer"
                       className="text-blue-600 hover:underline"
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MongoDB write operations per workflow for each checkpoint
+durability mode (every-step, at-interrupt, at-exit)
+
+Needs a running MongoDB (MONGODB_URL, e.g. the docker-compose one); a
+throwaway database is created and dropped.
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.core.checkpointer import BlobOffloadingMongoDBSaver
+from app.core.config import settings
+from app.schemas.workflow_state import WorkflowRequest, HumanInputRequest
+from app.services.workflow_service import WorkflowService
+from app.workflows import nodes
+from app.workflows.workflow_graph import DURABILITY_MODES
+from fake_services import FakeHashnodeService, FixedLLM
+
+WORKFLOWS = 5
+WRITE_COMMANDS = {"insert", "update", "delete", "findAndModify"}
+
+
+class WriteCounter(monitoring.CommandListener):
+    """Counts write commands (one per round trip, however many documents it carries)"""
+
+    def __init__(self):
+        self.commands = 0
+
+    def started(self, event):
+        if event.command_name in WRITE_COMMANDS:
+            self.commands += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def run_workflow(service: WorkflowService):
+    """Start a themed workflow and approve both publishing steps"""
+    started = await service.start_workflow(
+        WorkflowRequest(user_id="bench_user", topic="Durability", theme="Space exploration")
+    )
+    for _ in range(2):
+        await service.provide_human_input(
+            HumanInputRequest(thread_id=started["thread_id"], user_input="yes", action="approve")
+        )
+
+
+async def measure(mode: str, counter: WriteCounter, client) -> float:
+    """Average write commands per workflow in the given durability mode"""
+    db_name = f"durability_bench_{uuid.uuid4().hex[:8]}"
+    checkpointer = BlobOffloadingMongoDBSaver(
+        client,
+        db_name=db_name,
+        checkpoint_collection_name="checkpoints",
+        writes_collection_name="checkpoint_writes",
+        blob_min_bytes=settings.CHECKPOINT_BLOB_MIN_BYTES
+    )
+    service = WorkflowService(checkpointer, durability=mode)
+    try:
+        await run_workflow(service)  # Warm-up creates the indexes
+        before = counter.commands
+        for _ in range(WORKFLOWS):
+            await run_workflow(service)
+        return (counter.commands - before) / WORKFLOWS
+    finally:
+        await client.drop_database(db_name)
+
+
+async def run_benchmark():
+    nodes.llm = FixedLLM("# Generated title\n\n" + "Generated content. " * 200)
+    nodes.hashnode_service = FakeHashnodeService()
+    counter = WriteCounter()
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL", settings.MONGODB_URL), event_listeners=[counter])
+    try:
+        return {mode: await measure(mode, counter, client) for mode in DURABILITY_MODES}
+    finally:
+        client.close()
+
+
+def main():
+    """Main benchmark function"""
+    print("=== Benchmarking Checkpoint Writes Per Workflow ===")
+    results = asyncio.run(run_benchmark())
+    print(f"Workflows per mode: {WORKFLOWS} (start + 2 approvals each)")
+    for mode, writes in results.items():
+        print(f"{mode:>12}: {writes:6.1f} write commands per workflow")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wall time and token usage of themed blog generation, sequential
+(generate_blog then apply_theme) versus fused (generate_themed_blog)
+
+Uses a simulated model whose latency grows with input and output tokens; pass
+--live to call the configured OpenAI model instead (needs OPENAI_API_KEY).
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.config import settings
+from app.services.llm_cache import LLMCache
+from app.workflows import nodes
+from app.workflows.workflow_graph import create_workflow_graph
+
+RUNS = 3
+INPUT_SECONDS_PER_TOKEN = 0.00005
+OUTPUT_SECONDS_PER_TOKEN = 0.002
+
+
+def count_tokens(text):
+    """Rough token count (about 0.75 words per token)"""
+    return int(len(text.split()) / 0.75)
+
+
+class SimulatedLLM:
+    """Returns an ~1000 word blog for blog prompts and a short thread otherwise"""
+
+    async def ainvoke(self, messages):
+        prompt = messages[0].content
+        words = 150 if "Twitter thread" in prompt else 1000
+        content = "# Simulated title\n\n" + "word " * words
+        input_tokens, output_tokens = count_tokens(prompt), count_tokens(content)
+        await asyncio.sleep(input_tokens * INPUT_SECONDS_PER_TOKEN + output_tokens * OUTPUT_SECONDS_PER_TOKEN)
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        })
+
+
+class TokenMeter:
+    """Wraps the model and sums the usage metadata of its responses"""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    async def ainvoke(self, messages):
+        response = await self.llm.ainvoke(messages)
+        usage = response.usage_metadata or {}
+        self.calls += 1
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        return response
+
+
+async def measure(mode, llm):
+    """Average seconds, LLM calls and tokens to reach the Hashnode approval"""
+    settings.WORKFLOW_THEME_GENERATION = mode
+    meter = nodes.llm = TokenMeter(llm)
+    workflow = create_workflow_graph().compile(checkpointer=InMemorySaver())
+
+    start = time.perf_counter()
+    for i in range(RUNS):
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        await workflow.ainvoke({
+            "messages": [],
+            "user_id": "bench_user",
+            "topic": f"Distributed tracing {i}",
+            "theme": "Space exploration",
+            "workflow_status": "initialized",
+            "current_node": "start"
+        }, config)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed / RUNS,
+        "calls": meter.calls / RUNS,
+        "input_tokens": meter.input_tokens / RUNS,
+        "output_tokens": meter.output_tokens / RUNS
+    }
+
+
+async def run_benchmark(live):
+    llm = nodes.llm if live else SimulatedLLM()
+    nodes.llm_cache = LLMCache(backend="off")
+    return {mode: await measure(mode, llm) for mode in ["sequential", "fused"]}
+
+
+def main():
+    """Main benchmark function"""
+    live = "--live" in sys.argv
+    print("=== Benchmarking Themed Blog Generation ===")
+    results = asyncio.run(run_benchmark(live))
+    print(f"Model: {'live OpenAI' if live else 'simulated'}, runs per mode: {RUNS} (start to Hashnode approval)")
+    for mode, result in results.items():
+        print(f"{mode:>10}: {result['seconds']:6.2f} s, {result['calls']:.0f} LLM calls, "
+              f"{result['input_tokens']:7.0f} input + {result['output_tokens']:7.0f} output tokens")
+    sequential, fused = results["sequential"], results["fused"]
+    print(f"Fused saves {1 - fused['seconds'] / sequential['seconds']:.0%} wall time and "
+          f"{1 - (fused['input_tokens'] + fused['output_tokens']) / (sequential['input_tokens'] + sequential['output_tokens']):.0%} tokens")
+
+
+if __name__ == "__main__":
+    main()
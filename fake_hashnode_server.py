@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Local fake of the Hashnode GraphQL API (gql.hashnode.com) for tests and
+benchmarks. Every request is recorded with the operations it carried and the
+client port it arrived on, so tests can count round trips and connections.
+
+    async with FakeHashnodeServer() as server:
+        service = HashnodeService(base_url=server.url)
+"""
+
+import asyncio
+import re
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+OPERATIONS = ["me", "createDraft", "publishDraft", "publishPost", "removeDraft"]
+# `alias: operation(input: $variable)`, alias and input both optional
+OPERATION_PATTERN = re.compile(
+    r"(?:\b(\w+)\s*:\s*)?\b(" + "|".join(OPERATIONS) + r")\b\s*(?:\(\s*input\s*:\s*\$(\w+)\s*\))?\s*\{"
+)
+
+
+class FakeHashnodeServer:
+    def __init__(self, fail_operations: Optional[Set[str]] = None, latency: float = 0.0,
+                 timeout_operations: Optional[Set[str]] = None):
+        """Operations listed in fail_operations answer with a GraphQL error; requests
+        with operations in timeout_operations are carried out, then answered with
+        504 Gateway Timeout (as when a proxy gives up on a slow request)"""
+        self.fail_operations = set(fail_operations or [])
+        self.timeout_operations = set(timeout_operations or [])
+        self.latency = latency
+        self.requests: List[Dict[str, Any]] = []  # {"operations": [...], "client_port": int}
+        self.drafts: Dict[str, Dict[str, Any]] = {}
+        self.posts: Dict[str, Dict[str, Any]] = {}
+        self.removed_drafts: List[str] = []
+        self.url = ""
+
+        self.app = FastAPI()
+        self.app.post("/graphql")(self._handle)
+        self.server: Optional[uvicorn.Server] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(config)
+        self.task = asyncio.create_task(self.server.serve())
+        while not self.server.started:
+            await asyncio.sleep(0.01)
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.should_exit = True
+        await self.task
+
+    @property
+    def connections(self) -> int:
+        """Distinct client connections seen so far"""
+        return len({request["client_port"] for request in self.requests})
+
+    def count(self, operation: str) -> int:
+        return sum(request["operations"].count(operation) for request in self.requests)
+
+    def reset(self):
+        self.requests.clear()
+
+    async def _handle(self, request: Request):
+        body = await request.json()
+        variables = body.get("variables") or {}
+        matches = OPERATION_PATTERN.findall(body.get("query", ""))
+        self.requests.append({
+            "operations": [operation for _, operation, _ in matches],
+            "client_port": request.client.port
+        })
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        data: Dict[str, Any] = {}
+        errors = []
+        for alias, operation, variable in matches:
+            try:
+                if operation in self.fail_operations:
+                    raise ValueError(f"{operation} is not available")
+                data[alias or operation] = getattr(self, f"_{operation}")(variables.get(variable) or {})
+            except ValueError as e:
+                errors.append({"message": str(e), "path": [alias or operation]})
+                data[alias or operation] = None
+
+        if self.timeout_operations.intersection(operation for _, operation, _ in matches):
+            return JSONResponse({"message": "Gateway Timeout"}, status_code=504)
+        response: Dict[str, Any] = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def _me(self, _: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": "user_1",
+            "username": "tester",
+            "name": "Test User",
+            "publications": {"edges": [
+                {"node": {"id": "publication_1", "title": "Test Blog", "url": "https://test.example.com"},
+                 "role": "OWNER"}
+            ]}
+        }
+
+    def _createDraft(self, draft_input: Dict[str, Any]) -> Dict[str, Any]:
+        draft = {
+            "id": f"draft_{uuid.uuid4().hex[:8]}",
+            "title": draft_input.get("title"),
+            "slug": (draft_input.get("title") or "draft").lower().replace(" ", "-"),
+            "tags": draft_input.get("tags") or [],
+            "dateUpdated": datetime.utcnow().isoformat(),
+            "contentMarkdown": draft_input.get("contentMarkdown")
+        }
+        self.drafts[draft["id"]] = draft
+        return {"draft": {key: value for key, value in draft.items() if key != "contentMarkdown"}}
+
+    def _publish(self, post_input: Dict[str, Any]) -> Dict[str, Any]:
+        post_id = f"post_{uuid.uuid4().hex[:8]}"
+        slug = (post_input.get("title") or "post").lower().replace(" ", "-")
+        post = {
+            "id": post_id,
+            "title": post_input.get("title"),
+            "slug": slug,
+            "url": f"https://test.example.com/{slug}",
+            "publishedAt": datetime.utcnow().isoformat(),
+            "tags": post_input.get("tags") or []
+        }
+        self.posts[post_id] = post
+        return {"post": post}
+
+    def _publishDraft(self, publish_input: Dict[str, Any]) -> Dict[str, Any]:
+        draft = self.drafts.pop(publish_input.get("draftId"), None)
+        if draft is None:
+            raise ValueError(f"Unknown draft {publish_input.get('draftId')}")
+        return self._publish(draft)
+
+    def _publishPost(self, post_input: Dict[str, Any]) -> Dict[str, Any]:
+        return self._publish(post_input)
+
+    def _removeDraft(self, remove_input: Dict[str, Any]) -> Dict[str, Any]:
+        draft_id = remove_input.get("id")
+        self.drafts.pop(draft_id, None)
+        self.removed_drafts.append(draft_id)
+        return {"draft": {"id": draft_id}}
@@ -0,0 +1,58 @@
+"""
+In-memory MongoDB for the test scripts: mongomock-motor clients, with the two
+pymongo 4.12 call shapes mongomock does not accept yet (create_index(keys=...)
+and the sort argument bulk updates pass along) and the $bsonSize aggregation
+operator, plus Beanie projection setup
+
+Needs the test requirements: pip install -r Backend/requirements-dev.txt
+"""
+
+import bson
+from beanie import init_beanie
+from mongomock import aggregate
+from mongomock.collection import BulkOperationBuilder, Collection
+from mongomock_motor import AsyncMongoMockClient
+
+_create_index = Collection.create_index
+_add_update = BulkOperationBuilder.add_update
+_add_replace = BulkOperationBuilder.add_replace
+_parse = aggregate._Parser.parse
+
+
+def _create_index_compat(self, key_or_list=None, *, keys=None, **kwargs):
+    return _create_index(self, key_or_list if key_or_list is not None else keys, **kwargs)
+
+
+def _add_update_compat(self, *args, sort=None, **kwargs):
+    return _add_update(self, *args, **kwargs)
+
+
+def _add_replace_compat(self, *args, sort=None, **kwargs):
+    return _add_replace(self, *args, **kwargs)
+
+
+def _parse_compat(self, expression):
+    if isinstance(expression, dict) and list(expression) == ["$bsonSize"]:
+        value = self.parse(expression["$bsonSize"])
+        return None if value is None else len(bson.encode(value))
+    return _parse(self, expression)
+
+
+Collection.create_index = _create_index_compat
+BulkOperationBuilder.add_update = _add_update_compat
+BulkOperationBuilder.add_replace = _add_replace_compat
+aggregate._Parser.parse = _parse_compat
+
+
+def mongo_client() -> AsyncMongoMockClient:
+    """A fresh, empty in-memory Mongo client"""
+    return AsyncMongoMockClient()
+
+
+async def init_projections(client=None):
+    """Point the WorkflowExecution projection at an in-memory database"""
+    from app.models.models import WorkflowExecution
+
+    client = client or mongo_client()
+    await init_beanie(database=client["flowforge_test"], document_models=[WorkflowExecution])
+    return client
@@ -0,0 +1,71 @@
+"""
+Stand-ins for the services the workflow nodes use, for the test scripts and
+benchmarks (fake_hashnode_server.py fakes the Hashnode API itself, for tests
+of HashnodeService). patched_nodes() swaps them into app.workflows.nodes and
+puts the real ones back afterwards, whatever the test assigned in between.
+
+    with patched_nodes(llm=FixedLLM(), llm_cache=LLMCache(backend="off")):
+        asyncio.run(run_workflow())
+
+or, for a test that only runs one coroutine:
+
+    run_with_fakes(run_workflow(), llm=FixedLLM(), llm_cache=LLMCache(backend="off"))
+"""
+
+import asyncio
+from contextlib import contextmanager
+
+from langchain_core.messages import AIMessage
+
+GENERATED = "# Generated title\n\nGenerated content"
+
+
+class FixedLLM:
+    """Chat model stand-in that answers every prompt with the same completion"""
+
+    def __init__(self, content: str = GENERATED):
+        self.content = content
+
+    async def ainvoke(self, messages):
+        return AIMessage(content=self.content)
+
+
+class FakeHashnodeService:
+    """Publishes every post as post_1, directly or through draft_1"""
+
+    async def create_post(self, title, content, tags):
+        return {"success": True, "draft_id": "draft_1"}
+
+    async def publish_draft(self, draft_id):
+        return {"success": True, "post": {"id": "post_1", "url": "https://example.com/post", "slug": "post"}}
+
+    async def publish(self, title, content, tags):
+        return {"success": True, "post": {"id": "post_1", "url": "https://example.com/post", "slug": "post"}}
+
+
+# Module-level services of app.workflows.nodes that tests replace
+NODE_SERVICES = ["llm", "llm_cache", "blog_cache", "hashnode_service", "twitter_service"]
+
+
+@contextmanager
+def patched_nodes(**replacements):
+    """Replace node services for the duration of the block and restore all of them on exit"""
+    from app.workflows import nodes
+
+    unknown = set(replacements) - set(NODE_SERVICES)
+    if unknown:
+        raise ValueError(f"Unknown node services: {', '.join(sorted(unknown))}")
+    originals = {name: getattr(nodes, name) for name in NODE_SERVICES}
+    for name, value in replacements.items():
+        setattr(nodes, name, value)
+    try:
+        yield nodes
+    finally:
+        for name, value in originals.items():
+            setattr(nodes, name, value)
+
+
+def run_with_fakes(coroutine, **services):
+    """asyncio.run a coroutine with the given node services patched in"""
+    with patched_nodes(**services):
+        return asyncio.run(coroutine)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Regression test: approving a paused workflow must resume at the pause point
+instead of replaying the graph (and its LLM calls) from START
+"""
+
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from app.workflows import nodes
+from app.workflows.workflow_graph import compile_workflow_with_checkpointer
+from fake_services import FakeHashnodeService, run_with_fakes
+
+
+class CountingLLM:
+    """Stand-in for the OpenAI chat model that counts invocations"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=f"# Generated title\n\nGenerated content #{self.calls}")
+
+
+async def run_workflow_with_approvals():
+    """Run a themed workflow through both approvals and return LLM call counts per phase"""
+    llm = CountingLLM()
+    nodes.llm = llm
+
+    workflow = compile_workflow_with_checkpointer(InMemorySaver())
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    initial_state = {
+        "messages": [],
+        "user_id": "test_user",
+        "topic": "Resumable workflows",
+        "theme": "Space exploration",
+        "workflow_status": "initialized",
+        "current_node": "start"
+    }
+
+    counts = {}
+    result = await workflow.ainvoke(initial_state, config)
+    counts["start"] = llm.calls
+    assert result["workflow_status"] == "waiting_hashnode_approval"
+    assert "__interrupt__" in result
+
+    before = llm.calls
+    result = await workflow.ainvoke(Command(resume="yes"), config)
+    counts["hashnode_approval"] = llm.calls - before
+    assert result["workflow_status"] == "waiting_twitter_approval"
+    assert result["hashnode_post"]["url"] == "https://example.com/post"
+
+    before = llm.calls
+    result = await workflow.ainvoke(Command(resume="yes"), config)
+    counts["twitter_approval"] = llm.calls - before
+    assert result["workflow_status"] == "completed"
+
+    return counts
+
+
+async def run_workflow_with_invalid_decision():
+    """Answer the Hashnode approval with unrecognised input, then approve"""
+    nodes.llm = CountingLLM()
+
+    workflow = compile_workflow_with_checkpointer(InMemorySaver())
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    await workflow.ainvoke({
+        "messages": [],
+        "user_id": "test_user",
+        "topic": "Resumable workflows",
+        "workflow_status": "initialized",
+        "current_node": "start"
+    }, config)
+
+    invalid = await workflow.ainvoke(Command(resume="maybe"), config)
+    snapshot = await workflow.aget_state(config)
+    approved = await workflow.ainvoke(Command(resume="yes"), config)
+    return invalid, snapshot, approved
+
+
+def test_approvals_do_not_rerun_llm_nodes():
+    counts = run_with_fakes(run_workflow_with_approvals(), hashnode_service=FakeHashnodeService())
+
+    # generate_blog, apply_theme and twitter_thread each call the LLM once
+    assert counts["start"] == 3
+    assert counts["hashnode_approval"] == 0
+    assert counts["twitter_approval"] == 0
+
+
+def test_invalid_decision_pauses_again():
+    invalid, snapshot, approved = run_with_fakes(
+        run_workflow_with_invalid_decision(), hashnode_service=FakeHashnodeService()
+    )
+
+    # Still waiting on the same approval, with the rejected input explained
+    assert invalid["workflow_status"] == "waiting_hashnode_approval"
+    interrupts = [i for task in snapshot.tasks for i in task.interrupts]
+    assert len(interrupts) == 1 and "maybe" in interrupts[0].value["error"]
+    assert [task.name for task in snapshot.tasks] == ["await_hashnode_approval"]
+
+    assert approved["workflow_status"] == "waiting_twitter_approval"
+    assert approved["hashnode_approval"] == "yes"
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Approval Resume ===")
+    counts = run_with_fakes(run_workflow_with_approvals(), hashnode_service=FakeHashnodeService())
+    for phase, calls in counts.items():
+        print(f"LLM invocations during {phase}: {calls}")
+    test_approvals_do_not_rerun_llm_nodes()
+    print("✅ Approvals resumed without re-running LLM nodes")
+    test_invalid_decision_pauses_again()
+    print("✅ Invalid approval input paused the thread again")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Batch start test: POST /workflows/start:batch returns thread ids immediately,
+reports invalid items individually and never runs more than
+WORKFLOW_BATCH_CONCURRENCY workflows of a batch at once; queued jobs survive
+a restart because their initial state is checkpointed before they are queued,
+and an item whose checkpoint cannot be written is rejected alone
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import httpx
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.config import settings
+from app.main import app
+from app.models.models import WorkflowExecution
+from app.routers.workflow import get_workflow_service
+from app.services.execution_service import ExecutionService
+from app.services.workflow_runner import WorkflowRunner
+from app.services.workflow_service import WorkflowService
+from app.workflows import nodes
+from fake_mongo import init_projections
+from fake_services import patched_nodes
+
+BATCH_SIZE = 12
+LLM_LATENCY = 0.05
+
+
+class TrackingLLM:
+    """Stand-in for the OpenAI chat model that tracks how many workflows generate at once"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, messages):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(LLM_LATENCY)
+        finally:
+            self.active -= 1
+        return AIMessage(content="# Generated title\n\nGenerated content")
+
+
+async def run_batch():
+    """Submit a batch with one invalid item and wait for the valid ones to pause for approval"""
+    llm = TrackingLLM()
+    nodes.llm = llm
+    runner = WorkflowRunner(workers=8, queue_size=4)
+    await runner.start()
+    service = WorkflowService(InMemorySaver(), runner)
+    app.dependency_overrides[get_workflow_service] = lambda: service
+
+    payload = [{"user_id": "batch_user", "topic": f"Topic {i}"} for i in range(BATCH_SIZE)]
+    payload.insert(3, {"user_id": "batch_user"})  # Missing topic
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/workflows/start:batch", json=payload)
+        assert response.status_code == 200
+        body = response.json()
+
+        thread_ids = [item["thread_id"] for item in body["items"] if item["status"] == "queued"]
+        for _ in range(200):
+            states = [await service.get_workflow_state(thread_id) for thread_id in thread_ids]
+            if all(
+                state and state["channel_values"].get("workflow_status") == "waiting_hashnode_approval"
+                for state in states
+            ):
+                break
+            await asyncio.sleep(0.05)
+        else:
+            raise AssertionError("Batch workflows did not reach the approval step")
+    finally:
+        app.dependency_overrides.pop(get_workflow_service, None)
+        await runner.stop()
+
+    return body, llm.max_active
+
+
+async def run_restart():
+    """Queue a batch, stop the runner before any job starts, then requeue on a new runner"""
+    nodes.llm = TrackingLLM()
+    await init_projections()
+    checkpointer = InMemorySaver()
+    executions = ExecutionService()
+
+    runner = WorkflowRunner(workers=2)
+    await runner.start()
+    service = WorkflowService(checkpointer, runner, executions=executions)
+    body = await service.start_workflow_batch([{"user_id": "batch_user", "topic": f"Topic {i}"} for i in range(4)])
+    await runner.stop()  # "Restart" before a worker picked anything up
+    thread_ids = [item["thread_id"] for item in body["items"]]
+    queued = [(await service.get_workflow_state(thread_id))["channel_values"]["workflow_status"]
+              for thread_id in thread_ids]
+    await executions.create("lost_thread", "batch_user", "Never checkpointed", "queued")
+
+    runner = WorkflowRunner(workers=2)
+    await runner.start()
+    service = WorkflowService(checkpointer, runner, executions=executions)
+    try:
+        requeued = await service.requeue_queued()
+        for _ in range(200):
+            statuses = (await executions.get_wait_states(thread_ids)).values()
+            if all(status == "waiting_hashnode_approval" for status in statuses):
+                break
+            await asyncio.sleep(0.05)
+        else:
+            raise AssertionError("Requeued workflows did not reach the approval step")
+        lost = await executions.get("lost_thread")
+    finally:
+        await runner.stop()
+    return queued, requeued, lost
+
+
+class FlakySaver(InMemorySaver):
+    """Fails to store the initial state of one topic"""
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        if checkpoint["channel_values"].get("topic") == "Unstorable":
+            raise ConnectionError("Checkpointer unavailable")
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+
+async def run_partial_failure():
+    """Queue a batch in which one item's initial state cannot be checkpointed"""
+    nodes.llm = TrackingLLM()
+    await init_projections()
+    executions = ExecutionService()
+    runner = WorkflowRunner(workers=2)
+    await runner.start()
+    service = WorkflowService(FlakySaver(), runner, executions=executions)
+    try:
+        body = await service.start_workflow_batch(
+            [{"user_id": "batch_user", "topic": topic} for topic in ["Topic 0", "Unstorable", "Topic 2"]]
+        )
+        projections = await WorkflowExecution.count()
+    finally:
+        await runner.stop()
+    return body, projections
+
+
+def test_batch_start_is_bounded_and_reports_item_errors():
+    with patched_nodes():
+        body, max_active = asyncio.run(run_batch())
+
+    assert body["accepted"] == BATCH_SIZE
+    assert body["rejected"] == 1
+    rejected = body["items"][3]
+    assert rejected["status"] == "rejected" and rejected["thread_id"] is None
+    assert "topic" in rejected["error"]
+    assert len({item["thread_id"] for item in body["items"] if item["thread_id"]}) == BATCH_SIZE
+
+    # The queue is smaller than the batch, yet nothing is rejected and the
+    # runner never generates for more than the batch cap at once
+    assert max_active <= settings.WORKFLOW_BATCH_CONCURRENCY
+
+
+def test_queued_batch_survives_restart():
+    with patched_nodes():
+        queued, requeued, lost = asyncio.run(run_restart())
+
+    assert queued == ["queued"] * 4  # Checkpointed before any worker ran
+    assert requeued == {"requeued": 4, "failed": 1}
+    assert lost.workflow_status == "failed" and lost.error_message
+
+
+def test_unpersisted_batch_item_is_rejected_alone():
+    with patched_nodes():
+        body, projections = asyncio.run(run_partial_failure())
+
+    assert body["accepted"] == 2 and body["rejected"] == 1
+    failed = body["items"][1]
+    assert failed["status"] == "rejected" and failed["thread_id"] is None
+    assert "Checkpointer unavailable" in failed["error"]
+    assert projections == 2  # The rejected item left no projection behind
+
+
+def main():
+    """Main test function"""
+    print(f"=== Testing Batch Start Of {BATCH_SIZE} Workflows ===")
+    with patched_nodes():
+        body, max_active = asyncio.run(run_batch())
+    print(f"Accepted: {body['accepted']}, rejected: {body['rejected']}")
+    print(f"Max concurrent generations: {max_active} (cap {settings.WORKFLOW_BATCH_CONCURRENCY})")
+    test_batch_start_is_bounded_and_reports_item_errors()
+    print("✅ Batch start was bounded and reported item errors")
+    test_queued_batch_survives_restart()
+    print("✅ Queued batch jobs were requeued after a restart")
+    test_unpersisted_batch_item_is_rejected_alone()
+    print("✅ An item that could not be checkpointed was rejected alone")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Checkpoint blob test: BlobOffloadingMongoDBSaver stores large strings once per
+thread as compressed blobs, reads them back transparently (checkpoints and
+pending writes), deletes them with the thread, fails loudly on a missing blob,
+and keeps a full themed run far smaller than the plain AsyncMongoDBSaver
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import bson
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+from langgraph.types import Command
+
+from app.core.checkpointer import BLOB_REF_KEY, BlobOffloadingMongoDBSaver
+from app.services.llm_cache import LLMCache
+from app.workflows import nodes
+from app.workflows.workflow_graph import compile_workflow_with_checkpointer
+from fake_mongo import mongo_client
+from fake_services import FakeHashnodeService, run_with_fakes
+
+PARAGRAPH = "Checkpoints should not carry the same long text over and over again. " * 10
+
+
+class PostLLM:
+    """Returns a distinct ~7 KB post per call, like a real generation"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=f"# Post {self.calls}\n\n" + f"{PARAGRAPH}\n\n" * 10)
+
+
+def make_saver(client, offload):
+    collections = dict(db_name="checkpoints_test", checkpoint_collection_name="checkpoints",
+                       writes_collection_name="checkpoint_writes")
+    if offload:
+        return BlobOffloadingMongoDBSaver(client, blob_collection_name="checkpoint_blobs",
+                                          blob_min_bytes=1024, **collections)
+    return AsyncMongoDBSaver(client, **collections)
+
+
+async def stored_bytes(saver):
+    """BSON bytes of everything the saver stored, blobs included"""
+    total = 0
+    collections = [saver.checkpoint_collection, saver.writes_collection]
+    if isinstance(saver, BlobOffloadingMongoDBSaver):
+        collections.append(saver.blob_collection)
+    for collection in collections:
+        async for doc in collection.find({}):
+            total += len(bson.encode(doc))
+    return total
+
+
+async def run_themed_workflow(saver):
+    """Full themed run through both approvals; returns the final state values"""
+    nodes.llm = PostLLM()
+    workflow = compile_workflow_with_checkpointer(saver)
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    await workflow.ainvoke({
+        "messages": [],
+        "user_id": "test_user",
+        "topic": "Checkpoint blobs",
+        "theme": "Space exploration",
+        "workflow_status": "initialized",
+        "current_node": "start"
+    }, config)
+    await workflow.ainvoke(Command(resume="yes"), config)
+    await workflow.ainvoke(Command(resume="yes"), config)
+    return (await workflow.aget_state(config)).values, config
+
+
+async def run_workflow_sizes():
+    plain = make_saver(mongo_client(), offload=False)
+    plain_values, _ = await run_themed_workflow(plain)
+    offloading = make_saver(mongo_client(), offload=True)
+    values, config = await run_themed_workflow(offloading)
+
+    history = [item async for item in offloading.alist(config)]
+    raw_history = [item async for item in AsyncMongoDBSaver.alist(offloading, config)]
+    blob_count = await offloading.blob_collection.count_documents({})
+    return {
+        "plain_bytes": await stored_bytes(plain),
+        "offloaded_bytes": await stored_bytes(offloading),
+        "plain_values": plain_values,
+        "values": values,
+        "history": history,
+        "raw_history": raw_history,
+        "blob_count": blob_count
+    }
+
+
+async def run_saver_operations():
+    """Direct put/get round trips on a fresh saver"""
+    saver = make_saver(mongo_client(), offload=True)
+    results = {}
+    long_text = "x" * 4000
+
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "blog_content": long_text,
+        "hashnode_post": {"content": long_text, "tags": ["blob"]},
+        "messages": [{"role": "assistant", "content": long_text}],
+        "topic": "short text stays inline"
+    }
+    config = await saver.aput({"configurable": {"thread_id": "thread_a", "checkpoint_ns": ""}},
+                              checkpoint, {}, {})
+    await saver.aput_writes(config, [("themed_blog", "y" * 3000), ("topic", "inline")], "task_1")
+
+    stored = await saver.checkpoint_collection.find_one({"thread_id": "thread_a"})
+    results["stored_checkpoint"] = saver.serde.loads_typed((stored["type"], stored["checkpoint"]))
+    results["round_trip"] = await saver.aget_tuple(config)
+    results["blobs"] = await saver.blob_collection.count_documents({"thread_id": "thread_a"})
+
+    # The same text in another thread is stored again for that thread
+    other = await saver.aput({"configurable": {"thread_id": "thread_b", "checkpoint_ns": ""}},
+                             checkpoint, {}, {})
+    results["blobs_b"] = await saver.blob_collection.count_documents({"thread_id": "thread_b"})
+
+    await saver.adelete_thread("thread_a")
+    results["after_delete"] = (
+        await saver.checkpoint_collection.count_documents({"thread_id": "thread_a"}),
+        await saver.writes_collection.count_documents({"thread_id": "thread_a"}),
+        await saver.blob_collection.count_documents({"thread_id": "thread_a"}),
+        await saver.blob_collection.count_documents({"thread_id": "thread_b"})
+    )
+
+    await saver.blob_collection.delete_many({"thread_id": "thread_b"})
+    try:
+        await saver.aget_tuple(other)
+        results["missing"] = None
+    except KeyError as e:
+        results["missing"] = str(e)
+    return results
+
+
+def has_refs(value):
+    if isinstance(value, dict):
+        return BLOB_REF_KEY in value or any(has_refs(item) for item in value.values())
+    if isinstance(value, list):
+        return any(has_refs(item) for item in value)
+    return False
+
+
+def test_blob_round_trip_dedup_and_delete():
+    results = asyncio.run(run_saver_operations())
+
+    stored = results["stored_checkpoint"]["channel_values"]
+    assert set(stored["blog_content"]) == {BLOB_REF_KEY}
+    assert stored["hashnode_post"]["content"] == stored["blog_content"]
+    assert stored["topic"] == "short text stays inline"
+
+    round_trip = results["round_trip"]
+    assert round_trip.checkpoint["channel_values"]["blog_content"] == "x" * 4000
+    assert round_trip.checkpoint["channel_values"]["messages"][0]["content"] == "x" * 4000
+    writes = {channel: value for _, channel, value in round_trip.pending_writes}
+    assert writes == {"themed_blog": "y" * 3000, "topic": "inline"}
+
+    # The three copies of the checkpoint text share one blob, plus one for the write
+    assert results["blobs"] == 2
+    assert results["blobs_b"] == 1
+    assert results["after_delete"] == (0, 0, 0, 1)
+    assert "thread_b" in results["missing"]
+
+
+def test_themed_run_is_smaller_and_reads_back_unchanged():
+    results = run_with_fakes(
+        run_workflow_sizes(), llm_cache=LLMCache(backend="off"), hashnode_service=FakeHashnodeService()
+    )
+
+    assert results["values"]["workflow_status"] == "completed"
+    assert results["values"]["blog_content"] == results["plain_values"]["blog_content"]
+    assert results["values"]["themed_blog"] == results["plain_values"]["themed_blog"]
+    assert not any(has_refs(item.checkpoint["channel_values"]) for item in results["history"])
+    assert any(has_refs(item.checkpoint["channel_values"]) for item in results["raw_history"])
+
+    # blog_content, themed_blog (also hashnode_post.content) and the thread
+    assert results["blob_count"] == 3
+    assert results["offloaded_bytes"] * 4 < results["plain_bytes"]
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Checkpoint Blob Offloading ===")
+    results = run_with_fakes(
+        run_workflow_sizes(), llm_cache=LLMCache(backend="off"), hashnode_service=FakeHashnodeService()
+    )
+    print(f"Plain saver: {results['plain_bytes'] / 1024:.0f} KB, "
+          f"blob offloading: {results['offloaded_bytes'] / 1024:.0f} KB")
+    test_blob_round_trip_dedup_and_delete()
+    test_themed_run_is_smaller_and_reads_back_unchanged()
+    print("✅ Blobs round-tripped, deduplicated and shrank the checkpoints")
+
+
+if __name__ == "__main__":
+    main()
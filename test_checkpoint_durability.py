@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Checkpoint durability test: every-step, at-interrupt and at-exit runs reach
+the same paused state, but differ in how many checkpoints they store and
+when; a second run on a thread with a coalesced (at-exit) run in progress
+is refused (409 from the API) instead of mixing its writes into the first
+one's, and a refused background run leaves the thread's status alone
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import httpx
+from langchain_core.messages import AIMessage
+
+from app.core.checkpointer import BlobOffloadingMongoDBSaver, ThreadBusyError
+from app.main import app
+from app.routers.workflow import get_workflow_service
+from app.schemas.workflow_state import HumanInputRequest, WorkflowRequest
+from app.services.execution_service import ExecutionService
+from app.services.llm_cache import LLMCache
+from app.services.workflow_service import WorkflowService
+from app.workflows import nodes
+from app.workflows.workflow_graph import DURABILITY_MODES, compile_workflow_with_checkpointer
+from fake_mongo import init_projections, mongo_client
+from fake_services import run_with_fakes
+
+
+class ProbeLLM:
+    """Fixed generations that record how many checkpoints were stored at each call"""
+
+    def __init__(self, saver):
+        self.saver = saver
+        self.seen = []
+
+    async def ainvoke(self, messages):
+        self.seen.append(await self.saver.checkpoint_collection.count_documents({}))
+        return AIMessage(content=f"# Generated title\n\nGenerated content {len(self.seen)}")
+
+
+def make_saver():
+    return BlobOffloadingMongoDBSaver(mongo_client(), db_name="checkpoints_test",
+                                      checkpoint_collection_name="checkpoints",
+                                      writes_collection_name="checkpoint_writes",
+                                      blob_collection_name="checkpoint_blobs")
+
+
+async def run_mode(mode: str):
+    """Start a themed workflow up to the Hashnode approval in one durability mode"""
+    saver = make_saver()
+    llm = nodes.llm = ProbeLLM(saver)
+    service = WorkflowService(saver, durability=mode)
+    started = await service.start_workflow(
+        WorkflowRequest(user_id="test_user", topic="Durability", theme="Space exploration")
+    )
+    workflow = compile_workflow_with_checkpointer(saver, mode)
+    snapshot = await workflow.aget_state({"configurable": {"thread_id": started["thread_id"]}})
+    return {
+        "status": started["status"],
+        "waiting": any(task.interrupts for task in snapshot.tasks),
+        "themed_blog": snapshot.values.get("themed_blog"),
+        "seen": llm.seen,
+        "stored": await saver.checkpoint_collection.count_documents({})
+    }
+
+
+async def run_concurrent():
+    """Resume a thread while another at-exit run holds its write buffer"""
+    saver = make_saver()
+    nodes.llm = ProbeLLM(saver)
+    await init_projections()
+    executions = ExecutionService()
+    service = WorkflowService(saver, executions=executions, durability="at-exit")
+    started = await service.start_workflow(WorkflowRequest(user_id="test_user", topic="Busy thread"))
+    thread_id = started["thread_id"]
+    workflow = compile_workflow_with_checkpointer(saver, "at-exit")
+
+    error = None
+    app.dependency_overrides[get_workflow_service] = lambda: service
+    try:
+        async with saver.coalesce(thread_id):
+            try:
+                await service.provide_human_input(
+                    HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve")
+                )
+            except ThreadBusyError as e:
+                error = str(e)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(f"/workflows/{thread_id}/approve/hashnode")
+            # A background run refused the same way must not mark the thread failed
+            try:
+                await service._background_job(workflow, thread_id, None)()
+            except ThreadBusyError:
+                pass
+    finally:
+        app.dependency_overrides.pop(get_workflow_service, None)
+    projected = (await executions.get(thread_id)).workflow_status
+    snapshot = await workflow.aget_state({"configurable": {"thread_id": thread_id}})
+    return error, response.status_code, projected, snapshot.values["workflow_status"], service.is_running(thread_id)
+
+
+def test_durability_modes():
+    results = {mode: run_with_fakes(run_mode(mode), llm_cache=LLMCache(backend="off")) for mode in DURABILITY_MODES}
+
+    for result in results.values():
+        assert result["status"] == "waiting_hashnode_approval" and result["waiting"]
+        assert result["themed_blog"] == results["every-step"]["themed_blog"]
+
+    every_step, at_interrupt, at_exit = (results[mode] for mode in ["every-step", "at-interrupt", "at-exit"])
+    # every-step has checkpointed earlier nodes by the time later ones call the LLM
+    assert every_step["seen"][-1] > 0
+    # at-interrupt only checkpoints the pause
+    assert at_interrupt["seen"] == [0] * len(at_interrupt["seen"]) and at_interrupt["stored"] == 1
+    # at-exit stores the same checkpoints as every-step, all of them after the run
+    assert at_exit["seen"] == [0] * len(at_exit["seen"]) and at_exit["stored"] == every_step["stored"]
+
+
+def test_concurrent_coalesced_run_is_refused():
+    error, status_code, projected, status, running = run_with_fakes(
+        run_concurrent(), llm_cache=LLMCache(backend="off")
+    )
+
+    assert error is not None and "already has a run in progress" in error
+    assert status_code == 409
+    assert projected == status == "waiting_hashnode_approval"
+    assert not running
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Checkpoint Durability Modes ===")
+    for mode in DURABILITY_MODES:
+        result = run_with_fakes(run_mode(mode), llm_cache=LLMCache(backend="off"))
+        print(f"{mode:>12}: {result['stored']} checkpoints, stored before each LLM call: {result['seen']}")
+    test_durability_modes()
+    test_concurrent_coalesced_run_is_refused()
+    print("✅ Durability modes checkpointed as configured")
+
+
+if __name__ == "__main__":
+    main()
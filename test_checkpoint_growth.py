@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Checkpoint growth test: nodes write message deltas only, so the messages
+channel grows by a constant amount per step (linear overall) and stays
+within WORKFLOW_MESSAGE_LOG_LIMIT
+"""
+
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from app.core.config import settings
+from app.workflows.workflow_graph import compile_workflow_with_checkpointer
+from fake_services import FakeHashnodeService, FixedLLM, run_with_fakes
+
+
+async def run_full_workflow():
+    """Run a themed workflow through both approvals; return (message counts, channel bytes, write sizes) per checkpoint"""
+    checkpointer = InMemorySaver()
+    workflow = compile_workflow_with_checkpointer(checkpointer)
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    await workflow.ainvoke({
+        "messages": [],
+        "user_id": "test_user",
+        "topic": "Checkpoint growth",
+        "theme": "Space exploration",
+        "workflow_status": "initialized",
+        "current_node": "start"
+    }, config)
+    await workflow.ainvoke(Command(resume="yes"), config)
+    result = await workflow.ainvoke(Command(resume="yes"), config)
+    assert result["workflow_status"] == "completed"
+
+    counts, sizes, writes = [], [], []
+    checkpoints = [item async for item in checkpointer.alist(config)][::-1]
+    for item in checkpoints:
+        messages = item.checkpoint["channel_values"].get("messages", [])
+        counts.append(len(messages))
+        sizes.append(len(checkpointer.serde.dumps_typed(messages)[1]))
+        writes.extend(len(value) for _, channel, value in item.pending_writes if channel == "messages")
+    return counts, sizes, writes
+
+
+def test_messages_channel_grows_linearly():
+    counts, sizes, writes = run_with_fakes(
+        run_full_workflow(), llm=FixedLLM(), hashnode_service=FakeHashnodeService()
+    )
+
+    # Every node writes just its own message, never the accumulated history
+    assert writes and max(writes) == 1
+
+    # So each checkpoint adds at most one message, and a bounded number of bytes
+    growth = [later - earlier for earlier, later in zip(counts, counts[1:])]
+    assert all(step in (0, 1) for step in growth)
+    byte_growth = [later - earlier for earlier, later in zip(sizes, sizes[1:])]
+    assert max(byte_growth) <= 2 * sorted(step for step in byte_growth if step > 0)[0] + 128
+
+
+def test_message_log_is_capped():
+    limit = settings.WORKFLOW_MESSAGE_LOG_LIMIT
+    settings.WORKFLOW_MESSAGE_LOG_LIMIT = 3
+    try:
+        counts, _, _ = run_with_fakes(
+            run_full_workflow(), llm=FixedLLM(), hashnode_service=FakeHashnodeService()
+        )
+    finally:
+        settings.WORKFLOW_MESSAGE_LOG_LIMIT = limit
+    assert max(counts) == 3
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Checkpoint Growth ===")
+    counts, sizes, writes = run_with_fakes(
+        run_full_workflow(), llm=FixedLLM(), hashnode_service=FakeHashnodeService()
+    )
+    for count, size in zip(counts, sizes):
+        print(f"{count:3d} messages -> {size:6d} bytes")
+    test_messages_channel_grows_linearly()
+    test_message_log_is_capped()
+    print("✅ Messages channel grows linearly and respects the log limit")
+
+
+if __name__ == "__main__":
+    main()
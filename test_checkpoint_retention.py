@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Checkpoint retention test: compaction trims idle threads to their latest
+checkpoints and collects their old unreferenced blobs, but leaves recently
+updated and running threads and freshly stored blobs alone; finished threads
+expire, and resuming one takes it off the TTL schedule again, even when the
+resume starts while compaction is scheduling it
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from app.core.checkpointer import BlobOffloadingMongoDBSaver
+from app.models.models import WorkflowExecution
+from app.schemas.workflow_state import HumanInputRequest, WorkflowRequest
+from app.services.checkpoint_retention import CheckpointRetentionService
+from app.services.execution_service import ExecutionService
+from app.services.llm_cache import LLMCache
+from app.services.workflow_service import WorkflowService
+from fake_mongo import init_projections
+from fake_services import FakeHashnodeService, FixedLLM, run_with_fakes
+
+HOUR = timedelta(hours=1)
+
+
+async def put_checkpoints(saver, thread_id: str, count: int):
+    """count checkpoints, each holding its own long text in a blob"""
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    for index in range(count):
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"blog_content": f"{index} " + "x" * 2000}
+        config = await saver.aput(config, checkpoint, {}, {})
+    return config
+
+
+async def age(thread_id: str, saver, executions_by: timedelta, blobs_by: timedelta):
+    """Pretend the thread's projection and blobs were last touched a while ago"""
+    await WorkflowExecution.find_one(WorkflowExecution.thread_id == thread_id).update(
+        {"$set": {"last_updated": datetime.utcnow() - executions_by}}
+    )
+    await saver.blob_collection.update_many(
+        {"thread_id": thread_id}, {"$set": {"stored_at": datetime.utcnow() - blobs_by}}
+    )
+
+
+async def counts(saver, thread_id: str):
+    return (
+        await saver.checkpoint_collection.count_documents({"thread_id": thread_id}),
+        await saver.blob_collection.count_documents({"thread_id": thread_id})
+    )
+
+
+async def run_compaction():
+    client = await init_projections()
+    saver = BlobOffloadingMongoDBSaver(client, db_name="checkpoints_test",
+                                       checkpoint_collection_name="checkpoints",
+                                       writes_collection_name="checkpoint_writes",
+                                       blob_collection_name="checkpoint_blobs")
+    executions = ExecutionService()
+    running = {"running"}
+    retention = CheckpointRetentionService(saver, executions, keep=3, grace_seconds=3600,
+                                           is_running=lambda thread_id: thread_id in running)
+
+    configs = {}
+    for thread_id in ["idle", "recent", "running", "in_flight"]:
+        await executions.create(thread_id, "test_user", thread_id)
+        configs[thread_id] = await put_checkpoints(saver, thread_id, 6)
+        await age(thread_id, saver, executions_by=2 * HOUR, blobs_by=2 * HOUR)
+    await WorkflowExecution.find_one(WorkflowExecution.thread_id == "recent").update(
+        {"$set": {"last_updated": datetime.utcnow()}}
+    )
+    # A blob of in_flight's next checkpoint was just stored, the checkpoint itself not yet
+    await saver.blob_collection.insert_one({
+        "thread_id": "in_flight", "hash": "pending", "data": b"", "size": 0,
+        "created_at": datetime.utcnow(), "stored_at": datetime.utcnow()
+    })
+
+    report = await retention.compact()
+    results = {"report": report}
+    for thread_id in configs:
+        results[thread_id] = await counts(saver, thread_id)
+
+    # A deleted blob is stored again when its text comes back, not skipped as cached
+    config = configs["idle"]
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"blog_content": "0 " + "x" * 2000}
+    config = await saver.aput(config, checkpoint, {}, {})
+    restored = await saver.aget_tuple(config)
+    results["restored"] = restored.checkpoint["channel_values"]["blog_content"].startswith("0 ")
+    return results
+
+
+async def run_expiry():
+    client = await init_projections()
+    saver = BlobOffloadingMongoDBSaver(client, db_name="checkpoints_test",
+                                       checkpoint_collection_name="checkpoints",
+                                       writes_collection_name="checkpoint_writes",
+                                       blob_collection_name="checkpoint_blobs")
+    executions = ExecutionService()
+    service = WorkflowService(saver, executions=executions)
+    retention = CheckpointRetentionService(saver, executions, grace_seconds=3600,
+                                           is_running=service.is_running)
+
+    thread_ids = []
+    for topic in ["Finished long ago", "Just finished"]:
+        started = await service.start_workflow(WorkflowRequest(user_id="test_user", topic=topic))
+        thread_ids.append(started["thread_id"])
+        # Only the projection decides; mark both finished
+        await executions.record_transition(started["thread_id"], "twitter_failed", "publish_twitter")
+    old, recent = thread_ids
+    await WorkflowExecution.find_one(WorkflowExecution.thread_id == old).update(
+        {"$set": {"last_updated": datetime.utcnow() - 2 * HOUR}}
+    )
+
+    report = await retention.compact()
+    expiring = {
+        thread_id: [
+            await collection.count_documents({"thread_id": thread_id, "expire_at": {"$exists": True}})
+            for collection in [saver.checkpoint_collection, saver.blob_collection]
+        ] + [await executions.has_expiry(thread_id)]
+        for thread_id in thread_ids
+    }
+
+    # Resuming the expiring thread takes all of its documents off the TTL schedule
+    await service.provide_human_input(HumanInputRequest(thread_id=old, user_input="yes", action="approve"))
+    resumed = [
+        await collection.count_documents({"thread_id": old, "expire_at": {"$exists": True}})
+        for collection in [saver.checkpoint_collection, saver.writes_collection, saver.blob_collection]
+    ] + [await executions.has_expiry(old)]
+    return report, expiring, resumed, old, recent
+
+
+async def run_resume_race():
+    """A run resumes a finished thread right after compaction flagged its projection"""
+    client = await init_projections()
+    saver = BlobOffloadingMongoDBSaver(client, db_name="checkpoints_test",
+                                       checkpoint_collection_name="checkpoints",
+                                       writes_collection_name="checkpoint_writes",
+                                       blob_collection_name="checkpoint_blobs",
+                                       blob_cache_seconds=0)
+    executions = ExecutionService()
+    retention = CheckpointRetentionService(saver, executions, grace_seconds=3600)
+
+    await executions.create("raced", "test_user", "raced")
+    config = await put_checkpoints(saver, "raced", 2)
+    await executions.record_transition("raced", "completed", "end")
+    await age("raced", saver, executions_by=2 * HOUR, blobs_by=2 * HOUR)
+
+    set_expiry = executions.set_expiry
+
+    async def set_expiry_then_resume(thread_ids, expire_at, updated_before):
+        flagged = await set_expiry(thread_ids, expire_at, updated_before)
+        # What WorkflowService._track_run does for a run starting now
+        if await executions.has_expiry("raced"):
+            await saver.aclear_expiry("raced")
+            await executions.clear_expiry("raced")
+        return flagged
+
+    executions.set_expiry = set_expiry_then_resume
+    report = await retention.compact()
+    raced = [
+        await collection.count_documents({"thread_id": "raced", "expire_at": {"$exists": True}})
+        for collection in [saver.checkpoint_collection, saver.blob_collection]
+    ]
+
+    # A blob marked to expire is taken off the schedule when a checkpoint stores it again
+    await saver.blob_collection.update_many({"thread_id": "raced"}, {"$set": {"expire_at": datetime.utcnow() + HOUR}})
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"blog_content": "1 " + "x" * 2000}
+    await saver.aput(config, checkpoint, {}, {})
+    restored = await saver.blob_collection.count_documents({"thread_id": "raced", "expire_at": {"$exists": True}})
+    return report, raced, restored
+
+
+def test_compaction_skips_active_threads_and_fresh_blobs():
+    results = asyncio.run(run_compaction())
+
+    report = results["report"]
+    assert report["threads_compacted"] == 2 and report["threads_skipped"] == 2
+    assert report["checkpoints_deleted"] == 6 and report["blobs_deleted"] == 6
+    assert report["reclaimed_bytes"] > 0
+    assert results["idle"] == (3, 3)
+    assert results["recent"] == (6, 6) and results["running"] == (6, 6)
+    # in_flight lost its stale checkpoints and blobs, but not the freshly stored one
+    assert results["in_flight"] == (3, 4)
+    assert results["restored"]
+
+
+def test_finished_threads_expire_until_resumed():
+    report, expiring, resumed, old, recent = run_with_fakes(
+        run_expiry(), llm=FixedLLM(), llm_cache=LLMCache(backend="off"), hashnode_service=FakeHashnodeService()
+    )
+
+    assert report["threads_expiring"] == 1
+    assert expiring[old][0] > 0 and expiring[old][2]
+    assert expiring[recent] == [0, 0, False]
+    assert resumed == [0, 0, 0, False]
+
+
+def test_resume_during_expiry_keeps_documents():
+    report, raced, restored = asyncio.run(run_resume_race())
+
+    assert report["threads_expiring"] == 0
+    assert raced == [0, 0]
+    assert restored == 1  # Only blob 0, which the new checkpoint does not store again
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Checkpoint Retention ===")
+    test_compaction_skips_active_threads_and_fresh_blobs()
+    test_finished_threads_expire_until_resumed()
+    test_resume_during_expiry_keeps_documents()
+    print("✅ Compaction left active threads alone and resumed threads stopped expiring")
+
+
+if __name__ == "__main__":
+    main()
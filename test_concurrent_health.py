@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Concurrency test: /health latency must stay flat while 50 workflows are
+generating content on the same worker
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import httpx
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.main import app
+from app.routers.workflow import get_workflow_service
+from app.services.workflow_service import WorkflowService
+from app.workflows import nodes
+from fake_services import patched_nodes
+
+CONCURRENT_WORKFLOWS = 50
+LLM_LATENCY = 0.5
+
+
+class SlowLLM:
+    """Stand-in for the OpenAI chat model with a fixed non-blocking latency"""
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(LLM_LATENCY)
+        return AIMessage(content="# Generated title\n\nGenerated content")
+
+
+async def measure_health_latency(client, samples=20, interval=0.05):
+    """Return /health latencies in seconds, measured from when each request was due.
+
+    Measuring from the due time (rather than from the call) captures any time
+    the event loop spent blocked by other requests before serving /health.
+    """
+    latencies = []
+    for _ in range(samples):
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        response = await client.get("/health")
+        latencies.append(time.perf_counter() - due)
+        assert response.status_code == 200
+    return latencies
+
+
+async def run_health_under_load():
+    """Measure /health latency when idle and while workflows are generating"""
+    nodes.llm = SlowLLM()
+    service = WorkflowService(InMemorySaver())
+    app.dependency_overrides[get_workflow_service] = lambda: service
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60.0) as client:
+            idle = await measure_health_latency(client)
+
+            payload = {"user_id": "load_test_user", "topic": "Async Python", "theme": None}
+            workflows = [
+                asyncio.create_task(client.post("/workflows/start", json=payload))
+                for _ in range(CONCURRENT_WORKFLOWS)
+            ]
+            await asyncio.sleep(LLM_LATENCY / 2)  # Let every workflow reach its first LLM call
+            loaded = await measure_health_latency(client)
+
+            responses = await asyncio.gather(*workflows)
+            assert all(response.status_code == 200 for response in responses)
+    finally:
+        app.dependency_overrides.pop(get_workflow_service, None)
+
+    return idle, loaded
+
+
+def test_health_latency_flat_while_workflows_generate():
+    with patched_nodes():
+        idle, loaded = asyncio.run(run_health_under_load())
+
+    # A single blocking LLM call would hold /health for the full LLM latency
+    assert max(loaded) < LLM_LATENCY / 2
+    assert sorted(loaded)[len(loaded) // 2] < max(0.05, 10 * sorted(idle)[len(idle) // 2])
+
+
+def main():
+    """Main test function"""
+    print(f"=== Testing /health Latency With {CONCURRENT_WORKFLOWS} Generating Workflows ===")
+    with patched_nodes():
+        idle, loaded = asyncio.run(run_health_under_load())
+    print(f"Idle   /health: median {sorted(idle)[len(idle) // 2] * 1000:.2f} ms, max {max(idle) * 1000:.2f} ms")
+    print(f"Loaded /health: median {sorted(loaded)[len(loaded) // 2] * 1000:.2f} ms, max {max(loaded) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
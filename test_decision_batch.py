@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Decision batch test: POST /workflows/decisions:batch resumes the paused
+threads, and a resume that fails before the decision is consumed leaves the
+thread paused (and its projection waiting) instead of marking it failed; the
+same decision sent concurrently (twice by one process, or from two processes)
+resumes the thread once, so nothing is published twice
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.checkpointer import ThreadBusyError
+from app.schemas.workflow_state import HumanInputRequest, WorkflowDecision, WorkflowRequest
+from app.services.execution_service import ExecutionService
+from app.services.llm_cache import LLMCache
+from app.services.twitter_service import TwitterService
+from app.services.workflow_runner import WorkflowRunner
+from app.services.workflow_service import WorkflowService
+from fake_mongo import init_projections
+from fake_services import FakeHashnodeService, FixedLLM, run_with_fakes
+
+
+async def run_decisions():
+    """Approve two paused threads, with the first resume failing before it runs"""
+    await init_projections()
+    executions = ExecutionService()
+    service = WorkflowService(InMemorySaver(), executions=executions)
+    thread_ids = []
+    for topic in ["Flaky resume", "Healthy resume"]:
+        started = await service.start_workflow(WorkflowRequest(user_id="test_user", topic=topic))
+        thread_ids.append(started["thread_id"])
+
+    run_graph = service._run_graph
+
+    async def failing_run_graph(workflow, graph_input, config, durability=None):
+        if config["configurable"]["thread_id"] == thread_ids[0]:
+            raise ConnectionError("Checkpointer unavailable")
+        return await run_graph(workflow, graph_input, config, durability)
+
+    service._run_graph = failing_run_graph
+    result = await service.apply_decisions([
+        WorkflowDecision(thread_id=thread_id, target="hashnode", decision="approve") for thread_id in thread_ids
+    ])
+    states = await executions.get_wait_states(thread_ids)
+
+    # The failed thread can still be decided once the outage is over
+    service._run_graph = run_graph
+    retried = await service.apply_decisions([
+        WorkflowDecision(thread_id=thread_ids[0], target="hashnode", decision="approve")
+    ])
+    statuses = await service.get_workflow_statuses(thread_ids + ["missing_thread"], ["status", "revision"])
+    return result, states, retried, statuses, thread_ids
+
+
+class FakeResponse:
+    def __init__(self, tweet_id, text):
+        self.headers = {}
+        self.body = {"data": {"id": tweet_id, "text": text}}
+
+    async def json(self):
+        return self.body
+
+
+class RecordingTweetClient:
+    def __init__(self):
+        self.posted = []
+
+    async def create_tweet(self, text, in_reply_to_tweet_id=None):
+        tweet_id = str(len(self.posted) + 1)
+        self.posted.append((tweet_id, text, in_reply_to_tweet_id))
+        return FakeResponse(tweet_id, text)
+
+
+class CountingHashnodeService(FakeHashnodeService):
+    def __init__(self):
+        self.published = 0
+
+    async def publish(self, title, content, tags):
+        self.published += 1
+        return await super().publish(title, content, tags)
+
+
+async def run_concurrent_decisions(client, twitter_service):
+    """Send each approval of one thread three times at once: twice through one
+    service and once through a second one with its own worker pool"""
+    twitter_service.mock_mode = False
+    twitter_service.client = client
+    await init_projections()
+    executions = ExecutionService()
+    checkpointer = InMemorySaver()
+    runners = [WorkflowRunner(workers=2, queue_size=10) for _ in range(2)]
+    for runner in runners:
+        await runner.start()
+    service, other = (WorkflowService(checkpointer, runner=runner, executions=executions) for runner in runners)
+    try:
+        started = await service.start_workflow(WorkflowRequest(user_id="test_user", topic="Double approvals"))
+        thread_id = started["thread_id"]
+
+        def approve(target):
+            request = HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve")
+            decision = WorkflowDecision(thread_id=thread_id, target=target, decision="approve")
+            return asyncio.gather(other.apply_decisions([decision]), service.provide_human_input(request),
+                                  service.provide_human_input(request), return_exceptions=True)
+
+        hashnode = await approve("hashnode")
+        invalid = await service.provide_human_input(
+            HumanInputRequest(thread_id=thread_id, user_input="maybe", action="approve")
+        )
+        undecided = (await executions.get(thread_id)).workflow_status
+        twitter = await approve("twitter")
+        for _ in range(100):
+            values = (await service.get_workflow_state(thread_id))["channel_values"]
+            if values["workflow_status"] == "completed":
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        for runner in runners:
+            await runner.stop()
+    return hashnode, invalid, undecided, twitter, values
+
+
+def check_resumed_once(results, status):
+    """One of the three concurrent decisions resumed the thread, the others were refused"""
+    batched, direct, busy = results
+    batch = batched["items"][0]
+    if batch["applied"]:
+        resumed = [batch]
+        assert direct["message"] == "Workflow is not waiting for input"
+    else:
+        resumed = [direct]
+        assert batch["error"] in ["Workflow is not waiting for hashnode approval",
+                                  "Workflow is not waiting for twitter approval"]
+    assert isinstance(busy, ThreadBusyError)
+    assert [result["status"] for result in resumed] == [status]
+
+
+def test_decision_batch_keeps_paused_threads_resumable():
+    result, states, retried, statuses, thread_ids = run_with_fakes(
+        run_decisions(), llm=FixedLLM(), llm_cache=LLMCache(backend="off"), hashnode_service=FakeHashnodeService()
+    )
+
+    flaky, healthy = result["items"]
+    assert not flaky["applied"] and flaky["status"] == "waiting_hashnode_approval"
+    assert "Checkpointer unavailable" in flaky["error"]
+    assert healthy["applied"] and healthy["status"] == "waiting_twitter_approval"
+    assert states == {thread_ids[0]: "waiting_hashnode_approval", thread_ids[1]: "waiting_twitter_approval"}
+
+    assert retried["applied"] == 1
+    assert retried["items"][0]["status"] == "waiting_twitter_approval"
+
+    # status:batch reads just the requested fields from the projection
+    assert statuses["missing"] == ["missing_thread"]
+    assert [sorted(item) for item in statuses["items"]] == [["revision", "status", "thread_id"]] * 2
+    assert all(item["status"] == "waiting_twitter_approval" and item["revision"] > 0 for item in statuses["items"])
+
+
+def test_concurrent_decisions_resume_once():
+    client, twitter_service, hashnode_service = RecordingTweetClient(), TwitterService(), CountingHashnodeService()
+    hashnode, invalid, undecided, twitter, values = run_with_fakes(
+        run_concurrent_decisions(client, twitter_service), llm=FixedLLM(), llm_cache=LLMCache(backend="off"),
+        hashnode_service=hashnode_service, twitter_service=twitter_service
+    )
+
+    check_resumed_once(hashnode, "waiting_twitter_approval")
+    assert hashnode_service.published == 1
+    # An invalid decision leaves the thread (and its projection) waiting
+    assert invalid["status"] == "waiting_twitter_approval" and undecided == "waiting_twitter_approval"
+
+    check_resumed_once(twitter, "publishing_twitter")
+    assert values["workflow_status"] == "completed"
+    assert len(client.posted) == len(values["twitter_post"]["tweets"])
+    assert [parent for _, _, parent in client.posted].count(None) == 1
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Batch Decisions ===")
+    test_decision_batch_keeps_paused_threads_resumable()
+    test_concurrent_decisions_resume_once()
+    print("✅ A failed resume left the thread paused and resumable")
+
+
+if __name__ == "__main__":
+    main()
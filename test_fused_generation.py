@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Fused generation test: with a theme, fused mode writes the themed blog in one
+call and skips the plain draft unless the request asks for it
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.config import settings
+from app.services.llm_cache import LLMCache
+from app.workflows import nodes
+from fake_services import patched_nodes
+from app.workflows.workflow_graph import create_workflow_graph
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=f"# Response {len(self.prompts)}\n\nContent.")
+
+
+async def run_until_approval(mode, theme, include_plain_draft=False):
+    settings.WORKFLOW_THEME_GENERATION = mode
+    nodes.llm = RecordingLLM()
+    nodes.llm_cache = LLMCache(backend="off")
+    workflow = create_workflow_graph().compile(checkpointer=InMemorySaver())
+    state = await workflow.ainvoke({
+        "messages": [],
+        "user_id": "test_user",
+        "topic": "Observability",
+        "theme": theme,
+        "include_plain_draft": include_plain_draft,
+        "workflow_status": "initialized",
+        "current_node": "start"
+    }, {"configurable": {"thread_id": str(uuid.uuid4())}})
+    return nodes.llm.prompts, state
+
+
+def test_fused_generation():
+    original = settings.WORKFLOW_THEME_GENERATION
+    try:
+        with patched_nodes():
+            prompts, state = asyncio.run(run_until_approval("fused", "Pirates"))
+            assert len(prompts) == 2  # Themed blog + Twitter thread
+            assert "theme: Pirates" in prompts[0]
+            assert state.get("blog_content") is None
+            assert state["hashnode_post"]["content"] == state["themed_blog"]
+
+            prompts, state = asyncio.run(run_until_approval("fused", "Pirates", include_plain_draft=True))
+            assert len(prompts) == 3
+            assert state["blog_content"] and state["themed_blog"]
+
+            prompts, _ = asyncio.run(run_until_approval("fused", None))
+            assert len(prompts) == 2  # Plain blog + Twitter thread
+
+            prompts, _ = asyncio.run(run_until_approval("sequential", "Pirates"))
+            assert len(prompts) == 3
+    finally:
+        settings.WORKFLOW_THEME_GENERATION = original
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Fused Themed Generation ===")
+    test_fused_generation()
+    print("✅ Fused mode generated the themed blog in one call")
+
+
+if __name__ == "__main__":
+    main()
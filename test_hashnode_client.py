@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Hashnode client test: publishes share one pooled connection and the
+publication lookup runs once, so each publish after the first costs two
+GraphQL requests instead of three
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from app.services.hashnode_service import HashnodeService
+from fake_hashnode_server import FakeHashnodeServer
+
+PUBLISHES = 5
+
+
+async def publish_posts():
+    """Requests per publish and total connections for PUBLISHES draft+publish cycles"""
+    async with FakeHashnodeServer() as server:
+        service = HashnodeService(base_url=server.url)
+        per_publish = []
+        try:
+            for i in range(PUBLISHES):
+                before = len(server.requests)
+                draft = await service.create_post(f"Post {i}", "Content " * 50, ["testing"])
+                published = await service.publish_draft(draft["draft_id"])
+                assert published["success"] and published["post"]["url"]
+                per_publish.append(len(server.requests) - before)
+        finally:
+            await service.aclose()
+        return per_publish, server.connections, server.count("me")
+
+
+def test_hashnode_client():
+    per_publish, connections, lookups = asyncio.run(publish_posts())
+    assert per_publish == [3] + [2] * (PUBLISHES - 1)
+    assert lookups == 1
+    assert connections == 1
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Pooled Hashnode Client ===")
+    per_publish, connections, lookups = asyncio.run(publish_posts())
+    print(f"GraphQL requests per publish: {per_publish}")
+    print(f"Connections: {connections}, publication lookups: {lookups}")
+    test_hashnode_client()
+    print("✅ Publishes reused one connection and the cached publication id")
+
+
+if __name__ == "__main__":
+    main()
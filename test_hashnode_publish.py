@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hashnode publishing test: direct mode publishes with one publishPost request,
+falls back to createDraft + publishDraft when publishPost is rejected (but not
+when the outcome is unknown after a 5xx), and batches concurrent publishes
+into one aliased request
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from app.core.config import settings
+from app.services.hashnode_service import HashnodeService, HashnodeUnavailableError
+from fake_hashnode_server import FakeHashnodeServer
+
+
+async def publish_sequentially(server, count):
+    """Requests per publish for sequential direct publishes"""
+    service = HashnodeService(base_url=server.url)
+    per_publish = []
+    try:
+        for i in range(count):
+            before = len(server.requests)
+            result = await service.publish(f"Post {i}", "Content", ["testing"])
+            assert result["success"] and result["post"]["url"]
+            per_publish.append(len(server.requests) - before)
+    finally:
+        await service.aclose()
+    return per_publish, result
+
+
+async def run_publish_scenarios():
+    results = {}
+    settings.HASHNODE_BATCH_WINDOW_MS = 0
+    async with FakeHashnodeServer() as server:
+        results["direct"] = (await publish_sequentially(server, 3))[0]
+
+    async with FakeHashnodeServer(fail_operations={"publishPost"}) as server:
+        per_publish, result = await publish_sequentially(server, 2)
+        results["fallback"] = (per_publish, result, server.count("publishDraft"))
+
+    for window in [0, 50]:
+        settings.HASHNODE_BATCH_WINDOW_MS = window
+        async with FakeHashnodeServer(timeout_operations={"publishPost"}) as server:
+            service = HashnodeService(base_url=server.url)
+            try:
+                await service.publish("Slow post", "Content", ["testing"])
+                error = None
+            except HashnodeUnavailableError as e:
+                error = e
+            finally:
+                await service.aclose()
+            results[f"timeout_{window}"] = (error, server.count("createDraft"), len(server.posts))
+
+    settings.HASHNODE_BATCH_WINDOW_MS = 50
+    settings.HASHNODE_BATCH_MAX_OPERATIONS = 10
+    async with FakeHashnodeServer() as server:
+        service = HashnodeService(base_url=server.url)
+        try:
+            published = await asyncio.gather(*(
+                service.publish(f"Bulk post {i}", "Content", ["bulk"]) for i in range(12)
+            ))
+        finally:
+            await service.aclose()
+        publish_requests = [r["operations"] for r in server.requests if "publishPost" in r["operations"]]
+        results["batched"] = (published, publish_requests, server.count("me"))
+    return results
+
+
+def test_hashnode_publish():
+    original = (settings.HASHNODE_PUBLISH_MODE, settings.HASHNODE_BATCH_WINDOW_MS,
+                settings.HASHNODE_BATCH_MAX_OPERATIONS)
+    settings.HASHNODE_PUBLISH_MODE = "direct"
+    try:
+        results = asyncio.run(run_publish_scenarios())
+    finally:
+        (settings.HASHNODE_PUBLISH_MODE, settings.HASHNODE_BATCH_WINDOW_MS,
+         settings.HASHNODE_BATCH_MAX_OPERATIONS) = original
+
+    # Publication lookup + publishPost, then publishPost alone
+    assert results["direct"] == [2, 1, 1]
+
+    per_publish, result, publish_drafts = results["fallback"]
+    assert per_publish == [4, 3]  # Rejected publishPost + createDraft + publishDraft
+    assert result["draft_id"] and publish_drafts == 2
+
+    # The post was created behind the gateway timeout: no draft flow, no second post
+    for window in [0, 50]:
+        error, drafts, posts = results[f"timeout_{window}"]
+        assert error is not None and "504" in str(error)
+        assert drafts == 0 and posts == 1
+
+    published, publish_requests, lookups = results["batched"]
+    assert all(result["success"] for result in published)
+    assert len({result["post"]["id"] for result in published}) == 12
+    assert sorted(len(operations) for operations in publish_requests) == [2, 10]
+    assert lookups == 1
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Hashnode Direct and Batched Publishing ===")
+    test_hashnode_publish()
+    print("✅ Direct publish took one request, fallback and batching behaved")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 Test script to trigger the complete workflow including both Hashnode and Twitter publishing
 """
 
+import asyncio
 import requests
 import json
 import time
@@ -213,7 +214,7 @@ def test_twitter_only():
 
         # Test credentials
         print("Testing Twitter credentials...")
-        creds_result = twitter_service.verify_credentials()
+        creds_result = asyncio.run(twitter_service.verify_credentials())
         print(f"Credentials result: {json.dumps(creds_result, indent=2)}")
 
         # Test thread posting
@@ -226,7 +227,7 @@ def test_twitter_only():
         """
 
         print("\nTesting Twitter thread posting...")
-        thread_result = twitter_service.post_thread(sample_thread)
+        thread_result = asyncio.run(twitter_service.post_thread(sample_thread))
         print(f"Thread result: {json.dumps(thread_result, indent=2)}")
 
     except Exception as e:
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+LLM cache test: repeated prompts are served from the cache, concurrent misses
+share one LLM call, and nodes that are not opted in (none by default) always
+call the LLM
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+
+from app.services.llm_cache import LLMCache
+from app.workflows import nodes
+from fake_services import patched_nodes
+
+CACHED_NODES = ["generate_blog", "apply_theme", "twitter_thread"]
+
+
+class CountingLLM:
+    """Stand-in for the OpenAI chat model that counts invocations"""
+    model_name = "counting-model"
+    temperature = 0.7
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return AIMessage(content=f"Response #{self.calls}")
+
+
+async def run_nodes(state, repeats):
+    """Run the three cached nodes `repeats` times on the same state"""
+    outputs = []
+    for _ in range(repeats):
+        blog = await nodes.generate_blog_node(state)
+        themed = await nodes.apply_theme_node({**state, **blog})
+        thread = await nodes.twitter_thread_node({**state, **blog, **themed})
+        outputs.append((blog["blog_content"], themed["themed_blog"], thread["twitter_thread"]))
+    return outputs
+
+
+async def run_cache_scenarios():
+    llm = CountingLLM()
+    nodes.llm = llm
+    state = {"topic": "Caching LLM calls", "theme": "Cooking", "user_id": "test_user"}
+    results = {}
+
+    nodes.llm_cache = LLMCache(backend="memory", nodes=CACHED_NODES)
+    outputs = await run_nodes(state, repeats=3)
+    results["repeat"] = (llm.calls, outputs, nodes.llm_cache.get_metrics())
+
+    llm.calls = 0
+    nodes.llm_cache = LLMCache(backend="memory", nodes=CACHED_NODES)
+    await asyncio.gather(*(nodes.generate_blog_node(state) for _ in range(10)))
+    results["concurrent"] = (llm.calls, nodes.llm_cache.get_metrics())
+
+    llm.calls = 0
+    nodes.llm_cache = LLMCache(backend="memory", nodes=["generate_blog", "twitter_thread"])
+    await run_nodes(state, repeats=3)
+    results["opt_out"] = llm.calls
+
+    llm.calls = 0
+    nodes.llm_cache = LLMCache()
+    await run_nodes(state, repeats=2)
+    results["default"] = llm.calls
+
+    return results
+
+
+def test_llm_cache():
+    with patched_nodes():
+        results = asyncio.run(run_cache_scenarios())
+
+    calls, outputs, metrics = results["repeat"]
+    assert calls == 3  # One call per node, the repeats are memory hits
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert metrics["totals"]["misses"] == 3
+    assert metrics["totals"]["memory_hits"] == 6
+
+    calls, metrics = results["concurrent"]
+    assert calls == 1
+    assert metrics["totals"]["coalesced"] == 9
+
+    # apply_theme opted out: the blog is cached (1 call), every theme call goes to
+    # the LLM (3) and each new themed text is a new thread prompt (3)
+    assert results["opt_out"] == 7
+
+    # Caching is opt-in per node, so by default every run generates afresh
+    assert results["default"] == 6
+
+
+def main():
+    """Main test function"""
+    print("=== Testing LLM Response Cache ===")
+    with patched_nodes():
+        results = asyncio.run(run_cache_scenarios())
+    calls, _, metrics = results["repeat"]
+    print(f"3 runs of 3 nodes: {calls} LLM calls, hit ratio {metrics['hit_ratio']:.2f}")
+    print(f"10 concurrent identical prompts: {results['concurrent'][0]} LLM call")
+    test_llm_cache()
+    print("✅ LLM cache served repeats and coalesced concurrent misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -82,6 +82,17 @@ def approve_twitter(thread_id):
         print(f"Error: {response.text}")
         return None
 
+def get_workflow_state(thread_id):
+    """Get the full checkpointed state (/status only returns the projection)"""
+    url = f"{BASE_URL}/workflows/{thread_id}/state"
+    response = requests.get(url)
+    
+    if response.status_code == 200:
+        return response.json()
+    else:
+        print(f"❌ Failed to get state: {response.status_code}")
+        return {}
+
 def display_status(status, step_name):
     """Display workflow status in a readable format"""
     print(f"\n📊 {step_name}")
@@ -89,8 +100,8 @@ def display_status(status, step_name):
     print(f"Workflow Status: {status.get('status', 'Unknown')}")
     print(f"Requires Input: {status.get('requires_human_input', False)}")
     
-    # Extract content from state if available
-    state = status.get('state', {})
+    # Extract content from the full state
+    state = get_workflow_state(status.get('thread_id'))
     channel_values = state.get('channel_values', {})
     
     # Show blog title if available
@@ -188,7 +199,7 @@ def main():
                             display_status(final_status, "Final Status")
                             
                             # Extract and display final URLs
-                            state = final_status.get('state', {})
+                            state = get_workflow_state(thread_id)
                             channel_values = state.get('channel_values', {})
                             
                             hashnode_post = channel_values.get('hashnode_post', {})
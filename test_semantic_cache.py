@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Semantic blog cache test: a near-duplicate topic reuses (or adapts) an earlier
+blog, an unrelated topic is generated from scratch, and the append-only index
+survives a restart, is shared between processes and compacts itself
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+
+from app.services.llm_cache import LLMCache
+from app.services.semantic_cache import SemanticBlogCache
+from app.workflows import nodes
+from fake_services import patched_nodes
+
+
+class WordEmbeddings:
+    """Bag-of-words stand-in for the OpenAI embeddings: topics sharing words are close"""
+    vocabulary = ["python", "async", "asyncio", "guide", "beginners", "gardening", "tomatoes", "intro"]
+
+    async def aembed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) for word in self.vocabulary] + [0.1]
+
+
+class CountingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[0].content)
+        return AIMessage(content=f"# Blog {len(self.prompts)}\n\nGenerated content.")
+
+
+async def run_topics(mode, path, topics):
+    nodes.llm = CountingLLM()
+    nodes.llm_cache = LLMCache(backend="off")
+    nodes.blog_cache = SemanticBlogCache(path=path, mode=mode, threshold=0.85, embeddings=WordEmbeddings())
+    results = [await nodes.generate_blog_node({"topic": topic}) for topic in topics]
+    return nodes.llm.prompts, results
+
+
+def test_semantic_cache():
+    with tempfile.TemporaryDirectory() as directory, patched_nodes():
+        path = os.path.join(directory, "cache")
+        topics = ["python asyncio guide", "python asyncio guide beginners", "gardening tomatoes"]
+        prompts, results = asyncio.run(run_topics("reuse", path, topics))
+
+        assert len(prompts) == 2  # The second topic reused the first blog
+        assert results[1]["blog_content"] == results[0]["blog_content"]
+        assert "reused" in results[1]["messages"][0]["content"]
+        assert results[2]["blog_content"] != results[0]["blog_content"]
+        assert os.path.exists(os.path.join(path, "entries.jsonl"))
+
+        # A new process loads the persisted index
+        prompts, results = asyncio.run(run_topics("reuse", path, ["python asyncio guide"]))
+        assert prompts == []
+        assert results[0]["blog_content"] == "# Blog 1\n\nGenerated content."
+
+        # Adapt mode sends the cached draft to the LLM instead of reusing it verbatim
+        prompts, results = asyncio.run(run_topics("adapt", path, ["intro python asyncio guide"]))
+        assert len(prompts) == 1
+        assert "Existing blog:" in prompts[0] and "# Blog 1" in prompts[0]
+        assert len(nodes.blog_cache.entries) == 3
+
+        # Caching disabled: every topic is generated
+        prompts, _ = asyncio.run(run_topics("off", path, topics))
+        assert len(prompts) == 3
+
+
+async def run_shared_index(path):
+    """Two caches on one directory, as two processes would use it"""
+    embeddings = WordEmbeddings()
+    first = SemanticBlogCache(path=path, mode="reuse", threshold=0.85, max_entries=3, embeddings=embeddings)
+    second = SemanticBlogCache(path=path, mode="reuse", threshold=0.85, max_entries=3, embeddings=embeddings)
+
+    guide = await first.embed("python asyncio guide")
+    await first.add("python asyncio guide", guide, "# Guide")
+    tomatoes = await second.embed("gardening tomatoes")
+    await second.add("gardening tomatoes", tomatoes, "# Tomatoes")
+    seen_by_first = await first.search(tomatoes)
+    seen_by_second = await second.search(guide)
+
+    # Enough adds to compact the files down to the newest max_entries
+    for index in range(6):
+        topic = "intro " * (index + 1) + "python"
+        await first.add(topic, await first.embed(topic), f"# Intro {index}")
+    with open(os.path.join(path, "entries.jsonl")) as entries:
+        lines = len(entries.readlines())
+    await second.search(guide)
+    restarted = SemanticBlogCache(path=path, mode="reuse", threshold=0.85, max_entries=3, embeddings=embeddings)
+    await restarted.search(guide)
+    return seen_by_first, seen_by_second, lines, second.entries, restarted.entries, first.entries
+
+
+def test_semantic_cache_is_shared_and_compacted():
+    with tempfile.TemporaryDirectory() as directory:
+        seen_by_first, seen_by_second, lines, second, restarted, first = asyncio.run(
+            run_shared_index(os.path.join(directory, "cache"))
+        )
+
+    # Appends from either process are visible to the other instead of overwriting them
+    assert seen_by_first[1]["blog_content"] == "# Tomatoes"
+    assert seen_by_second[1]["blog_content"] == "# Guide"
+
+    assert lines <= 6  # Never more than twice max_entries on disk
+    newest = ["# Intro 3", "# Intro 4", "# Intro 5"]
+    assert [entry["blog_content"] for entry in first] == newest
+    assert [entry["blog_content"] for entry in second] == newest
+    assert [entry["blog_content"] for entry in restarted] == newest
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Semantic Blog Cache ===")
+    test_semantic_cache()
+    test_semantic_cache_is_shared_and_compacted()
+    print("✅ Near-duplicate topics reused the cached blog and the index persisted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Speculative draft test: with HASHNODE_SPECULATIVE_DRAFT the draft is created
+before the approval pause, approval only publishes it and rejection deletes it
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from app.core.config import settings
+from app.services.hashnode_service import HashnodeService
+from app.services.llm_cache import LLMCache
+from app.workflows import nodes
+from fake_services import FixedLLM, patched_nodes
+from app.workflows.workflow_graph import compile_workflow_with_checkpointer
+from fake_hashnode_server import FakeHashnodeServer
+
+
+async def run_to_hashnode_decision(workflow, server, decision):
+    """Run a workflow to the Hashnode pause, then decide; returns the requests each phase made"""
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    await workflow.ainvoke({
+        "messages": [],
+        "user_id": "test_user",
+        "topic": "Speculative drafts",
+        "workflow_status": "initialized",
+        "current_node": "start"
+    }, config)
+    paused = len(server.requests)
+    result = await workflow.ainvoke(Command(resume=decision), config)
+    return server.requests[:paused], server.requests[paused:], result
+
+
+async def run_speculative_scenarios():
+    nodes.llm = FixedLLM("# Speculative drafts\n\nGenerated content.")
+    nodes.llm_cache = LLMCache(backend="off")
+    workflow = compile_workflow_with_checkpointer(InMemorySaver())
+    results = {}
+    async with FakeHashnodeServer() as server:
+        nodes.hashnode_service = HashnodeService(base_url=server.url)
+        try:
+            results["approve"] = await run_to_hashnode_decision(workflow, server, "yes")
+            results["approve_drafts"] = dict(server.drafts)
+            server.reset()
+            results["reject"] = await run_to_hashnode_decision(workflow, server, "no")
+            results["reject_drafts"] = dict(server.drafts)
+            results["removed"] = list(server.removed_drafts)
+        finally:
+            await nodes.hashnode_service.aclose()
+    return results
+
+
+def test_speculative_draft():
+    original = settings.HASHNODE_SPECULATIVE_DRAFT
+    settings.HASHNODE_SPECULATIVE_DRAFT = True
+    try:
+        with patched_nodes():
+            results = asyncio.run(run_speculative_scenarios())
+    finally:
+        settings.HASHNODE_SPECULATIVE_DRAFT = original
+
+    before, after, result = results["approve"]
+    assert [r["operations"] for r in before] == [["me"], ["createDraft"]]
+    assert [r["operations"] for r in after] == [["publishDraft"]]
+    assert result["hashnode_post"]["url"]
+    assert result["hashnode_post"]["draft_id"]
+    assert results["approve_drafts"] == {}
+
+    before, after, result = results["reject"]
+    assert [r["operations"] for r in before] == [["createDraft"]]
+    assert [r["operations"] for r in after] == [["removeDraft"]]
+    assert result["workflow_status"] == "waiting_twitter_approval"
+    assert results["reject_drafts"] == {}
+    assert len(results["removed"]) == 1
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Speculative Hashnode Drafts ===")
+    test_speculative_draft()
+    print("✅ Approval only published the draft and rejection deleted it")
+
+
+if __name__ == "__main__":
+    main()
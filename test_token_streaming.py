@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Token streaming test: LLM node output reaches /events subscribers as token
+events before the node's status event, while the checkpointed blog_content
+is the full text written once; a subscriber too slow to keep up is told how
+many tokens it missed
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.schemas.workflow_state import WorkflowRequest
+from app.services.llm_cache import LLMCache
+from app.services.workflow_events import WorkflowEventBroker
+from app.services import workflow_service
+from app.services.workflow_service import WorkflowService
+from app.workflows import nodes
+from fake_services import patched_nodes
+
+
+class StreamingLLM:
+    """Streams its response a word at a time"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def response(self):
+        self.calls += 1
+        return f"# Title {self.calls}\n\nStreamed words for response {self.calls}."
+
+    async def ainvoke(self, messages):
+        return AIMessage(content=self.response())
+
+    async def astream(self, messages):
+        for word in self.response().split(" "):
+            await asyncio.sleep(0)
+            yield AIMessageChunk(content=word + " ")
+
+
+async def collect_events(events, thread_id, stop_status):
+    collected = []
+    async for item in events.subscribe(thread_id, heartbeat=1.0):
+        if item is None:
+            continue
+        collected.append(item)
+        if item[1] == "status" and item[2]["status"] == stop_status:
+            return collected
+
+
+async def run_streamed_workflow():
+    nodes.llm = StreamingLLM()
+    nodes.llm_cache = LLMCache(backend="off")
+    events = WorkflowEventBroker()
+    checkpointer = InMemorySaver()
+    service = WorkflowService(checkpointer, events=events)
+
+    thread_id = "streamed-thread"
+    listener = asyncio.create_task(collect_events(events, thread_id, "waiting_hashnode_approval"))
+    await asyncio.sleep(0)
+
+    # start_workflow picks the thread id; pin it so the listener is already subscribed
+    workflow_service.uuid = SimpleNamespace(uuid4=lambda: thread_id)
+    try:
+        result = await service.start_workflow(WorkflowRequest(user_id="test_user", topic="Streaming"))
+    finally:
+        workflow_service.uuid = uuid
+
+    collected = await asyncio.wait_for(listener, timeout=5)
+    history = [t async for t in checkpointer.alist({"configurable": {"thread_id": thread_id}})]
+    return result, collected, history
+
+
+def test_token_streaming():
+    with patched_nodes():
+        result, collected, history = asyncio.run(run_streamed_workflow())
+    state = result["result"]
+
+    tokens = [(event_id, data) for event_id, event, data in collected if event == "token"]
+    blog_tokens = "".join(data["content"] for _, data in tokens if data["node"] == "generate_blog")
+    assert blog_tokens.strip() == state["blog_content"].strip()
+    assert all(event_id is None for event_id, _ in tokens)  # Live only, never replayed
+
+    kinds = [(event, data.get("node") or data.get("status")) for _, event, data in collected]
+    first_blog_token = kinds.index(("token", "generate_blog"))
+    blog_generated = kinds.index(("status", "blog_generated"))
+    assert first_blog_token < blog_generated
+
+    # One checkpoint per step: blog_content appears in a single write, complete
+    blog_values = {t.checkpoint["channel_values"].get("blog_content") for t in history}
+    assert blog_values - {None} == {state["blog_content"]}
+
+
+async def run_lagging_subscriber():
+    """Publish more tokens than the buffer holds while a subscriber is not reading"""
+    events = WorkflowEventBroker(history_size=5)
+    await events.publish("thread", "status", {"status": "blog_generating"})
+    subscription = events.subscribe("thread", heartbeat=1.0)
+    first = await subscription.__anext__()
+    for index in range(12):
+        await events.publish_transient("thread", "token", {"content": f"token {index}"})
+    received = [await subscription.__anext__() for _ in range(6)]
+    await subscription.aclose()
+    return first, received
+
+
+def test_lagging_subscriber_is_told_about_dropped_tokens():
+    first, received = asyncio.run(run_lagging_subscriber())
+
+    assert first[1] == "status"
+    assert received[0] == (None, "tokens_dropped", {"thread_id": "thread", "dropped": 7})
+    assert [data["content"] for _, _, data in received[1:]] == [f"token {index}" for index in range(7, 12)]
+
+
+def main():
+    """Main test function"""
+    print("=== Testing LLM Token Streaming ===")
+    with patched_nodes():
+        result, collected, _ = asyncio.run(run_streamed_workflow())
+    tokens = sum(1 for _, event, _ in collected if event == "token")
+    print(f"{tokens} token events before the Hashnode approval pause")
+    test_token_streaming()
+    test_lagging_subscriber_is_told_about_dropped_tokens()
+    print("✅ Tokens streamed to subscribers and blog_content was checkpointed once")
+
+
+if __name__ == "__main__":
+    main()
@@ -95,8 +95,10 @@ def test_twitter_publishing(thread_id):
             print(f"Current node: {final_status.get('current_node')}")
             print(f"Status: {final_status.get('status')}")
             
-            # Look for Twitter post data
-            state = final_status.get('state', {})
+            # Look for Twitter post data in the full state (/status only
+            # carries the projection and its result links)
+            state_response = requests.get(f"{BASE_URL}/workflows/{thread_id}/state")
+            state = state_response.json() if state_response.status_code == 200 else {}
             channel_values = state.get('channel_values', {})
             twitter_post = channel_values.get('twitter_post', {})
             
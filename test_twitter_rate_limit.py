@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Twitter rate limit test: threads share one token bucket, tweets beyond the
+budget park until the reported reset (including after a 429) without
+blocking the event loop, and every tweet of every thread is posted once;
+an approved thread is posted by the worker pool rather than by the request
+that approved it, and a rate-limited thread parks instead of holding a worker
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from tweepy.errors import TooManyRequests
+
+from app.schemas.workflow_state import HumanInputRequest, WorkflowRequest
+from app.services import twitter_service
+from app.services.llm_cache import LLMCache
+from app.services.rate_limiter import TokenBucketRateLimiter
+from app.services.twitter_service import TwitterService
+from app.services.workflow_runner import WorkflowRunner
+from app.services.workflow_service import WorkflowService
+from fake_services import FakeHashnodeService, patched_nodes
+
+THREAD = "1/3 First tweet\n2/3 Second tweet\n3/3 Third tweet"
+
+
+class FakeResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.reason = "Too Many Requests" if status == 429 else "Created"
+        self.headers = headers
+        self.body = body
+
+    async def json(self):
+        return self.body
+
+
+class FakeTweetClient:
+    """POST /2/tweets with a fixed-window budget, answering 429 once it is spent"""
+
+    def __init__(self, limit, window_seconds):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.window_start = time.time()
+        self.used = 0
+        self.posted = []
+        self.rejected = 0
+
+    async def create_tweet(self, text, in_reply_to_tweet_id=None):
+        now = time.time()
+        if now - self.window_start >= self.window_seconds:
+            self.window_start, self.used = now, 0
+        headers = {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-reset": str(int(self.window_start + self.window_seconds + 0.999)),
+        }
+        if self.used >= self.limit:
+            self.rejected += 1
+            headers["x-rate-limit-remaining"] = "0"
+            raise TooManyRequests(FakeResponse(429, headers, {}), response_json={"title": "Too Many Requests"})
+
+        self.used += 1
+        headers["x-rate-limit-remaining"] = str(self.limit - self.used)
+        tweet_id = str(len(self.posted) + 1)
+        self.posted.append((tweet_id, text, in_reply_to_tweet_id))
+        return FakeResponse(201, headers, {"data": {"id": tweet_id, "text": text}})
+
+
+class ThreadLLM:
+    async def ainvoke(self, messages):
+        return AIMessage(content=THREAD)
+
+
+class GatedTweetClient:
+    """Accepts tweets once `opened` is set, like a limiter with no tokens left"""
+
+    def __init__(self):
+        self.opened = asyncio.Event()
+        self.posted = []
+
+    async def create_tweet(self, text, in_reply_to_tweet_id=None):
+        await self.opened.wait()
+        tweet_id = str(len(self.posted) + 1)
+        self.posted.append((tweet_id, text, in_reply_to_tweet_id))
+        return FakeResponse(201, {}, {"data": {"id": tweet_id, "text": text}})
+
+    async def get_me(self):
+        return FakeResponse(200, {}, {"data": {"id": "42", "username": "flowforge", "name": "FlowForge"}})
+
+
+async def approve_in_background():
+    """Approve a thread while tweets cannot be posted yet, then let them through"""
+    client = GatedTweetClient()
+    service = TwitterService()
+    service.mock_mode = False
+    service.client = client
+    runner = WorkflowRunner(workers=1, queue_size=10)
+    await runner.start()
+    workflows = WorkflowService(InMemorySaver(), runner=runner)
+    try:
+        with patched_nodes(llm=ThreadLLM(), llm_cache=LLMCache(backend="off"),
+                           hashnode_service=FakeHashnodeService(), twitter_service=service):
+            started = await workflows.start_workflow(WorkflowRequest(user_id="test_user", topic="Rate limits"))
+            thread_id = started["thread_id"]
+            await workflows.provide_human_input(HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve"))
+            approved = await asyncio.wait_for(
+                workflows.provide_human_input(HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve")),
+                timeout=1
+            )
+            # A second approval finds nothing to decide
+            again = await workflows.provide_human_input(
+                HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve")
+            )
+            client.opened.set()
+            await runner.queue.join()
+            final = await workflows.get_workflow_state(thread_id)
+    finally:
+        await runner.stop()
+    return approved, again, final["channel_values"], client.posted, await service.verify_credentials()
+
+
+async def park_rate_limited_thread():
+    """Approve a thread on a 1-worker runner while the bucket is empty, then run another job"""
+    client = GatedTweetClient()
+    client.opened.set()
+    service = TwitterService()
+    service.mock_mode = False
+    service.client = client
+    limiter = twitter_service.tweet_rate_limiter = TokenBucketRateLimiter(3, 0.6)  # A token every 0.2s
+    runner = WorkflowRunner(workers=1, queue_size=10)
+    await runner.start()
+    workflows = WorkflowService(InMemorySaver(), runner=runner)
+    other_ran = asyncio.Event()
+
+    async def other_job():
+        other_ran.set()
+
+    try:
+        with patched_nodes(llm=ThreadLLM(), llm_cache=LLMCache(backend="off"),
+                           hashnode_service=FakeHashnodeService(), twitter_service=service):
+            started = await workflows.start_workflow(WorkflowRequest(user_id="test_user", topic="Parked"))
+            thread_id = started["thread_id"]
+            await workflows.provide_human_input(HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve"))
+            limiter.tokens = 0.0
+            await workflows.provide_human_input(HumanInputRequest(thread_id=thread_id, user_input="yes", action="approve"))
+            await asyncio.sleep(0.02)
+            parked = runner.get_metrics()["parked"]
+            status = (await workflows.get_workflow_status(thread_id))["status"]
+
+            # The only worker is free while the thread waits for its first token
+            runner.submit("other_thread", other_job)
+            await asyncio.wait_for(other_ran.wait(), timeout=0.15)
+            posted_meanwhile = len(client.posted)
+
+            for _ in range(100):
+                values = (await workflows.get_workflow_state(thread_id))["channel_values"]
+                if values["workflow_status"] == "completed":
+                    break
+                await asyncio.sleep(0.05)
+    finally:
+        await runner.stop()
+    return parked, status, posted_meanwhile, values, client.posted, runner.get_metrics()
+
+
+async def limiter_spacing():
+    """Completion offsets of 6 concurrent acquires on a 2-per-0.2s bucket"""
+    limiter = TokenBucketRateLimiter(2, 0.2)
+    start = time.monotonic()
+
+    async def take():
+        await limiter.acquire()
+        return time.monotonic() - start
+
+    tasks = [asyncio.create_task(take()) for _ in range(6)]
+    await asyncio.sleep(0.01)
+    parked = limiter.get_metrics()["waiting"]
+    return sorted(await asyncio.gather(*tasks)), parked
+
+
+async def post_threads(client, local_capacity):
+    """Post three threads concurrently through the shared limiter"""
+    twitter_service.tweet_rate_limiter = TokenBucketRateLimiter(local_capacity, 60)
+    services = []
+    for _ in range(3):
+        service = TwitterService()
+        service.mock_mode = False
+        service.client = client
+        services.append(service)
+
+    ticks = 0
+    stop = asyncio.Event()
+
+    async def ticker():
+        nonlocal ticks
+        while not stop.is_set():
+            ticks += 1
+            await asyncio.sleep(0.05)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.monotonic()
+    results = await asyncio.gather(*(service.post_thread(THREAD) for service in services))
+    elapsed = time.monotonic() - start
+    stop.set()
+    await ticker_task
+    return results, elapsed, ticks, twitter_service.tweet_rate_limiter.get_metrics()
+
+
+def test_twitter_rate_limit():
+    offsets, parked = asyncio.run(limiter_spacing())
+    assert parked == 4
+    assert offsets[1] < 0.05  # Two tokens available at once
+    assert 0.35 < offsets[-1] < 0.6  # The other four follow at the refill rate (one per 0.1s)
+
+    # The local estimate (100 per minute) is too generous: the first response's
+    # headers correct it, and a 429 parks the tweet until the reported reset
+    original = twitter_service.tweet_rate_limiter
+    try:
+        client = FakeTweetClient(limit=5, window_seconds=1)
+        results, elapsed, ticks, metrics = asyncio.run(post_threads(client, local_capacity=100))
+    finally:
+        twitter_service.tweet_rate_limiter = original
+
+    assert all(result["success"] and len(result["tweets"]) == 3 for result in results)
+    assert len(client.posted) == 9
+    # Nothing posted twice: every accepted tweet belongs to exactly one result
+    assert sorted(tweet["id"] for result in results for tweet in result["tweets"]) == \
+        sorted(tweet_id for tweet_id, _, _ in client.posted)
+    for result in results:
+        ids = [tweet["id"] for tweet in result["tweets"]]
+        parents = {tweet_id: parent for tweet_id, _, parent in client.posted}
+        assert parents[ids[0]] is None and parents[ids[1]] == ids[0] and parents[ids[2]] == ids[1]
+    assert client.rejected <= 1
+    assert metrics["waited_total"] >= 2  # Threads parked for the second window
+    assert elapsed >= 1.0  # 9 tweets need a second window
+    assert ticks >= elapsed / 0.05 * 0.8  # The loop kept running while tweets waited
+
+
+def test_twitter_approval_posts_in_background():
+    approved, again, values, posted, credentials = asyncio.run(approve_in_background())
+
+    assert approved["status"] == "publishing_twitter" and not approved["requires_human_input"]
+    assert again["message"] == "Workflow is not waiting for input"
+    assert values["workflow_status"] == "completed"
+    assert [tweet["id"] for tweet in values["twitter_post"]["tweets"]] == ["1", "2", "3"]
+    assert [parent for _, _, parent in posted] == [None, "1", "2"]
+    assert credentials == {"success": True, "user": {"id": "42", "username": "flowforge", "name": "FlowForge"}}
+
+
+def test_rate_limited_thread_parks_without_holding_a_worker():
+    original = twitter_service.tweet_rate_limiter
+    try:
+        parked, status, posted_meanwhile, values, posted, metrics = asyncio.run(park_rate_limited_thread())
+    finally:
+        twitter_service.tweet_rate_limiter = original
+
+    assert parked == 1 and status == "queued"
+    assert posted_meanwhile == 0
+    assert values["workflow_status"] == "completed"
+    assert [parent for _, _, parent in posted] == [None, "1", "2"]
+    assert metrics["deferred_total"] >= 3 and metrics["failed_total"] == 0
+
+
+def main():
+    """Main test function"""
+    print("=== Testing Twitter Rate Limiting ===")
+    test_twitter_rate_limit()
+    test_twitter_approval_posts_in_background()
+    test_rate_limited_thread_parks_without_holding_a_worker()
+    print("✅ Tweets waited on the shared limiter without blocking the event loop or the approval")
+
+
+if __name__ == "__main__":
+    main()